@@ -8,6 +8,9 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Dict, List
 
+import matplotlib
+
+matplotlib.use("Agg")  # headless CLI: no GUI backend probing
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
@@ -78,7 +81,7 @@ def _daily_metrics_from_state(df: pd.DataFrame, timestep_minutes: int, tz: str =
         raise ValueError(f"State CSV missing columns: {sorted(missing)}")
 
     out = df.copy()
-    out["timestamp"] = pd.to_datetime(out["timestamp"], utc=True, errors="coerce")
+    out["timestamp"] = pd.to_datetime(out["timestamp"], utc=True, format="ISO8601", errors="coerce")
     out = out.dropna(subset=["timestamp"]).sort_values("timestamp")
 
     if tz and tz.upper() != "UTC":
@@ -88,53 +91,65 @@ def _daily_metrics_from_state(df: pd.DataFrame, timestep_minutes: int, tz: str =
 
     dt_h = timestep_minutes / 60.0
 
+    # Cast the power columns to float once; everything below works on the ndarray
+    kw = (
+        out[["pv_now_kw", "load_requested_kw", "load_served_kw", "crit_requested_kw", "crit_served_kw", "curtailed_solar_kw"]]
+        .apply(pd.to_numeric, errors="coerce")
+        .to_numpy(dtype=float)
+    )
+
     # energies per step
-    out["pv_kwh"] = pd.to_numeric(out["pv_now_kw"], errors="coerce").astype(float) * dt_h
-    out["load_req_kwh"] = pd.to_numeric(out["load_requested_kw"], errors="coerce").astype(float) * dt_h
-    out["load_served_kwh"] = pd.to_numeric(out["load_served_kw"], errors="coerce").astype(float) * dt_h
-    out["crit_req_kwh"] = pd.to_numeric(out["crit_requested_kw"], errors="coerce").astype(float) * dt_h
-    out["crit_served_kwh"] = pd.to_numeric(out["crit_served_kw"], errors="coerce").astype(float) * dt_h
-    out["curtailed_kwh"] = pd.to_numeric(out["curtailed_solar_kw"], errors="coerce").astype(float) * dt_h
-
-    # CID: minutes where critical is not fully served
-    out["crit_shortfall"] = (
-        pd.to_numeric(out["crit_served_kw"], errors="coerce").astype(float) + 1e-9
-    ) < pd.to_numeric(out["crit_requested_kw"], errors="coerce").astype(float)
-
-    grp = out.groupby(out["timestamp_local"].dt.date)
-
-    rows: List[Dict[str, float]] = []
-    for day, g in grp:
-        pv = float(g["pv_kwh"].sum())
-        load_req = float(g["load_req_kwh"].sum())
-        load_served = float(g["load_served_kwh"].sum())
-        crit_req = float(g["crit_req_kwh"].sum())
-        crit_served = float(g["crit_served_kwh"].sum())
-        curtailed = float(g["curtailed_kwh"].sum())
-
-        clsr = (crit_served / crit_req) if crit_req > 1e-12 else 1.0
-        cid_min = float(g["crit_shortfall"].sum() * timestep_minutes)
-        ssr = (pv / load_req) if load_req > 1e-12 else np.nan
+    e = kw * dt_h
+    steps = pd.DataFrame(
+        {
+            "pv_kwh": e[:, 0],
+            "load_req_kwh": e[:, 1],
+            "load_served_kwh": e[:, 2],
+            "crit_req_kwh": e[:, 3],
+            "crit_served_kwh": e[:, 4],
+            "curtailed_kwh": e[:, 5],
+            # CID: minutes where critical is not fully served
+            "crit_shortfall": (kw[:, 4] + 1e-9) < kw[:, 3],
+        },
+        index=out.index,
+    )
 
-        # Solar Utilisation (SU): fraction of PV used to serve load (not curtailed)
-        su = ((pv - curtailed) / pv) if pv > 1e-12 else np.nan
-
-        rows.append(
-            {
-                "date": str(day),
-                "PV_kWh": pv,
-                "LoadReq_kWh": load_req,
-                "LoadServed_kWh": load_served,
-                "CritReq_kWh": crit_req,
-                "CritServed_kWh": crit_served,
-                "CLSR": clsr,
-                "CID_min": cid_min,
-                "SSR": ssr,
-                "SU": su,
-            }
-        )
+    # One grouped reduction over all days instead of a Python loop over groups
+    # Local midnight as the day key (grouped as datetime64 ints, not date objects);
+    # rows are time-sorted so first-seen order is chronological
+    sums = steps.groupby(out["timestamp_local"].dt.normalize(), sort=False).agg(
+        pv=("pv_kwh", "sum"),
+        load_req=("load_req_kwh", "sum"),
+        load_served=("load_served_kwh", "sum"),
+        crit_req=("crit_req_kwh", "sum"),
+        crit_served=("crit_served_kwh", "sum"),
+        curtailed=("curtailed_kwh", "sum"),
+        shortfall_steps=("crit_shortfall", "sum"),
+    )
+    pv = sums["pv"].to_numpy()
+    load_req = sums["load_req"].to_numpy()
+    crit_req = sums["crit_req"].to_numpy()
 
-    return pd.DataFrame(rows)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        clsr = np.where(crit_req > 1e-12, sums["crit_served"].to_numpy() / crit_req, 1.0)
+        ssr = np.where(load_req > 1e-12, pv / load_req, np.nan)
+        # Solar Utilisation (SU): fraction of PV used to serve load (not curtailed)
+        su = np.where(pv > 1e-12, (pv - sums["curtailed"].to_numpy()) / pv, np.nan)
+
+    return pd.DataFrame(
+        {
+            "date": sums.index.strftime("%Y-%m-%d").to_numpy(dtype=object),
+            "PV_kWh": pv,
+            "LoadReq_kWh": load_req,
+            "LoadServed_kWh": sums["load_served"].to_numpy(),
+            "CritReq_kWh": crit_req,
+            "CritServed_kWh": sums["crit_served"].to_numpy(),
+            "CLSR": clsr,
+            "CID_min": sums["shortfall_steps"].to_numpy(dtype=float) * timestep_minutes,
+            "SSR": ssr,
+            "SU": su,
+        }
+    )
 
 
 def _save_metric_figures(df_daily: pd.DataFrame, out_dir: Path, prefix: str) -> None:
@@ -203,7 +218,7 @@ def _pick_representative_days(df_daily: pd.DataFrame) -> Dict[str, str]:
 def _slice_day_state(df_state: pd.DataFrame, date_str: str, tz: str) -> pd.DataFrame:
     """Extract a single local-date slice from the simulator state csv."""
     x = df_state.copy()
-    x["timestamp"] = pd.to_datetime(x["timestamp"], utc=True, errors="coerce")
+    x["timestamp"] = pd.to_datetime(x["timestamp"], utc=True, format="ISO8601", errors="coerce")
     x = x.dropna(subset=["timestamp"]).sort_values("timestamp")
 
     if tz and tz.upper() != "UTC":
@@ -0,0 +1,19 @@
+"""Optional numba: njit/prange, or pass-through stand-ins when numba is not installed.
+
+The kernels import from here so they run as plain Python (slow but identical) without it.
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit, prange
+except ImportError:  # pragma: no cover - exercised only when numba is absent
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+__all__ = ["njit", "prange"]
@@ -6,6 +6,12 @@ from typing import Dict, List, Tuple
 from offgrid_dt.io.schema import ControlDecision, SystemConfig, TaskInstance
 
 
+# The simulator reuses one instance per run and overwrites its fields each step;
+# controllers must not keep a reference to it across decide() calls.
+#
+# decide() is called every step with values computed here from validated config and
+# plain floats, so decisions are built with ControlDecision.model_construct() (no
+# per-step pydantic validation). User-supplied config is still fully validated.
 @dataclass
 class ControllerInput:
     step: int
@@ -40,7 +46,7 @@ class NaiveController(BaseController):
                 for tid, t in inp.pending_tasks.items()
                 if t.earliest_start_step <= inp.step < t.latest_end_step
             ]
-        return ControlDecision(
+        return ControlDecision.model_construct(
             charge_kw=0.0,
             discharge_kw=0.0,
             served_task_ids=serve,
@@ -72,7 +78,7 @@ class StaticPriorityController(BaseController):
             shed = list(set(deferred))
             deferred = []
 
-        return ControlDecision(
+        return ControlDecision.model_construct(
             charge_kw=0.0,
             discharge_kw=0.0,
             served_task_ids=serve,
@@ -104,7 +110,7 @@ class RuleBasedController(BaseController):
         if inp.pv_now_kw < inp.critical_base_kw and inp.soc > cfg.soc_min:
             discharge_kw = min(cfg.inverter_max_kw, inp.critical_base_kw - inp.pv_now_kw)
 
-        return ControlDecision(
+        return ControlDecision.model_construct(
             charge_kw=charge_kw,
             discharge_kw=discharge_kw,
             served_task_ids=serve,
@@ -174,7 +180,7 @@ class ForecastAwareHeuristicController(BaseController):
         if net_surplus_kw < 0 and inp.soc > cfg.soc_min:
             discharge_kw = min(cfg.inverter_max_kw, abs(net_surplus_kw))
 
-        return ControlDecision(
+        return ControlDecision.model_construct(
             charge_kw=charge_kw,
             discharge_kw=discharge_kw,
             served_task_ids=serve,
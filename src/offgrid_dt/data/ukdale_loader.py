@@ -129,10 +129,9 @@ def split_into_days(series_kw: pd.Series, tz: str = "UTC") -> List[pd.Series]:
     if tz and tz.upper() != "UTC":
         s = s.tz_convert(tz)
 
-    out: List[pd.Series] = []
-    for _, g in s.groupby(s.index.date):
-        out.append(g.sort_index())
-    return out
+    # Sort once; local-midnight keys are then monotone, so groups come out in day order
+    s = s.sort_index()
+    return [g for _, g in s.groupby(s.index.normalize(), sort=False)]
 
 
 def align_day_to_full_steps(
@@ -0,0 +1,115 @@
+"""Numeric core of the simulator for multi-run sweeps (parameter sweeps, Monte-Carlo seeds).
+
+Only the per-step feasibility, SOC and KPI arithmetic lives here; controller dispatch,
+guidance and logging stay in Python (see simulator.simulate). Runs are independent, so
+the run dimension is parallelised with prange and each run walks its timeline serially.
+
+Numba is optional: without it the same kernel runs as plain Python (slow but identical).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from offgrid_dt._numba import njit, prange
+
+
+# Column layout of the per-run params matrix (R, N_PARAMS)
+P_INVERTER_MAX_KW = 0
+P_SOC_MIN = 1
+P_SOC_MAX = 2
+P_BATTERY_CAPACITY_KWH = 3
+P_CHARGE_EFF = 4
+P_DISCHARGE_EFF = 5
+N_PARAMS = 6
+
+# Column layout of the KPI matrix (R, N_KPIS); matches KPITracker.snapshot()
+K_CLSR = 0
+K_BLACKOUT_MINUTES = 1
+K_SAR = 2
+K_SOLAR_UTILIZATION = 3
+K_BATTERY_THROUGHPUT_KWH = 4
+N_KPIS = 5
+
+
+@njit(parallel=True, cache=True)
+def run_batch(pv_kw, crit_req_kw, total_req_kw, soc0, params, timestep_hours):
+    """Simulate R independent runs of T steps with measured (non-task) demand.
+
+    Per step: critical load is served first from PV plus inverter (if SOC above reserve),
+    remaining demand is served from what is left, net PV charges the battery and any
+    shortfall discharges it. Same rules as the measured-demand branch of simulate().
+
+    Returns (soc, crit_served_kw, load_served_kw, curtailed_kw) each (R, T) and kpis (R, N_KPIS).
+    """
+    n_runs, n_steps = pv_kw.shape
+    soc_out = np.empty((n_runs, n_steps))
+    crit_served_out = np.empty((n_runs, n_steps))
+    load_served_out = np.empty((n_runs, n_steps))
+    curtailed_out = np.empty((n_runs, n_steps))
+    kpis = np.empty((n_runs, N_KPIS))
+    blackout_step_minutes = np.round(timestep_hours * 60.0)
+
+    for r in prange(n_runs):
+        inv_max = params[r, P_INVERTER_MAX_KW]
+        soc_min = params[r, P_SOC_MIN]
+        soc_max = params[r, P_SOC_MAX]
+        cap_kwh = params[r, P_BATTERY_CAPACITY_KWH]
+        ceff = params[r, P_CHARGE_EFF]
+        deff = max(1e-9, params[r, P_DISCHARGE_EFF])
+
+        soc = soc0[r]
+        throughput = 0.0
+        crit_req_e = 0.0
+        crit_srv_e = 0.0
+        total_req_e = 0.0
+        pv_e = 0.0
+        curtailed_e = 0.0
+        used_e = 0.0
+        blackout_minutes = 0.0
+
+        for t in range(n_steps):
+            pv = pv_kw[r, t]
+            crit_req = crit_req_kw[r, t]
+            total_req = total_req_kw[r, t]
+
+            available = pv + (inv_max if soc > soc_min else 0.0)
+            crit_served = min(crit_req, available)
+            discretionary_req = max(0.0, total_req - crit_req)
+            remaining = max(0.0, available - crit_served)
+            load_served = crit_served + min(discretionary_req, remaining)
+
+            net = pv - load_served
+            charge = max(0.0, min(inv_max, net))
+            discharge = 0.0
+            if net < 0.0 and soc > soc_min:
+                discharge = min(inv_max, -net)
+
+            e_in = charge * timestep_hours * ceff
+            e_out = discharge * timestep_hours / deff
+            soc = max(soc_min, min(soc_max, soc + (e_in - e_out) / cap_kwh))
+            throughput += (charge + discharge) * timestep_hours
+
+            curtailed = max(0.0, pv - load_served - charge)
+
+            crit_req_e += crit_req * timestep_hours
+            crit_srv_e += crit_served * timestep_hours
+            total_req_e += total_req * timestep_hours
+            pv_e += pv * timestep_hours
+            curtailed_e += curtailed * timestep_hours
+            used_e += max(0.0, pv - curtailed) * timestep_hours
+            if crit_served + 1e-9 < crit_req:
+                blackout_minutes += blackout_step_minutes
+
+            soc_out[r, t] = soc
+            crit_served_out[r, t] = crit_served
+            load_served_out[r, t] = load_served
+            curtailed_out[r, t] = curtailed
+
+        kpis[r, K_CLSR] = crit_srv_e / max(1e-9, crit_req_e)
+        kpis[r, K_BLACKOUT_MINUTES] = blackout_minutes
+        kpis[r, K_SAR] = used_e / max(1e-9, total_req_e)
+        kpis[r, K_SOLAR_UTILIZATION] = 1.0 - curtailed_e / max(1e-9, pv_e)
+        kpis[r, K_BATTERY_THROUGHPUT_KWH] = throughput
+
+    return soc_out, crit_served_out, load_served_out, curtailed_out, kpis
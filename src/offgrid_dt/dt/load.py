@@ -23,7 +23,7 @@ def compute_planned_daily_energy_kwh(
     for a in appliances:
         if a.category == "critical":
             continue
-        p_kw = a.power_w / 1000.0
+        p_kw = a.power_kw
         if a.category == "deferrable" and a.daily_quota_steps > 0:
             E_tasks += p_kw * a.daily_quota_steps * dt_h
         else:
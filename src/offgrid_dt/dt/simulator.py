@@ -2,21 +2,37 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import logging
 
 import numpy as np
+import pandas as pd
 
 from offgrid_dt.control.controllers import BaseController, ControllerInput
+from offgrid_dt.dt._batch_kernel import (
+    K_BATTERY_THROUGHPUT_KWH,
+    K_BLACKOUT_MINUTES,
+    K_CLSR,
+    K_SAR,
+    K_SOLAR_UTILIZATION,
+    N_PARAMS,
+    P_BATTERY_CAPACITY_KWH,
+    P_CHARGE_EFF,
+    P_DISCHARGE_EFF,
+    P_INVERTER_MAX_KW,
+    P_SOC_MAX,
+    P_SOC_MIN,
+    run_batch,
+)
 from offgrid_dt.dt.battery import BatteryState, update_soc
 from offgrid_dt.dt.load import build_daily_tasks, requested_kw_for_step
 from offgrid_dt.planning.nominal_plan import compute_nominal_planned_energy
 from offgrid_dt.forecast.nasa_power import get_expected_ghi_next_24h
-from offgrid_dt.forecast.openweather import synthetic_irradiance_forecast
-from offgrid_dt.forecast.pv_power import irradiance_to_pv_power_kw
-from offgrid_dt.io.logger import RunLogger
-from offgrid_dt.io.schema import Appliance, StepRecord, SystemConfig
+from offgrid_dt.forecast.openweather import synthetic_irradiance_array
+from offgrid_dt.forecast.pv_power import ghi_array, irradiance_to_pv_power_array
+from offgrid_dt.io.logger import RunLogger, read_state_log
+from offgrid_dt.io.schema import Appliance, ControlDecision, SystemConfig
 from offgrid_dt.matching import compute_day_ahead_matching
 from offgrid_dt.metrics.kpis import KPITracker
 from offgrid_dt.xai.explain import (
@@ -61,24 +77,23 @@ def simulate(
 
     log = logging.getLogger("offgrid_dt")
 
-    def _resample_to_steps(series: List[float], target_len: int) -> List[float]:
+    def _resample_to_steps(series: Sequence[float], target_len: int) -> np.ndarray:
         """Resample a forecast series to match simulator step resolution.
 
         Handles common cases:
         - hourly series -> 15-min steps (repeat)
         - shorter/longer arbitrary series (linear interpolation)
         """
-        if not series:
-            return [0.0] * target_len
-        if len(series) == target_len:
+        series = np.asarray(series, dtype=float)
+        if series.size == 0:
+            return np.zeros(target_len)
+        if series.size == target_len:
             return series
-        if target_len % len(series) == 0:
-            factor = target_len // len(series)
-            return [v for v in series for _ in range(factor)]
-        x_old = np.linspace(0.0, 1.0, num=len(series))
+        if target_len % series.size == 0:
+            return np.repeat(series, target_len // series.size)
+        x_old = np.linspace(0.0, 1.0, num=series.size)
         x_new = np.linspace(0.0, 1.0, num=target_len)
-        y_new = np.interp(x_new, x_old, np.asarray(series, dtype=float))
-        return [float(v) for v in y_new]
+        return np.interp(x_new, x_old, series)
 
     # Day-ahead planning: first planning day = next calendar day 00:00–24:00 UTC
     now_utc = reference_utc or datetime.now(tz=timezone.utc)
@@ -96,7 +111,7 @@ def simulate(
     )
 
     # PV forecast: get_expected_ghi_next_24h tries DOY±3 last year, then yesterday, then synthetic
-    pv_forecast_kw_full: List[float] = []
+    pv_forecast_kw_full: Sequence[float] = []
     solar_source: str = "synthetic"
     try:
         irr, solar_source = get_expected_ghi_next_24h(
@@ -105,32 +120,45 @@ def simulate(
             reference_utc=now_utc,
         )
         if irr:
-            irr_multi = irr * days if days > 1 else irr
-            pv_forecast_kw_full = irradiance_to_pv_power_kw(
-                irr_multi, cfg.pv_capacity_kw, cfg.pv_efficiency
-            )
-            log.info("Solar source: %s (%d points)", solar_source, len(irr_multi))
+            # Convert the 24h profile once, then repeat the kW array for each day
+            pv_day_kw = irradiance_to_pv_power_array(ghi_array(irr), cfg.pv_capacity_kw, cfg.pv_efficiency)
+            pv_forecast_kw_full = np.tile(pv_day_kw, days) if days > 1 else pv_day_kw
+            log.info("Solar source: %s (%d points)", solar_source, len(pv_forecast_kw_full))
     except Exception as e:
         log.warning("NASA POWER GHI failed (%s); using synthetic.", e)
 
-    if not pv_forecast_kw_full:
-        irr = synthetic_irradiance_forecast(
+    if len(pv_forecast_kw_full) == 0:
+        irr = synthetic_irradiance_array(
             start=start, hours=24 * days, step_minutes=dt_minutes
         )
-        pv_forecast_kw_full = irradiance_to_pv_power_kw(
-            irr, cfg.pv_capacity_kw, cfg.pv_efficiency
+        pv_forecast_kw_full = irradiance_to_pv_power_array(
+            irr.ghi_wm2, cfg.pv_capacity_kw, cfg.pv_efficiency
         )
         solar_source = "synthetic"
 
-    # Resample to simulator resolution (e.g. 15-min)
-    pv_forecast_kw_full = _resample_to_steps(pv_forecast_kw_full, total_steps)
+    # Resample to simulator resolution (e.g. 15-min). Zero padding past the end of the
+    # run makes each horizon slice a plain view.
+    horizon_steps = cfg.horizon_steps
+    pv_arr = np.zeros(total_steps + horizon_steps, dtype=float)
+    pv_arr[:total_steps] = _resample_to_steps(pv_forecast_kw_full, total_steps)
+
+    # Mean PV over the next 2h (8 steps) of the rolling horizon, for explainability.
+    # Window sums come from one cumulative sum; steps past the end of the run count as 0 kW.
+    avg_window = min(8, horizon_steps)
+    pv_cumsum = np.concatenate(([0.0], np.cumsum(pv_arr[:total_steps], dtype=float)))
+    pv_cumsum = np.concatenate((pv_cumsum, np.full(avg_window, pv_cumsum[-1])))
+    pv_avg_next2h_arr = (pv_cumsum[avg_window : avg_window + total_steps] - pv_cumsum[:total_steps]) / 8.0
+
+    # Step timestamps: one vectorized datetime64 build, converted back to tz-aware UTC datetimes
+    step_ts = np.datetime64(start.replace(tzinfo=None), "us") + np.arange(total_steps) * np.timedelta64(dt_minutes, "m")
+    timestamps = [t.replace(tzinfo=timezone.utc) for t in step_ts.tolist()]
 
     # Logger
     out_dir = out_dir or Path("logs") / f"run_{controller.name}"
-    logger = RunLogger(out_dir=out_dir)
+    logger = RunLogger(out_dir=out_dir, n_rows=total_steps)
 
     battery = BatteryState(soc=cfg.soc_init)
-    kpis = KPITracker()
+    kpis = KPITracker(timestep_hours)
 
     # Task-mode state
     pending_tasks: Dict[str, Any] = {}
@@ -138,14 +166,24 @@ def simulate(
     active_task_id: Optional[str] = None
     critical_base_kw: float = 0.0
 
-    # UK-DALE mode state (per-day demand series)
-    measured_total_kw_series: List[float] = []
-    measured_crit_kw_series: List[float] = []
-
-    def _load_measured_day_series(day_start_utc: datetime) -> None:
-        """Populate measured_total_kw_series and measured_crit_kw_series for the given day."""
-        nonlocal measured_total_kw_series, measured_crit_kw_series
+    # UK-DALE mode state: measured demand for the whole run, filled one day at a time
+    measured_total_kw = np.empty(total_steps if cfg.load_source == "ukdale" else 0, dtype=np.float64)
+    measured_crit_kw = np.empty_like(measured_total_kw)
+
+    # Per-step controller/explainability inputs: allocated once, fields overwritten every step
+    inp = ControllerInput(
+        step=0,
+        soc=battery.soc,
+        pv_now_kw=0.0,
+        pv_forecast_kw=[],
+        critical_base_kw=critical_base_kw,
+        pending_tasks={},
+        remaining_steps=remaining_steps,
+    )
+    ctx = ExplanationContext(soc=battery.soc, pv_now_kw=0.0, pv_avg_next2h_kw=0.0, critical_kw=0.0)
 
+    def _load_measured_day_series(day_start_utc: datetime, step: int) -> None:
+        """Fill measured_total_kw and measured_crit_kw for the day starting at run step `step`."""
         if cfg.ukdale is None:
             raise ValueError("cfg.ukdale must be set when cfg.load_source='ukdale'.")
 
@@ -173,119 +211,144 @@ def simulate(
                 f"expected {steps_per_day}."
             )
 
-        measured_total_kw_series = [float(v) for v in total_kw]
-        measured_crit_kw_series = [float(v) for v in crit_kw]
+        measured_total_kw[step : step + steps_per_day] = total_kw
+        measured_crit_kw[step : step + steps_per_day] = crit_kw
 
-    for step in range(total_steps):
-        day_step = step % steps_per_day
+    # Loop-invariant config values bound to locals (avoids per-step attribute lookups)
+    inv_max = cfg.inverter_max_kw
+    soc_min = cfg.soc_min
+    soc_max = cfg.soc_max
+    cap_kwh = cfg.battery_capacity_kwh
+    ceff = cfg.charge_eff
+    deff = cfg.discharge_eff
+    location_name = cfg.location_name
 
-        if day_step == 0:
-            day_start_utc = start + timedelta(days=step // steps_per_day)
+    # Demand side of one step, specialised per load source so the hot loop never re-tests it.
+    # Each returns (decision, total_req_kw, crit_req_kw, crit_served_kw, load_served_kw, used_kw).
 
-            if cfg.load_source == "ukdale":
-                _load_measured_day_series(day_start_utc)
-                # No tasks used in measured-demand validation
-                pending_tasks = {}
-                remaining_steps = {}
-                active_task_id = None
-                # Keep a representative critical baseline for explainability text
-                critical_base_kw = float(
-                    np.mean(measured_crit_kw_series) if measured_crit_kw_series else 0.0
-                )
-            else:
-                # tasks mode (default)
-                critical_base_kw, tasks = build_daily_tasks(
-                    appliances, steps_per_day, rng
-                )
-                pending_tasks = {t.task_id: t for t in tasks}
-                remaining_steps = {t.task_id: t.duration_steps for t in tasks}
-                active_task_id = None
-
-        pv_now_kw = pv_forecast_kw_full[step] if step < len(pv_forecast_kw_full) else 0.0
-
-        # Rolling horizon PV forecast
-        pv_forecast = pv_forecast_kw_full[step : step + cfg.horizon_steps]
-        if len(pv_forecast) < cfg.horizon_steps:
-            pv_forecast = pv_forecast + [0.0] * (cfg.horizon_steps - len(pv_forecast))
-
-        if cfg.load_source == "ukdale":
-            total_req_kw = measured_total_kw_series[day_step]
-            crit_req_kw = measured_crit_kw_series[day_step]
-            available_task_ids: List[str] = []
-            window_tasks: Dict[str, Any] = {}
-        else:
-            total_req_kw, crit_req_kw, available_task_ids = requested_kw_for_step(
-                critical_base_kw, list(pending_tasks.values()), day_step
-            )
-            # Controller input uses only tasks that are still pending and in-window
-            window_tasks = {
-                tid: pending_tasks[tid]
-                for tid in available_task_ids
-                if tid in pending_tasks
-            }
+    def _demand_step_tasks(
+        step: int, day_step: int, pv_now_kw: float, pv_forecast: np.ndarray
+    ) -> Tuple[ControlDecision, float, float, float, float, float]:
+        nonlocal pending_tasks, remaining_steps, active_task_id, critical_base_kw
 
-        inp = ControllerInput(
-            step=day_step,
-            soc=battery.soc,
-            pv_now_kw=pv_now_kw,
-            pv_forecast_kw=pv_forecast,
-            critical_base_kw=critical_base_kw,
-            pending_tasks=window_tasks,
-            remaining_steps=remaining_steps,
-        )
+        if day_step == 0:
+            critical_base_kw, tasks = build_daily_tasks(appliances, steps_per_day, rng)
+            pending_tasks = {t.task_id: t for t in tasks}
+            remaining_steps = {t.task_id: t.duration_steps for t in tasks}
+            active_task_id = None
 
-        # Controller still runs (for consistent logging), but in ukdale mode it will have no tasks.
+        total_req_kw, crit_req_kw, available_task_ids = requested_kw_for_step(
+            critical_base_kw, list(pending_tasks.values()), day_step
+        )
+        # Controller input uses only tasks that are still pending and in-window
+        window_tasks = {
+            tid: pending_tasks[tid]
+            for tid in available_task_ids
+            if tid in pending_tasks
+        }
+
+        inp.step = day_step
+        inp.soc = battery.soc
+        inp.pv_now_kw = pv_now_kw
+        inp.pv_forecast_kw = pv_forecast
+        inp.critical_base_kw = critical_base_kw
+        inp.pending_tasks = window_tasks
+        inp.remaining_steps = remaining_steps
         decision = controller.decide(cfg, inp)
 
         # Serve critical first (simple feasibility rule)
         crit_served_kw = min(
             crit_req_kw,
-            pv_now_kw + (cfg.inverter_max_kw if battery.soc > cfg.soc_min else 0.0),
+            pv_now_kw + (inv_max if battery.soc > soc_min else 0.0),
         )
 
-        # Determine which tasks can be served this step (tasks mode only)
+        # Determine which tasks can be served this step
         served_tasks: List[str] = []
         served_task_kw = 0.0
-
-        if cfg.load_source != "ukdale":
-            if (
-                active_task_id
-                and active_task_id in window_tasks
-                and remaining_steps.get(active_task_id, 0) > 0
-            ):
-                forced = window_tasks[active_task_id]
-                served_tasks = [active_task_id]
-                served_task_kw = forced.power_w / 1000.0
-            else:
-                active_task_id = None
-                for tid in decision.served_task_ids:
-                    if tid not in window_tasks:
-                        continue
-                    t = window_tasks[tid]
-                    served_tasks.append(tid)
-                    served_task_kw += t.power_w / 1000.0
-                    if t.duration_steps > 1:
-                        active_task_id = tid
-                        break
-
-        # Compute total served load
-        if cfg.load_source == "ukdale":
-            # After serving critical, attempt to serve remaining measured demand as discretionary (within inverter/battery limits)
-            discretionary_req_kw = max(0.0, total_req_kw - crit_req_kw)
-            available_supply_kw = pv_now_kw + (cfg.inverter_max_kw if battery.soc > cfg.soc_min else 0.0)
-            remaining_supply_kw = max(0.0, available_supply_kw - crit_served_kw)
-            discretionary_served_kw = min(discretionary_req_kw, remaining_supply_kw)
-            load_served_kw = crit_served_kw + discretionary_served_kw
-            served_task_kw = discretionary_served_kw  # for guidance "used_kw"
+        if (
+            active_task_id
+            and active_task_id in window_tasks
+            and remaining_steps.get(active_task_id, 0) > 0
+        ):
+            forced = window_tasks[active_task_id]
+            served_tasks = [active_task_id]
+            served_task_kw = forced.power_w / 1000.0
         else:
-            load_served_kw = crit_served_kw + served_task_kw
+            active_task_id = None
+            for tid in decision.served_task_ids:
+                if tid not in window_tasks:
+                    continue
+                t = window_tasks[tid]
+                served_tasks.append(tid)
+                served_task_kw += t.power_w / 1000.0
+                if t.duration_steps > 1:
+                    active_task_id = tid
+                    break
+
+        # Mark task progress
+        for tid in served_tasks:
+            remaining_steps[tid] = max(0, remaining_steps.get(tid, 0) - 1)
+            if remaining_steps[tid] <= 0:
+                pending_tasks.pop(tid, None)
+                if active_task_id == tid:
+                    active_task_id = None
+
+        load_served_kw = crit_served_kw + served_task_kw
+        return decision, total_req_kw, crit_req_kw, crit_served_kw, load_served_kw, served_task_kw
+
+    def _demand_step_ukdale(
+        step: int, day_step: int, pv_now_kw: float, pv_forecast: np.ndarray
+    ) -> Tuple[ControlDecision, float, float, float, float, float]:
+        nonlocal critical_base_kw
+
+        if day_step == 0:
+            _load_measured_day_series(timestamps[step], step)
+            # Keep a representative critical baseline for explainability text
+            critical_base_kw = float(measured_crit_kw[step : step + steps_per_day].mean())
+
+        total_req_kw = float(measured_total_kw[step])
+        crit_req_kw = float(measured_crit_kw[step])
+
+        # No tasks used in measured-demand validation; the controller still runs for
+        # consistent logging and only contributes charge/discharge hints.
+        inp.step = day_step
+        inp.soc = battery.soc
+        inp.pv_now_kw = pv_now_kw
+        inp.pv_forecast_kw = pv_forecast
+        inp.critical_base_kw = critical_base_kw
+        inp.pending_tasks = {}
+        inp.remaining_steps = {}
+        decision = controller.decide(cfg, inp)
+
+        # Serve critical first, then attempt the remaining measured demand as discretionary
+        # (within inverter/battery limits)
+        available_supply_kw = pv_now_kw + (inv_max if battery.soc > soc_min else 0.0)
+        crit_served_kw = min(crit_req_kw, available_supply_kw)
+        discretionary_req_kw = max(0.0, total_req_kw - crit_req_kw)
+        remaining_supply_kw = max(0.0, available_supply_kw - crit_served_kw)
+        discretionary_served_kw = min(discretionary_req_kw, remaining_supply_kw)
+        load_served_kw = crit_served_kw + discretionary_served_kw
+        # discretionary served load stands in for guidance "used_kw"
+        return decision, total_req_kw, crit_req_kw, crit_served_kw, load_served_kw, discretionary_served_kw
+
+    demand_step = _demand_step_ukdale if cfg.load_source == "ukdale" else _demand_step_tasks
+
+    for step in range(total_steps):
+        pv_now_kw = float(pv_arr[step])
+
+        # Rolling horizon PV forecast (view, zero-padded past the end of the run)
+        pv_forecast = pv_arr[step : step + horizon_steps]
+
+        decision, total_req_kw, crit_req_kw, crit_served_kw, load_served_kw, used_kw = demand_step(
+            step, step % steps_per_day, pv_now_kw, pv_forecast
+        )
 
         # Battery interaction
         net_kw = pv_now_kw - load_served_kw
-        charge_kw = max(0.0, min(cfg.inverter_max_kw, net_kw))
+        charge_kw = max(0.0, min(inv_max, net_kw))
         discharge_kw = 0.0
-        if net_kw < 0 and battery.soc > cfg.soc_min:
-            discharge_kw = min(cfg.inverter_max_kw, abs(net_kw))
+        if net_kw < 0 and battery.soc > soc_min:
+            discharge_kw = min(inv_max, abs(net_kw))
 
         # Update battery
         battery = update_soc(
@@ -293,44 +356,32 @@ def simulate(
             charge_kw=charge_kw,
             discharge_kw=discharge_kw,
             timestep_hours=timestep_hours,
-            battery_capacity_kwh=cfg.battery_capacity_kwh,
-            charge_eff=cfg.charge_eff,
-            discharge_eff=cfg.discharge_eff,
-            soc_min=cfg.soc_min,
-            soc_max=cfg.soc_max,
+            battery_capacity_kwh=cap_kwh,
+            charge_eff=ceff,
+            discharge_eff=deff,
+            soc_min=soc_min,
+            soc_max=soc_max,
         )
 
         curtailed_kw = max(0.0, pv_now_kw - load_served_kw - charge_kw)
 
-        # Mark task progress (tasks mode only)
-        if cfg.load_source != "ukdale":
-            for tid in served_tasks:
-                remaining_steps[tid] = max(0, remaining_steps.get(tid, 0) - 1)
-                if remaining_steps[tid] <= 0:
-                    pending_tasks.pop(tid, None)
-                    if active_task_id == tid:
-                        active_task_id = None
-
         # Explainability
-        pv_avg_next2h = sum(pv_forecast[:8]) / 8.0
+        ctx.soc = battery.soc
+        ctx.pv_now_kw = pv_now_kw
+        ctx.pv_avg_next2h_kw = float(pv_avg_next2h_arr[step])
+        ctx.critical_kw = critical_base_kw
         guidance = generate_guidance(
             cfg,
-            ExplanationContext(
-                soc=battery.soc,
-                pv_now_kw=pv_now_kw,
-                pv_avg_next2h_kw=pv_avg_next2h,
-                critical_kw=critical_base_kw if cfg.load_source != "ukdale" else float(np.mean(measured_crit_kw_series)),
-            ),
-            used_kw=served_task_kw,
+            ctx,
+            used_kw=used_kw,
             deferred_count=len(decision.deferred_task_ids),
         )
         guidance = enhance_explanation_with_openai(
-            openai_api_key, openai_model, guidance, household_context=cfg.location_name
+            openai_api_key, openai_model, guidance, household_context=location_name
         )
 
         # KPIs
         kpis.update(
-            timestep_hours=timestep_hours,
             crit_req_kw=crit_req_kw,
             crit_served_kw=crit_served_kw,
             total_req_kw=total_req_kw,
@@ -340,14 +391,12 @@ def simulate(
             throughput_kwh=battery.throughput_kwh,
         )
 
-        rec = StepRecord(
-            timestamp=start + timedelta(minutes=dt_minutes * step),
-            step_index=step,
+        # Write the step straight into the logger's column arrays (no per-step StepRecord)
+        logger.append_step(
+            step,
+            timestamp=timestamps[step],
             pv_now_kw=pv_now_kw,
-            pv_forecast_kw=pv_forecast,
             soc_now=battery.soc,
-            soc_min=cfg.soc_min,
-            soc_max=cfg.soc_max,
             load_requested_kw=total_req_kw,
             load_served_kw=load_served_kw,
             crit_requested_kw=crit_req_kw,
@@ -355,9 +404,8 @@ def simulate(
             curtailed_solar_kw=curtailed_kw,
             decision=decision,
             guidance=guidance,
-            kpis_running=kpis.snapshot(),
+            kpis=kpis.snapshot(),
         )
-        logger.append(rec)
 
     prefix = f"{controller.name}_{days}d"
     out = logger.flush(prefix=prefix)
@@ -370,7 +418,7 @@ def simulate(
         try:
             if cfg.load_source == "ukdale":
                 # measured demand for first day
-                out["planned_energy_kwh"] = float(np.sum(measured_total_kw_series) * timestep_hours)
+                out["planned_energy_kwh"] = float(measured_total_kw[:steps_per_day].sum() * timestep_hours)
             else:
                 nominal = compute_nominal_planned_energy(appliances, include_12h=False)
                 out["planned_energy_kwh"] = nominal.E_plan_24h_kwh
@@ -379,12 +427,13 @@ def simulate(
 
         # Day-ahead matching: compare expected demand vs solar for first planning day
         try:
-            import pandas as pd
-
             state_path = out.get("state_csv")
             if state_path:
-                mdf = pd.read_csv(state_path)
-                first_day_df = mdf.head(steps_per_day)
+                mdf = read_state_log(state_path)
+                # Reuse the in-memory step times so matching does not re-parse the ISO strings
+                first_day_df = mdf.head(steps_per_day).assign(
+                    timestamp=pd.DatetimeIndex(step_ts[: min(len(mdf), steps_per_day)], tz="UTC")
+                )
                 matching = compute_day_ahead_matching(
                     first_day_df,
                     appliances,
@@ -398,3 +447,65 @@ def simulate(
             log.warning("Day-ahead matching failed: %s", e)
 
     return out
+
+
+def simulate_batch(
+    cfgs: List[SystemConfig],
+    pv_kw: Sequence[Sequence[float]],
+    crit_req_kw: Sequence[Sequence[float]],
+    total_req_kw: Sequence[Sequence[float]],
+) -> Dict[str, Any]:
+    """Run many independent measured-demand simulations through the compiled batch kernel.
+
+    Intended for parameter sweeps / Monte-Carlo runs: row r of each (R, T) input is one run
+    configured by cfgs[r]. Demand is served as in the measured-demand (UK-DALE) mode of
+    simulate(); there is no controller dispatch, guidance or logging.
+
+    All configs must share timestep_minutes. Returns per-step arrays (R, T) for soc,
+    crit_served_kw, load_served_kw and curtailed_kw, plus "kpis": one dict per run with
+    the same keys as KPITracker.snapshot().
+    """
+    if not cfgs:
+        raise ValueError("simulate_batch requires at least one config.")
+    timestep_minutes = {c.timestep_minutes for c in cfgs}
+    if len(timestep_minutes) != 1:
+        raise ValueError(f"All configs must share timestep_minutes; got {sorted(timestep_minutes)}.")
+    timestep_hours = timestep_minutes.pop() / 60.0
+
+    pv = np.ascontiguousarray(pv_kw, dtype=np.float64)
+    crit = np.ascontiguousarray(crit_req_kw, dtype=np.float64)
+    total = np.ascontiguousarray(total_req_kw, dtype=np.float64)
+    if pv.ndim != 2 or pv.shape != crit.shape or pv.shape != total.shape or pv.shape[0] != len(cfgs):
+        raise ValueError(
+            f"Expected (R, T) inputs with R={len(cfgs)}; got pv={pv.shape} crit={crit.shape} total={total.shape}."
+        )
+
+    params = np.empty((len(cfgs), N_PARAMS))
+    for r, c in enumerate(cfgs):
+        params[r, P_INVERTER_MAX_KW] = c.inverter_max_kw
+        params[r, P_SOC_MIN] = c.soc_min
+        params[r, P_SOC_MAX] = c.soc_max
+        params[r, P_BATTERY_CAPACITY_KWH] = c.battery_capacity_kwh
+        params[r, P_CHARGE_EFF] = c.charge_eff
+        params[r, P_DISCHARGE_EFF] = c.discharge_eff
+    soc0 = np.array([c.soc_init for c in cfgs], dtype=np.float64)
+
+    soc, crit_served, load_served, curtailed, kpis = run_batch(
+        pv, crit, total, soc0, params, timestep_hours
+    )
+    return {
+        "soc": soc,
+        "crit_served_kw": crit_served,
+        "load_served_kw": load_served,
+        "curtailed_kw": curtailed,
+        "kpis": [
+            {
+                "CLSR": float(k[K_CLSR]),
+                "Blackout_minutes": float(k[K_BLACKOUT_MINUTES]),
+                "SAR": float(k[K_SAR]),
+                "Solar_utilization": float(k[K_SOLAR_UTILIZATION]),
+                "Battery_throughput_kwh": float(k[K_BATTERY_THROUGHPUT_KWH]),
+            }
+            for k in kpis
+        ],
+    }
@@ -0,0 +1,38 @@
+"""Shared HTTP session for the forecast clients (NASA POWER, OpenWeather).
+
+One pooled keep-alive session per process avoids a fresh TCP+TLS handshake per call.
+Rate limits and transient gateway errors (429/502/503/504) are retried with backoff;
+connection errors are retried once only, so an offline run still falls back to synthetic
+PV quickly.
+"""
+
+from __future__ import annotations
+
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:  # C JSON decoder for response bodies; stdlib json otherwise
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - depends on environment
+    json_loads = json.loads
+
+
+def new_session(pool_connections: int = 4, pool_maxsize: int = 8) -> requests.Session:
+    retry = Retry(
+        total=3,
+        connect=1,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retry)
+    s = requests.Session()
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+SESSION = new_session()
@@ -10,14 +10,24 @@ it is not used for irradiance or PV estimates.
 
 from __future__ import annotations
 
+import hashlib
+import io
+import json
 import logging
-import math
+import os
+import time
+from collections import OrderedDict
 from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Optional, Tuple, Union
 
+import numpy as np
+import pandas as pd
 import requests
 
-from .openweather import IrradiancePoint
+from ._http import SESSION
+from .openweather import IrradiancePoint, IrradianceSeries
 
 LOG = logging.getLogger("offgrid_dt")
 
@@ -25,8 +35,64 @@ NASA_POWER_BASE = "https://power.larc.nasa.gov/api/temporal/hourly/point"
 PARAM_GHI = "ALLSKY_SFC_SW_DWN"  # All-sky surface shortwave downward irradiance (W/m² or Wh/m² per hour)
 
 
-def _fmt_yyyymmdd(d: date) -> str:
-    return d.strftime("%Y%m%d")
+@lru_cache(maxsize=4096)
+def _ymd(d: date) -> str:
+    """YYYYMMDD request date (f-string; cheaper than strftime, and memoized)."""
+    return f"{d.year:04d}{d.month:02d}{d.day:02d}"
+
+
+# On-disk response cache. Hourly data for past dates does not change, so responses are
+# reused across runs; set OFFGRID_DT_CACHE_DIR="" to disable.
+_CACHE_MIN_AGE_DAYS = 10  # do not cache windows ending this close to today (data still arriving)
+_CACHE_MAX_AGE_DAYS = 30  # refetch entries older than this (NASA occasionally reprocesses)
+
+
+def _cache_dir() -> Optional[Path]:
+    root = os.environ.get("OFFGRID_DT_CACHE_DIR", str(Path.home() / ".cache" / "offgrid_dt"))
+    return Path(root) / "nasa_power" if root else None
+
+
+def _is_settled(end_d: date) -> bool:
+    """True if a window ending on end_d is old enough that its data has stopped arriving."""
+    return end_d <= datetime.now(tz=timezone.utc).date() - timedelta(days=_CACHE_MIN_AGE_DAYS)
+
+
+def _cache_path(params: dict) -> Optional[Path]:
+    """Cache file for a request, or None if caching is disabled or the window is too recent."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    try:
+        end = datetime.strptime(str(params["end"]), "%Y%m%d").date()
+    except (KeyError, ValueError):
+        return None
+    if not _is_settled(end):
+        return None
+    key = hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return cache_dir / f"{key}.{str(params['format']).lower()}"
+
+
+def _read_cache(path: Optional[Path]) -> Optional[bytes]:
+    if path is None:
+        return None
+    try:
+        if time.time() - path.stat().st_mtime < _CACHE_MAX_AGE_DAYS * 86400:
+            return path.read_bytes()
+    except OSError:
+        pass
+    return None
+
+
+def _write_cache(path: Optional[Path], body: bytes) -> None:
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(path)
+    except OSError as e:
+        LOG.warning("Could not write NASA POWER cache %s: %s", path, e)
 
 
 def fetch_ghi_hourly(
@@ -39,8 +105,8 @@ def fetch_ghi_hourly(
 ) -> List[IrradiancePoint]:
     """Fetch hourly GHI (ALLSKY_SFC_SW_DWN) from NASA POWER for the given date range.
 
-    The API returns hourly values; keys are YYYYMMDDHH and values are in Wh/m²
-    (hourly energy), which equals average irradiance in W/m² over that hour.
+    The API returns one CSV row per hour (YEAR, MO, DY, HR columns); values are in
+    Wh/m² (hourly energy), which equals average irradiance in W/m² over that hour.
 
     Args:
         lat: Latitude (degrees).
@@ -56,100 +122,154 @@ def fetch_ghi_hourly(
     """
     if start_date.tzinfo is None:
         start_date = start_date.replace(tzinfo=timezone.utc)
-    start_str = start_date.strftime("%Y%m%d")
     if end_date is None:
         end_date = start_date
     elif end_date.tzinfo is None:
         end_date = end_date.replace(tzinfo=timezone.utc)
-    end_str = end_date.strftime("%Y%m%d")
 
+    series = _fetch_series(
+        lat, lon, start_date.date(), end_date.date(),
+        time_standard=time_standard, timeout_seconds=timeout_seconds,
+    )
+    if not len(series):
+        LOG.warning("NASA POWER returned no GHI points for %s–%s", _ymd(start_date.date()), _ymd(end_date.date()))
+    return series.to_points()
+
+
+# In-process memo of parsed responses, shared by the fetchers and the expected-profile
+# fallback chain, which often ask for the same window. Same rules as the disk cache: only
+# non-empty, settled windows are kept, and entries expire after _CACHE_MAX_AGE_DAYS.
+_SERIES_MEMO: "OrderedDict[tuple, Tuple[float, IrradianceSeries]]" = OrderedDict()
+_SERIES_MEMO_SIZE = 64
+
+
+def _fetch_series(
+    lat: float,
+    lon: float,
+    start_d: date,
+    end_d: date,
+    time_standard: str = "UTC",
+    timeout_seconds: int = 30,
+    session: Optional[requests.Session] = None,
+    drop_negative: bool = False,
+) -> IrradianceSeries:
+    """Hourly GHI for [start_d, end_d] as arrays, with the fill rule applied.
+
+    Coordinates are rounded to 0.01° (the NASA POWER grid is ~0.5°, so finer
+    precision only fragments the caches).
+    """
+    key = (round(lat, 2), round(lon, 2), start_d.isoformat(), end_d.isoformat(), time_standard)
+    now = time.time()
+    hit = _SERIES_MEMO.get(key)
+    if hit is not None and now - hit[0] < _CACHE_MAX_AGE_DAYS * 86400:
+        series = hit[1]
+        _SERIES_MEMO.move_to_end(key)
+    else:
+        series = _fetch_raw_series(key[0], key[1], start_d, end_d, time_standard, timeout_seconds, session)
+        if len(series) and _is_settled(end_d):
+            series.ts.flags.writeable = False
+            series.ghi_wm2.flags.writeable = False
+            _SERIES_MEMO[key] = (now, series)
+            if len(_SERIES_MEMO) > _SERIES_MEMO_SIZE:
+                _SERIES_MEMO.popitem(last=False)
+    return _apply_fill_rule(series, drop_negative)
+
+
+def _fetch_raw_series(
+    lat: float,
+    lon: float,
+    start_d: date,
+    end_d: date,
+    time_standard: str,
+    timeout_seconds: int,
+    session: Optional[requests.Session],
+) -> IrradianceSeries:
+    """Request hourly GHI for [start_d, end_d] as CSV and parse it straight into arrays.
+
+    CSV is several times smaller on the wire than JSON and parses in one pandas call.
+    Past windows come from the disk cache when possible.
+    """
     params = {
         "parameters": PARAM_GHI,
         "community": "RE",
         "longitude": lon,
         "latitude": lat,
-        "start": start_str,
-        "end": end_str,
-        "format": "JSON",
+        "start": _ymd(start_d),
+        "end": _ymd(end_d),
+        "format": "CSV",
         "time-standard": time_standard,
     }
-    r = requests.get(NASA_POWER_BASE, params=params, timeout=timeout_seconds)
-    r.raise_for_status()
-    data = r.json()
+    path = _cache_path(params)
+    body = _read_cache(path)
+    if body is None:
+        r = (session or SESSION).get(NASA_POWER_BASE, params=params, timeout=timeout_seconds)
+        r.raise_for_status()
+        body = r.content
+        _write_cache(path, body)
+    return _parse_csv_series(body)
+
+
+def _series_from(ts: pd.DatetimeIndex, vals: np.ndarray) -> IrradianceSeries:
+    """Drop hours with no timestamp or value and return them in chronological order."""
+    ok = ~np.isnan(vals) & ~ts.isna()
+    ts_ok = ts[ok].to_numpy(dtype="datetime64[s]")
+    vals = vals[ok]
+    # NASA returns hours in chronological order; only sort if a response ever is not.
+    if ts_ok.size > 1 and (ts_ok[1:] < ts_ok[:-1]).any():
+        order = np.argsort(ts_ok, kind="stable")
+        ts_ok, vals = ts_ok[order], vals[order]
+    return IrradianceSeries(ts=ts_ok, ghi_wm2=vals)
+
+
+def _parse_csv_series(body: bytes) -> IrradianceSeries:
+    """Parse a NASA POWER hourly CSV response (fill values left as-is).
+
+    The data follows a "-BEGIN HEADER-" ... "-END HEADER-" block and has columns
+    YEAR, MO, DY, HR and ALLSKY_SFC_SW_DWN.
+    """
+    try:
+        marker = body.find(b"-END HEADER-")
+        start = body.index(b"\n", marker) + 1 if marker >= 0 else 0
+        df = pd.read_csv(
+            io.BytesIO(body[start:]),
+            usecols=["YEAR", "MO", "DY", "HR", PARAM_GHI],
+            float_precision="round_trip",
+        )
+        parts = df[["YEAR", "MO", "DY", "HR"]].apply(pd.to_numeric, errors="coerce")
+        parts.columns = ["year", "month", "day", "hour"]
+        ts = pd.DatetimeIndex(pd.to_datetime(parts, errors="coerce"))
+        vals = pd.to_numeric(df[PARAM_GHI], errors="coerce").to_numpy(dtype=float)
+        return _series_from(ts, vals)
+    except Exception as e:
+        LOG.warning("Failed to parse NASA POWER CSV response: %s", e)
+        return IrradianceSeries.empty()
 
-    points = _parse_nasa_power_ghi(data)
-    if not points:
-        LOG.warning("NASA POWER returned no GHI points for %s–%s", start_str, end_str)
-    return points
 
+def _apply_fill_rule(series: IrradianceSeries, drop_negative: bool) -> IrradianceSeries:
+    """The API uses -999 as fill: clamp negatives to 0, or drop those hours as missing."""
+    if drop_negative:
+        valid = series.ghi_wm2 >= 0
+        return IrradianceSeries(ts=series.ts[valid], ghi_wm2=series.ghi_wm2[valid])
+    return IrradianceSeries(ts=series.ts, ghi_wm2=np.maximum(series.ghi_wm2, 0.0))
 
-def _parse_nasa_power_ghi(data: dict) -> List[IrradiancePoint]:
-    """Parse NASA POWER JSON response into IrradiancePoint list.
+
+def _parse_nasa_power_ghi(data: dict, drop_negative: bool = False) -> List[IrradiancePoint]:
+    """Parse a NASA POWER JSON response into IrradiancePoint list.
 
     Expects properties.parameter.ALLSKY_SFC_SW_DWN with keys YYYYMMDDHH (UTC).
     Values are Wh/m² per hour (equivalent to W/m² average over the hour).
+    Negative fill values are clamped to 0, or excluded with drop_negative=True.
     """
-    points: List[IrradiancePoint] = []
     try:
-        params = (data.get("properties") or {}).get("parameter") or {}
-        ghi_data = params.get(PARAM_GHI)
-        if not ghi_data or not isinstance(ghi_data, dict):
-            return points
-        # Sort by key so order is chronological
-        for key in sorted(ghi_data.keys()):
-            try:
-                # key format: YYYYMMDDHH
-                if len(key) != 10:
-                    continue
-                year = int(key[0:4])
-                month = int(key[4:6])
-                day = int(key[6:8])
-                hour = int(key[8:10])
-                ts = datetime(year, month, day, hour, 0, 0, tzinfo=timezone.utc)
-                val = ghi_data[key]
-                if val is None:
-                    continue
-                ghi = float(val)
-                # API uses -999 as fill; treat as 0
-                if ghi < 0:
-                    ghi = 0.0
-                points.append(IrradiancePoint(ts=ts, ghi_wm2=ghi))
-            except (ValueError, TypeError, IndexError):
-                continue
+        ghi_data = data["properties"]["parameter"][PARAM_GHI]
+        keys = [k for k in ghi_data if isinstance(k, str) and len(k) == 10]
+        ts = pd.to_datetime(pd.Index(keys, dtype=object), format="%Y%m%d%H", errors="coerce")
+        vals = pd.to_numeric(pd.Series([ghi_data[k] for k in keys], dtype=object), errors="coerce")
+        series = _series_from(ts, vals.to_numpy(dtype=float))
     except Exception as e:
         LOG.warning("Failed to parse NASA POWER response: %s", e)
-    return points
-
-
-def _parse_nasa_power_ghi_valid_only(payload: dict) -> List[IrradiancePoint]:
-    """Parse NASA POWER JSON; include only hours with valid GHI. Exclude -999 and any negative as missing."""
-    try:
-        data = payload["properties"]["parameter"][PARAM_GHI]
-    except KeyError:
         return []
-    points: List[IrradiancePoint] = []
-    for key, val in data.items():
-        if len(key) != 10:
-            continue
-        try:
-            yyyy = int(key[0:4])
-            mm = int(key[4:6])
-            dd = int(key[6:8])
-            hh = int(key[8:10])
-            ts = datetime(yyyy, mm, dd, hh, 0, 0, tzinfo=timezone.utc)
-        except ValueError:
-            continue
-        if val is None:
-            continue
-        try:
-            fval = float(val)
-        except (TypeError, ValueError):
-            continue
-        if fval < 0 or math.isclose(fval, -999.0, abs_tol=1e-9):
-            continue
-        points.append(IrradiancePoint(ts=ts, ghi_wm2=fval))
-    points.sort(key=lambda p: p.ts)
-    return points
+    return _apply_fill_rule(series, drop_negative).to_points()
 
 
 def fetch_nasa_power_hourly_ghi(
@@ -165,33 +285,39 @@ def fetch_nasa_power_hourly_ghi(
 
     -999 and any negative values are treated as missing and excluded. Uses optional Session for connection reuse.
     """
-    start_d = start_date if isinstance(start_date, date) else start_date.date()
-    end_d = end_date if isinstance(end_date, date) else end_date.date()
-    params = {
-        "parameters": PARAM_GHI,
-        "community": "RE",
-        "longitude": lon,
-        "latitude": lat,
-        "start": _fmt_yyyymmdd(start_d),
-        "end": _fmt_yyyymmdd(end_d),
-        "format": "JSON",
-        "time-standard": time_standard,
-    }
-    s = session or requests.Session()
-    r = s.get(NASA_POWER_BASE, params=params, timeout=timeout_seconds)
-    r.raise_for_status()
-    payload = r.json()
-    return _parse_nasa_power_ghi_valid_only(payload)
+    start_d = start_date.date() if isinstance(start_date, datetime) else start_date
+    end_d = end_date.date() if isinstance(end_date, datetime) else end_date
+    series = _fetch_series(
+        lat, lon, start_d, end_d,
+        time_standard=time_standard, timeout_seconds=timeout_seconds, session=session, drop_negative=True,
+    )
+    return series.to_points()
+
+
+GhiPoints = Union[List[IrradiancePoint], IrradianceSeries]
 
 
-def build_hourly_profile_mean(points: List[IrradiancePoint]) -> List[float]:
+def _hour_buckets(points: GhiPoints) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Hour-of-day of each point, its GHI value, and the sample count per hour 0..23."""
+    if isinstance(points, IrradianceSeries):
+        hours, vals = points.hour_of_day(), points.ghi_wm2
+    else:
+        n = len(points)
+        hours = np.fromiter((p.ts.hour for p in points), dtype=np.intp, count=n)
+        vals = np.fromiter((p.ghi_wm2 for p in points), dtype=float, count=n)
+    counts = np.bincount(hours, minlength=24)
+    return hours, vals, counts
+
+
+def _hourly_mean(hours: np.ndarray, vals: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    sums = np.bincount(hours, weights=vals, minlength=24)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), 0.0)
+
+
+def build_hourly_profile_mean(points: GhiPoints) -> List[float]:
     """Build 24-hour profile: for each hour 0..23, average all valid samples; if none, 0.0."""
-    by_hour: List[List[float]] = [[] for _ in range(24)]
-    for p in points:
-        h = p.ts.hour
-        if 0 <= h < 24:
-            by_hour[h].append(float(p.ghi_wm2))
-    return [sum(vals) / len(vals) if vals else 0.0 for vals in by_hour]
+    hours, vals, counts = _hour_buckets(points)
+    return _hourly_mean(hours, vals, counts).tolist()
 
 
 # Plausibility: do not label invalid/empty profiles as NASA-based.
@@ -226,9 +352,9 @@ def expected_ghi_profile_doy_last_year(
     start_date = target_date - timedelta(days=doy_window)
     end_date = target_date + timedelta(days=doy_window)
     try:
-        points = fetch_nasa_power_hourly_ghi(
+        points = _fetch_series(
             lat, lon, start_date, end_date,
-            session=session, time_standard=time_standard, timeout_seconds=timeout_seconds,
+            time_standard=time_standard, timeout_seconds=timeout_seconds, session=session, drop_negative=True,
         )
     except Exception as e:
         LOG.warning("NASA POWER DOY fetch failed (%s); trying fallback.", e)
@@ -265,9 +391,9 @@ def expected_ghi_profile_yesterday(
         now = now.replace(tzinfo=timezone.utc)
     yesterday = now.date() - timedelta(days=1)
     try:
-        points = fetch_nasa_power_hourly_ghi(
+        points = _fetch_series(
             lat, lon, yesterday, yesterday,
-            session=session, time_standard=time_standard, timeout_seconds=timeout_seconds,
+            time_standard=time_standard, timeout_seconds=timeout_seconds, session=session, drop_negative=True,
         )
     except Exception as e:
         LOG.warning("NASA POWER yesterday fetch failed (%s); using synthetic.", e)
@@ -298,12 +424,12 @@ def get_expected_ghi_next_24h(
     """Choose expected 24h GHI: 1) DOY±3 last year, 2) yesterday, 3) synthetic (caller provides).
 
     Returns (points, source_label). source_label is 'nasa_power_doy' | 'nasa_power_yesterday' | 'synthetic'.
-    Uses a single Session for both NASA attempts.
+    Both NASA attempts share the module's pooled session.
     """
     now = reference_utc or datetime.now(tz=timezone.utc)
     if now.tzinfo is None:
         now = now.replace(tzinfo=timezone.utc)
-    session = requests.Session()
+    session = SESSION
     pts = expected_ghi_profile_doy_last_year(lat, lon, now, doy_window=3, session=session)
     if pts:
         return pts, "nasa_power_doy"
@@ -377,32 +503,23 @@ def fetch_ghi_historical_window(
     return fetch_ghi_hourly(lat, lon, start_dt, end_dt, time_standard=time_standard)
 
 
-def build_hourly_ghi_profile(points: List[IrradiancePoint]) -> Tuple[List[float], List[float], List[float]]:
+def build_hourly_ghi_profile(points: GhiPoints) -> Tuple[List[float], List[float], List[float]]:
     """Build hour-of-day mean, min, max from a list of hourly GHI points.
 
     Returns:
         (mean_24, min_24, max_24) — each a list of 24 floats for hour 0..23.
         If an hour has no data, that hour is 0.0.
     """
-    by_hour: List[List[float]] = [[] for _ in range(24)]
-    for p in points:
-        h = p.ts.hour
-        if 0 <= h < 24:
-            by_hour[h].append(float(p.ghi_wm2))
-    mean_24: List[float] = []
-    min_24: List[float] = []
-    max_24: List[float] = []
-    for h in range(24):
-        vals = by_hour[h]
-        if vals:
-            mean_24.append(sum(vals) / len(vals))
-            min_24.append(min(vals))
-            max_24.append(max(vals))
-        else:
-            mean_24.append(0.0)
-            min_24.append(0.0)
-            max_24.append(0.0)
-    return (mean_24, min_24, max_24)
+    hours, vals, counts = _hour_buckets(points)
+    mean_24 = _hourly_mean(hours, vals, counts)
+    min_24 = np.full(24, np.inf)
+    max_24 = np.full(24, -np.inf)
+    np.minimum.at(min_24, hours, vals)
+    np.maximum.at(max_24, hours, vals)
+    empty = counts == 0
+    min_24[empty] = 0.0
+    max_24[empty] = 0.0
+    return (mean_24.tolist(), min_24.tolist(), max_24.tolist())
 
 
 # Minimum plausible peak GHI (W/m²) for a valid historical profile; below this we treat as no data.
@@ -426,21 +543,18 @@ def _is_valid_mean_profile(mean_24: List[float]) -> bool:
     )
 
 
+@lru_cache(maxsize=64)
+def _day_hour_stamps(nominal_day: date) -> Tuple[datetime, ...]:
+    """UTC timestamps for hours 0..23 of nominal_day (datetimes are immutable, so safe to share)."""
+    return tuple(
+        datetime(nominal_day.year, nominal_day.month, nominal_day.day, h, 0, 0, tzinfo=timezone.utc)
+        for h in range(24)
+    )
+
+
 def _mean_profile_to_points(mean_24: List[float], nominal_day: date) -> List[IrradiancePoint]:
     """Build 24 IrradiancePoint for hour 0..23 with given mean GHI and nominal day (UTC)."""
-    out: List[IrradiancePoint] = []
-    for h in range(24):
-        ts = datetime(
-            nominal_day.year,
-            nominal_day.month,
-            nominal_day.day,
-            h,
-            0,
-            0,
-            tzinfo=timezone.utc,
-        )
-        out.append(IrradiancePoint(ts=ts, ghi_wm2=mean_24[h]))
-    return out
+    return [IrradiancePoint(ts=ts, ghi_wm2=mean_24[h]) for h, ts in enumerate(_day_hour_stamps(nominal_day))]
 
 
 def expected_ghi_profile_from_history(
@@ -466,13 +580,11 @@ def expected_ghi_profile_from_history(
         reference_utc = reference_utc.replace(tzinfo=timezone.utc)
     end_date = reference_utc.date() - timedelta(days=lag_days)
     start_date = end_date - timedelta(days=window_days - 1)
-    points = fetch_ghi_historical_window(
-        lat=lat,
-        lon=lon,
-        reference_utc=reference_utc,
-        window_days=window_days,
-        lag_days=lag_days,
-    )
+    try:
+        points = _fetch_series(lat, lon, start_date, end_date)
+    except Exception as e:
+        LOG.warning("NASA POWER historical fetch failed (%s); using fallback.", e)
+        return []
     if not points:
         return []
     mean_24, _, _ = build_hourly_ghi_profile(points)
@@ -499,6 +611,7 @@ def expected_ghi_profile_from_history(
     return _mean_profile_to_points(mean_24, nominal_day)
 
 
+@lru_cache(maxsize=512)
 def _same_day_last_year(ref_date: date) -> date:
     """Same calendar day previous year; if ref_date is Feb 29 and last year is not leap, return Feb 28."""
     try:
@@ -528,10 +641,8 @@ def expected_ghi_profile_from_doy(
     center = _same_day_last_year(ref_date)
     start_date = center - timedelta(days=half_window_days)
     end_date = center + timedelta(days=half_window_days)
-    start_dt = datetime(start_date.year, start_date.month, start_date.day, 0, 0, 0, tzinfo=timezone.utc)
-    end_dt = datetime(end_date.year, end_date.month, end_date.day, 23, 59, 59, tzinfo=timezone.utc)
     try:
-        points = fetch_ghi_hourly(lat, lon, start_dt, end_dt, time_standard=time_standard, timeout_seconds=timeout_seconds)
+        points = _fetch_series(lat, lon, start_date, end_date, time_standard=time_standard, timeout_seconds=timeout_seconds)
     except Exception as e:
         LOG.warning("NASA POWER DOY fallback fetch failed (%s); using synthetic.", e)
         return []
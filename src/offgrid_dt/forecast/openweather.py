@@ -1,40 +1,189 @@
 from __future__ import annotations
 
+import asyncio
+import inspect
+import time as _time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from typing import List, Optional
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache, wraps
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
 
+import numpy as np
 import requests
 
+from ._http import SESSION, json_loads
 
-@dataclass
+try:  # optional: async client (AsyncOpenWeatherSolarClient)
+    import httpx
+except ImportError:  # pragma: no cover - depends on environment
+    httpx = None
+
+
+@dataclass(frozen=True, slots=True)
 class IrradiancePoint:
     ts: datetime
     ghi_wm2: float
 
 
+@dataclass
+class IrradianceSeries:
+    """Irradiance time series stored as parallel arrays (UTC timestamps, GHI in W/m²).
+
+    Parsers and hour-of-day aggregation work on the arrays directly; to_points() gives the
+    IrradiancePoint list used by the public API.
+    """
+
+    ts: np.ndarray  # datetime64 (s or finer), UTC
+    ghi_wm2: np.ndarray  # float64
+
+    @classmethod
+    def empty(cls) -> "IrradianceSeries":
+        return cls(ts=np.empty(0, dtype="datetime64[s]"), ghi_wm2=np.empty(0))
+
+    def __len__(self) -> int:
+        return len(self.ghi_wm2)
+
+    def hour_of_day(self) -> np.ndarray:
+        return self.ts.astype("datetime64[h]").astype(np.int64) % 24
+
+    def to_points(self) -> List[IrradiancePoint]:
+        stamps = self.ts.astype("datetime64[us]").tolist()
+        return [
+            IrradiancePoint(ts=t.replace(tzinfo=timezone.utc), ghi_wm2=v)
+            for t, v in zip(stamps, self.ghi_wm2.tolist())
+        ]
+
+
+_UTC = timezone.utc
+_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+_ONE_US = timedelta(microseconds=1)
+_MISS = object()
+
+
+class _TTLCache:
+    """Tiny in-process TTL cache (key -> (expiry, value)); the oldest entry goes when full."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return _MISS
+        expiry, value = item
+        if expiry < _time.monotonic():
+            self._data.pop(key, None)
+            return _MISS
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: float) -> None:
+        now = _time.monotonic()
+        if key not in self._data and len(self._data) >= self.maxsize:
+            for k in [k for k, (exp, _) in self._data.items() if exp < now]:
+                del self._data[k]
+            if len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+        self._data[key] = (now + ttl_seconds, value)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+# Shared by all clients so Streamlit reruns and rolling replans reuse recent lookups
+_TTL_CACHE = _TTLCache()
+
+
+def _ttl_cached(seconds: float, key_fn: Callable[..., Hashable]):
+    """Cache a client method's list result for ``seconds``, keyed on normalised arguments.
+
+    Failures raise before anything is stored, so only successful responses are cached.
+    """
+
+    def deco(method):
+        # Keyed on the method name, so the sync and async clients share entries
+        if inspect.iscoroutinefunction(method):
+
+            @wraps(method)
+            async def async_wrapper(self, *args, **kwargs):
+                key = (method.__name__, self.base_url, self.api_key, key_fn(*args, **kwargs))
+                value = _TTL_CACHE.get(key)
+                if value is _MISS:
+                    value = await method(self, *args, **kwargs)
+                    _TTL_CACHE.set(key, value, seconds)
+                return list(value)
+
+            return async_wrapper
+
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, self.base_url, self.api_key, key_fn(*args, **kwargs))
+            value = _TTL_CACHE.get(key)
+            if value is _MISS:
+                value = method(self, *args, **kwargs)
+                _TTL_CACHE.set(key, value, seconds)
+            return list(value)
+
+        return wrapper
+
+    return deco
+
+
+def _place_key(query: str, limit: int = 5) -> Hashable:
+    return (query.strip().lower(), limit)
+
+
+def _coord_key(lat: float, lon: float, n: int) -> Hashable:
+    # ~100 m grid: near-duplicate coordinates share one entry
+    return (round(float(lat), 3), round(float(lon), 3), n)
+
+
+# Irradiance endpoints, in order of preference
+_IRRADIANCE_PATHS = ("/data/2.5/solar/forecast", "/data/2.5/solar", "/energy/1.0/solar/forecast")
+
+
 class OpenWeatherSolarClient:
-    def __init__(self, api_key: str, base_url: str = "https://api.openweathermap.org"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.openweathermap.org",
+        session: Optional[requests.Session] = None,
+    ):
         self.api_key = api_key
         self.base_url = base_url.rstrip("/")
+        self._session = session or SESSION
+
+    def close(self) -> None:
+        """Close the client's session; the shared module session stays open for other clients."""
+        if self._session is not SESSION:
+            self._session.close()
 
+    def __enter__(self) -> "OpenWeatherSolarClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @_ttl_cached(900, _place_key)
     def geocode(self, query: str, limit: int = 5) -> List[dict]:
         """Resolve a place name to candidate coordinates using OpenWeather Geocoding API.
 
         Returns a list of dicts with keys like: name, lat, lon, country, state.
         """
         url = f"{self.base_url}/geo/1.0/direct"
-        r = requests.get(url, params={"q": query, "limit": limit, "appid": self.api_key}, timeout=20)
+        r = self._session.get(url, params={"q": query, "limit": limit, "appid": self.api_key}, timeout=20)
         r.raise_for_status()
-        data = r.json()
+        data = json_loads(r.content)
         return data if isinstance(data, list) else []
 
+    @_ttl_cached(86400, lambda lat, lon, limit=1: _coord_key(lat, lon, limit))
     def reverse_geocode(self, lat: float, lon: float, limit: int = 1) -> List[dict]:
         """Resolve coordinates to a human-readable location."""
         url = f"{self.base_url}/geo/1.0/reverse"
-        r = requests.get(url, params={"lat": lat, "lon": lon, "limit": limit, "appid": self.api_key}, timeout=20)
+        r = self._session.get(url, params={"lat": lat, "lon": lon, "limit": limit, "appid": self.api_key}, timeout=20)
         r.raise_for_status()
-        data = r.json()
+        data = json_loads(r.content)
         return data if isinstance(data, list) else []
 
     def current_weather(self, lat: float, lon: float, units: str = "metric") -> dict:
@@ -47,93 +196,213 @@ class OpenWeatherSolarClient:
           - sunrise_ts, sunset_ts (unix)
         """
         url = f"{self.base_url}/data/2.5/weather"
-        r = requests.get(url, params={
+        r = self._session.get(url, params={
             "lat": lat,
             "lon": lon,
             "appid": self.api_key,
             "units": units,
         }, timeout=20)
         r.raise_for_status()
-        data = r.json()
-        weather0 = (data.get("weather") or [{}])[0]
-        main = data.get("main") or {}
-        wind = data.get("wind") or {}
-        clouds = data.get("clouds") or {}
-        sys = data.get("sys") or {}
-        return {
-            "main": weather0.get("main", ""),
-            "description": weather0.get("description", ""),
-            "icon": weather0.get("icon", ""),
-            "temperature_c": float(main.get("temp", 0.0) or 0.0),
-            "humidity_pct": float(main.get("humidity", 0.0) or 0.0),
-            "cloud_cover_pct": float(clouds.get("all", 0.0) or 0.0),
-            "wind_speed_mps": float(wind.get("speed", 0.0) or 0.0),
-            "sunrise_ts": int(sys.get("sunrise", 0) or 0),
-            "sunset_ts": int(sys.get("sunset", 0) or 0),
-            "timezone": int(data.get("timezone", 0) or 0),
-        }
+        return _parse_current_weather(json_loads(r.content))
+
+    def _probe_irradiance(self, url: str, params: dict) -> List[IrradiancePoint]:
+        r = self._session.get(url, params=params, timeout=20)
+        if r.status_code >= 400:
+            return []
+        return _parse_openweather_irradiance(json_loads(r.content))
 
+    @_ttl_cached(900, lambda lat, lon, hours=24: _coord_key(lat, lon, hours))
     def fetch_irradiance_forecast(self, lat: float, lon: float, hours: int = 24) -> List[IrradiancePoint]:
-        candidates = [
-            f"{self.base_url}/data/2.5/solar/forecast",
-            f"{self.base_url}/data/2.5/solar",
-            f"{self.base_url}/energy/1.0/solar/forecast",
-        ]
+        candidates = [f"{self.base_url}{path}" for path in _IRRADIANCE_PATHS]
+        params = {"lat": lat, "lon": lon, "appid": self.api_key, "hours": hours}
+        # Probe all endpoints concurrently; results are still taken in candidate order,
+        # so the preferred endpoint wins whenever it has data.
         last_err: Optional[Exception] = None
-        for url in candidates:
-            try:
-                r = requests.get(
-                    url,
-                    params={"lat": lat, "lon": lon, "appid": self.api_key, "hours": hours},
-                    timeout=20,
-                )
-                if r.status_code >= 400:
+        ex = ThreadPoolExecutor(max_workers=len(candidates))
+        try:
+            futures = [ex.submit(self._probe_irradiance, url, params) for url in candidates]
+            for fut in futures:
+                try:
+                    points = fut.result()
+                except Exception as e:
+                    last_err = e
                     continue
-                data = r.json()
-                points = _parse_openweather_irradiance(data)
                 if points:
                     return points
-            except Exception as e:
-                last_err = e
-                continue
+        finally:
+            ex.shutdown(wait=False, cancel_futures=True)
         raise RuntimeError("Unable to retrieve irradiance forecast from OpenWeather.") from last_err
 
 
+class AsyncOpenWeatherSolarClient:
+    """asyncio counterpart of OpenWeatherSolarClient (requires ``httpx``).
+
+    Same methods, as coroutines, over one pooled ``httpx.AsyncClient``; use it as an async
+    context manager or call ``aclose()``. Lookups share the sync client's TTL cache.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "https://api.openweathermap.org",
+        client: Optional["httpx.AsyncClient"] = None,
+    ):
+        if httpx is None and client is None:
+            raise ImportError("AsyncOpenWeatherSolarClient requires httpx (pip install httpx)")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self._client = client or httpx.AsyncClient(
+            timeout=20, limits=httpx.Limits(max_keepalive_connections=8)
+        )
+
+    async def __aenter__(self) -> "AsyncOpenWeatherSolarClient":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _get_json(self, path: str, params: dict) -> Any:
+        r = await self._client.get(f"{self.base_url}{path}", params=params)
+        r.raise_for_status()
+        return json_loads(r.content)
+
+    @_ttl_cached(900, _place_key)
+    async def geocode(self, query: str, limit: int = 5) -> List[dict]:
+        data = await self._get_json("/geo/1.0/direct", {"q": query, "limit": limit, "appid": self.api_key})
+        return data if isinstance(data, list) else []
+
+    @_ttl_cached(86400, lambda lat, lon, limit=1: _coord_key(lat, lon, limit))
+    async def reverse_geocode(self, lat: float, lon: float, limit: int = 1) -> List[dict]:
+        params = {"lat": lat, "lon": lon, "limit": limit, "appid": self.api_key}
+        data = await self._get_json("/geo/1.0/reverse", params)
+        return data if isinstance(data, list) else []
+
+    async def current_weather(self, lat: float, lon: float, units: str = "metric") -> dict:
+        params = {"lat": lat, "lon": lon, "appid": self.api_key, "units": units}
+        return _parse_current_weather(await self._get_json("/data/2.5/weather", params))
+
+    async def _probe_irradiance(self, path: str, params: dict) -> List[IrradiancePoint]:
+        r = await self._client.get(f"{self.base_url}{path}", params=params)
+        if r.status_code >= 400:
+            return []
+        return _parse_openweather_irradiance(json_loads(r.content))
+
+    @_ttl_cached(900, lambda lat, lon, hours=24: _coord_key(lat, lon, hours))
+    async def fetch_irradiance_forecast(self, lat: float, lon: float, hours: int = 24) -> List[IrradiancePoint]:
+        params = {"lat": lat, "lon": lon, "appid": self.api_key, "hours": hours}
+        results = await asyncio.gather(
+            *(self._probe_irradiance(path, params) for path in _IRRADIANCE_PATHS),
+            return_exceptions=True,
+        )
+        # Candidate order decides, as in the sync client
+        last_err: Optional[BaseException] = None
+        for res in results:
+            if isinstance(res, BaseException):
+                last_err = res
+            elif res:
+                return res
+        raise RuntimeError("Unable to retrieve irradiance forecast from OpenWeather.") from last_err
+
+
+def _parse_current_weather(data: dict) -> dict:
+    weather0 = (data.get("weather") or [{}])[0]
+    main = data.get("main") or {}
+    wind = data.get("wind") or {}
+    clouds = data.get("clouds") or {}
+    sys = data.get("sys") or {}
+    return {
+        "main": weather0.get("main", ""),
+        "description": weather0.get("description", ""),
+        "icon": weather0.get("icon", ""),
+        "temperature_c": float(main.get("temp", 0.0) or 0.0),
+        "humidity_pct": float(main.get("humidity", 0.0) or 0.0),
+        "cloud_cover_pct": float(clouds.get("all", 0.0) or 0.0),
+        "wind_speed_mps": float(wind.get("speed", 0.0) or 0.0),
+        "sunrise_ts": int(sys.get("sunrise", 0) or 0),
+        "sunset_ts": int(sys.get("sunset", 0) or 0),
+        "timezone": int(data.get("timezone", 0) or 0),
+    }
+
+
 def _parse_openweather_irradiance(data: dict) -> List[IrradiancePoint]:
-    points: List[IrradiancePoint] = []
+    return _parse_openweather_irradiance_arrays(data).to_points()
+
+
+def _parse_openweather_irradiance_arrays(data: dict) -> IrradianceSeries:
+    """Parse either OpenWeather solar payload shape straight into arrays.
+
+    Integer Unix "dt" values become epoch microseconds without building a datetime.
+    """
+    ts_us: List[int] = []
+    ghi_vals: List[float] = []
     if isinstance(data, dict) and "list" in data and isinstance(data["list"], list):
         for item in data["list"]:
-            ts = _ts_from_any(item.get("dt"))
+            v = item.get("dt")
             ghi = item.get("ghi") or item.get("GHI") or item.get("global_horizontal_irradiance")
-            if ts and ghi is not None:
-                points.append(IrradiancePoint(ts=ts, ghi_wm2=float(ghi)))
-        return points
-
-    if isinstance(data, dict) and "data" in data and isinstance(data["data"], list):
+            if ghi is None:
+                continue
+            if type(v) is int:
+                ts_us.append(v * 1_000_000)
+            else:
+                ts = _ts_from_any(v)
+                if not ts:
+                    continue
+                ts_us.append((ts - _EPOCH) // _ONE_US)
+            ghi_vals.append(float(ghi))
+    elif isinstance(data, dict) and "data" in data and isinstance(data["data"], list):
         for item in data["data"]:
             ts = _ts_from_any(item.get("date") or item.get("dt"))
             irr = item.get("irradiance", {}) if isinstance(item, dict) else {}
             ghi = irr.get("ghi") if isinstance(irr, dict) else None
             if ts and ghi is not None:
-                points.append(IrradiancePoint(ts=ts, ghi_wm2=float(ghi)))
-        return points
-
-    return points
+                ts_us.append((ts - _EPOCH) // _ONE_US)
+                ghi_vals.append(float(ghi))
+    return IrradianceSeries(
+        ts=np.array(ts_us, dtype=np.int64).astype("datetime64[us]"),
+        ghi_wm2=np.array(ghi_vals, dtype=np.float64),
+    )
 
 
 def _ts_from_any(v) -> Optional[datetime]:
+    # Exact-type checks first: payload "dt" values are almost always plain ints
+    t = type(v)
+    if t is int or t is float:
+        return datetime.fromtimestamp(v, _UTC)
+    if t is str:
+        return _ts_from_iso(v)
     if v is None:
         return None
+    # Subclasses (bool, NumPy scalars, str subclasses) keep the isinstance semantics
     if isinstance(v, (int, float)):
-        return datetime.fromtimestamp(float(v), tz=timezone.utc)
+        return datetime.fromtimestamp(float(v), tz=_UTC)
     if isinstance(v, str):
-        try:
-            return datetime.fromisoformat(v.replace("Z", "+00:00")).astimezone(timezone.utc)
-        except Exception:
-            return None
+        return _ts_from_iso(str(v))
     return None
 
 
+@lru_cache(maxsize=1024)
+def _ts_from_iso(v: str) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp to UTC; forecasts repeat the same hour stamps, hence the cache."""
+    try:
+        if v.endswith("Z"):
+            # Common "...Z" form: parse naive and attach UTC, no offset string or astimezone
+            ts = datetime.fromisoformat(v[:-1])
+            if ts.tzinfo is None:
+                return ts.replace(tzinfo=_UTC)
+        return datetime.fromisoformat(v.replace("Z", "+00:00")).astimezone(_UTC)
+    except Exception:
+        return None
+
+
+# Unit-peak bell shape for hours 0..23 (same formula as _synthetic_bell)
+_HOURS_24 = np.arange(24, dtype=float)
+_X_24 = (_HOURS_24 - 6.0) / 12.0
+_BELL_SHAPE_24 = np.where((_HOURS_24 >= 6.0) & (_HOURS_24 <= 18.0), 4.0 * _X_24 * (1.0 - _X_24), 0.0)
+
+
 def synthetic_irradiance_forecast(
     start: datetime,
     hours: int = 24,
@@ -150,17 +419,52 @@ def synthetic_irradiance_forecast(
         start = start.replace(tzinfo=timezone.utc)
     step_minutes = max(1, int(step_minutes))
     total_steps = int(round((hours * 60) / step_minutes))
-    points: List[IrradiancePoint] = []
-    for i in range(total_steps):
-        ts = start + timedelta(minutes=i * step_minutes)
-
-        # Simple bell-shaped daytime curve (06:00–18:00) at *time-of-day* resolution.
-        hour = ts.hour + ts.minute / 60.0
-        if 6.0 <= hour <= 18.0:
-            x = (hour - 6.0) / 12.0
-            ghi = peak_ghi_wm2 * (4.0 * x * (1.0 - x))
-        else:
-            ghi = 0.0
-
-        points.append(IrradiancePoint(ts=ts, ghi_wm2=float(max(0.0, ghi))))
-    return points
+    ghi = _synthetic_ghi(start, total_steps, step_minutes, float(peak_ghi_wm2)).tolist()
+    return [
+        IrradiancePoint(ts=start + timedelta(minutes=i * step_minutes), ghi_wm2=g)
+        for i, g in enumerate(ghi)
+    ]
+
+
+def synthetic_irradiance_array(
+    start: datetime,
+    hours: int = 24,
+    step_minutes: int = 60,
+    peak_ghi_wm2: float = 850.0,
+) -> IrradianceSeries:
+    """Same curve as synthetic_irradiance_forecast, as arrays (no per-point objects)."""
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    step_minutes = max(1, int(step_minutes))
+    total_steps = int(round((hours * 60) / step_minutes))
+    t0 = np.datetime64(start.astimezone(timezone.utc).replace(tzinfo=None), "us")
+    ts = t0 + np.arange(total_steps) * np.timedelta64(step_minutes, "m")
+    return IrradianceSeries(ts=ts, ghi_wm2=_synthetic_ghi(start, total_steps, step_minutes, float(peak_ghi_wm2)))
+
+
+def _synthetic_ghi(start: datetime, total_steps: int, step_minutes: int, peak_ghi_wm2: float) -> np.ndarray:
+    if step_minutes == 60 and total_steps == 24 and start.minute == 0:
+        # Default hourly day: scale the precomputed shape, rotated to the start hour
+        return np.maximum(peak_ghi_wm2 * np.roll(_BELL_SHAPE_24, -start.hour), 0.0)
+    return np.array(
+        _synthetic_bell(start.time().replace(tzinfo=None), total_steps, step_minutes, peak_ghi_wm2)
+    )
+
+
+@lru_cache(maxsize=32)
+def _synthetic_bell(
+    start_time_of_day: time,
+    total_steps: int,
+    step_minutes: int,
+    peak_ghi_wm2: float,
+) -> Tuple[float, ...]:
+    """GHI values of the synthetic curve; they depend only on the start's time of day."""
+    # Minute of day of each step (seconds never carry: steps are whole minutes)
+    minute0 = start_time_of_day.hour * 60 + start_time_of_day.minute
+    minute_of_day = (minute0 + np.arange(total_steps, dtype=np.int64) * step_minutes) % 1440
+
+    # Simple bell-shaped daytime curve (06:00–18:00) at *time-of-day* resolution.
+    hour = (minute_of_day // 60).astype(float) + (minute_of_day % 60) / 60.0
+    x = (hour - 6.0) / 12.0
+    ghi = np.where((hour >= 6.0) & (hour <= 18.0), peak_ghi_wm2 * (4.0 * x * (1.0 - x)), 0.0)
+    return tuple(np.maximum(ghi, 0.0).tolist())
@@ -1,22 +1,41 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import List
+from typing import List, Optional, Sequence, Union
 
-from .openweather import IrradiancePoint
+import numpy as np
+
+from .openweather import IrradiancePoint, IrradianceSeries
+
+
+def ghi_array(points: Union[Sequence[IrradiancePoint], IrradianceSeries]) -> np.ndarray:
+    """GHI values (W/m²) of a point list or series as a float64 array."""
+    if isinstance(points, IrradianceSeries):
+        return np.asarray(points.ghi_wm2, dtype=float)
+    return np.fromiter((p.ghi_wm2 for p in points), dtype=float, count=len(points))
+
+
+def irradiance_to_pv_power_array(
+    ghi_wm2: np.ndarray,
+    pv_capacity_kw: float,
+    pv_efficiency: float = 0.18,
+    ref_irradiance_wm2: float = 1000.0,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """PV output (kW) for an array of GHI values; negative irradiance gives 0 kW."""
+    scale = np.fmax(np.divide(ghi_wm2, ref_irradiance_wm2, out=out), 0.0, out=out)
+    return np.multiply(np.multiply(pv_capacity_kw, scale, out=out), pv_efficiency / 0.18, out=out)
 
 
 def irradiance_to_pv_power_kw(
-    points: List[IrradiancePoint],
+    points: Union[List[IrradiancePoint], IrradianceSeries],
     pv_capacity_kw: float,
     pv_efficiency: float = 0.18,
     ref_irradiance_wm2: float = 1000.0,
 ) -> List[float]:
-    out: List[float] = []
-    for p in points:
-        scale = max(0.0, float(p.ghi_wm2) / ref_irradiance_wm2)
-        out.append(pv_capacity_kw * scale * (pv_efficiency / 0.18))
-    return out
+    return irradiance_to_pv_power_array(
+        ghi_array(points), pv_capacity_kw, pv_efficiency, ref_irradiance_wm2
+    ).tolist()
 
 
 def now_utc() -> datetime:
@@ -1,61 +1,328 @@
 from __future__ import annotations
 
+import csv
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
-from offgrid_dt.io.schema import StepRecord
+from offgrid_dt.io.schema import AnyStepRecord, ControlDecision, Guidance
+
+try:  # C JSON encoder for the guidance log; stdlib json otherwise
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+try:  # optional: Parquet sibling of the state CSV (much faster to read back)
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - depends on environment
+    pyarrow = None
+
+# Numeric state columns, stored as preallocated ndarrays (CSV column order).
+_FLOAT_COLUMNS = (
+    "pv_now_kw",
+    "soc_now",
+    "load_requested_kw",
+    "load_served_kw",
+    "crit_requested_kw",
+    "crit_served_kw",
+    "curtailed_solar_kw",
+    "charge_kw",
+    "discharge_kw",
+)
+# Text columns, stored as preallocated object arrays.
+_TEXT_COLUMNS = (
+    "served_task_ids",
+    "deferred_task_ids",
+    "risk_level",
+    "headline",
+    "explanation",
+    "reason_codes",
+)
+
+
+def _guidance_line(ts_iso: str, g: Guidance) -> bytes:
+    """One JSONL guidance record (without the newline)."""
+    line = {"timestamp": ts_iso, **g.model_dump()}
+    if orjson is not None:
+        return orjson.dumps(line, default=float)
+    return json.dumps(line, ensure_ascii=False, separators=(",", ":"), default=float).encode("utf-8")
 
 
 @dataclass
 class RunLogger:
+    """Columnar step log.
+
+    Each column is a preallocated array of ``n_rows`` slots (grown by doubling if a run
+    writes more rows), so appending a step is a handful of slot assignments and flush
+    builds the DataFrame straight from the columns instead of one dict per row.
+
+    With ``streaming=True`` nothing is kept in memory: each step is appended to
+    ``<prefix>_state.csv`` / ``<prefix>_guidance.jsonl`` as it arrives (same columns as
+    the batch CSV, KPI columns fixed by the first step) and the files are flushed every
+    ``flush_every`` rows. ``flush()`` then just closes them; use the logger as a context
+    manager so the files are also closed when a run fails before ``flush()``.
+    """
+
     out_dir: Path
+    n_rows: int = 0
+    prefix: Optional[str] = None
+    streaming: bool = False
+    flush_every: int = 64
 
     def __post_init__(self) -> None:
         self.out_dir.mkdir(parents=True, exist_ok=True)
-        self._records: List[StepRecord] = []
+        cap = 1 if self.streaming else max(1, int(self.n_rows))
+        self._n = 0
+        self._timestamps: List[Any] = [None] * cap
+        self._step_index = np.zeros(cap, dtype=np.int64)
+        self._float_cols: Dict[str, np.ndarray] = {c: np.zeros(cap) for c in _FLOAT_COLUMNS}
+        self._text_cols: Dict[str, np.ndarray] = {c: np.empty(cap, dtype=object) for c in _TEXT_COLUMNS}
+        self._kpi_cols: Dict[str, np.ndarray] = {}
+        self._guidance: List[Any] = [None] * cap
+        if self.streaming:
+            if not self.prefix:
+                raise ValueError("RunLogger(streaming=True) needs a prefix for its output files")
+            self._state_path = self.out_dir / f"{self.prefix}_state.csv"
+            self._guidance_path = self.out_dir / f"{self.prefix}_guidance.jsonl"
+            self._state_f = self._state_path.open("w", encoding="utf-8", newline="")
+            self._guidance_f = self._guidance_path.open("wb")
+            self._csv = csv.writer(self._state_f, lineterminator="\n")
+            self._kpi_keys: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __enter__(self) -> "RunLogger":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self.streaming:
+            self._state_f.close()
+            self._guidance_f.close()
+
+    def _grow(self, min_cap: int) -> None:
+        cap = len(self._step_index)
+        new_cap = max(min_cap, 2 * cap)
+        extra = new_cap - cap
+        self._timestamps.extend([None] * extra)
+        self._guidance.extend([None] * extra)
+        self._step_index = np.concatenate((self._step_index, np.zeros(extra, dtype=np.int64)))
+        for cols in (self._float_cols, self._kpi_cols):
+            for k, v in cols.items():
+                cols[k] = np.concatenate((v, np.zeros(extra)))
+        for k, v in self._text_cols.items():
+            self._text_cols[k] = np.concatenate((v, np.empty(extra, dtype=object)))
 
-    def append(self, rec: StepRecord) -> None:
-        self._records.append(rec)
+    def append_row(self, i: int, **fields: Any) -> None:
+        """Write one step into row slot ``i``.
 
-    def flush(self, prefix: str) -> dict:
-        """Write CSV state log and JSONL guidance log. Returns file paths."""
-        if not self._records:
+        Accepted fields: ``timestamp``, ``step_index``, ``guidance`` (a Guidance model, kept for
+        the JSONL log), ``kpis`` (dict of running KPI values) and any state column name.
+        """
+        if i >= len(self._step_index):
+            self._grow(i + 1)
+        for k, v in fields.items():
+            if k == "timestamp":
+                self._timestamps[i] = v
+            elif k == "step_index":
+                self._step_index[i] = v
+            elif k == "guidance":
+                self._guidance[i] = v
+            elif k == "kpis":
+                for name, val in v.items():
+                    col = self._kpi_cols.get(name)
+                    if col is None:
+                        col = self._kpi_cols[name] = np.zeros(len(self._step_index))
+                    col[i] = val
+            elif k in self._float_cols:
+                self._float_cols[k][i] = v
+            else:
+                self._text_cols[k][i] = v
+        if i >= self._n:
+            self._n = i + 1
+
+    def append_step(
+        self,
+        i: int,
+        timestamp: Any,
+        pv_now_kw: float,
+        soc_now: float,
+        load_requested_kw: float,
+        load_served_kw: float,
+        crit_requested_kw: float,
+        crit_served_kw: float,
+        curtailed_solar_kw: float,
+        decision: ControlDecision,
+        guidance: Guidance,
+        kpis: Dict[str, float],
+        step_index: Optional[int] = None,
+    ) -> None:
+        """Write one simulator step into row slot ``i`` (the simulator's hot path)."""
+        if self.streaming:
+            self._stream_step(
+                timestamp,
+                i if step_index is None else step_index,
+                (pv_now_kw, soc_now, load_requested_kw, load_served_kw, crit_requested_kw,
+                 crit_served_kw, curtailed_solar_kw, decision.charge_kw, decision.discharge_kw),
+                (";".join(decision.served_task_ids), ";".join(decision.deferred_task_ids),
+                 guidance.risk_level, guidance.headline, guidance.explanation,
+                 ";".join(guidance.reason_codes)),
+                guidance,
+                kpis,
+            )
+            return
+        if i >= len(self._step_index):
+            self._grow(i + 1)
+        f = self._float_cols
+        t = self._text_cols
+        self._timestamps[i] = timestamp
+        self._step_index[i] = i if step_index is None else step_index
+        f["pv_now_kw"][i] = pv_now_kw
+        f["soc_now"][i] = soc_now
+        f["load_requested_kw"][i] = load_requested_kw
+        f["load_served_kw"][i] = load_served_kw
+        f["crit_requested_kw"][i] = crit_requested_kw
+        f["crit_served_kw"][i] = crit_served_kw
+        f["curtailed_solar_kw"][i] = curtailed_solar_kw
+        f["charge_kw"][i] = decision.charge_kw
+        f["discharge_kw"][i] = decision.discharge_kw
+        t["served_task_ids"][i] = ";".join(decision.served_task_ids)
+        t["deferred_task_ids"][i] = ";".join(decision.deferred_task_ids)
+        t["risk_level"][i] = guidance.risk_level
+        t["headline"][i] = guidance.headline
+        t["explanation"][i] = guidance.explanation
+        t["reason_codes"][i] = ";".join(guidance.reason_codes)
+        self._guidance[i] = guidance
+        for name, val in kpis.items():
+            col = self._kpi_cols.get(name)
+            if col is None:
+                col = self._kpi_cols[name] = np.zeros(len(self._step_index))
+            col[i] = val
+        if i >= self._n:
+            self._n = i + 1
+
+    def _stream_step(
+        self,
+        timestamp: Any,
+        step_index: int,
+        floats: tuple,
+        texts: tuple,
+        guidance: Guidance,
+        kpis: Dict[str, float],
+    ) -> None:
+        if self._kpi_keys is None:
+            self._kpi_keys = list(kpis)
+            self._csv.writerow(
+                ["timestamp", "step_index", *_FLOAT_COLUMNS, *_TEXT_COLUMNS]
+                + [f"kpi_{k}" for k in self._kpi_keys]
+            )
+        ts_iso = timestamp.isoformat()
+        self._csv.writerow(
+            [ts_iso, step_index, *map(float, floats), *texts]
+            + [float(kpis.get(k, 0.0)) for k in self._kpi_keys]
+        )
+        self._guidance_f.write(_guidance_line(ts_iso, guidance) + b"\n")
+        self._n += 1
+        if self._n % self.flush_every == 0:
+            self._state_f.flush()
+            self._guidance_f.flush()
+
+    def append(self, rec: AnyStepRecord) -> None:
+        """Append a StepRecord or StepRecordInternal (fields are read as plain attributes)."""
+        self.append_step(
+            self._n,
+            timestamp=rec.timestamp,
+            pv_now_kw=rec.pv_now_kw,
+            soc_now=rec.soc_now,
+            load_requested_kw=rec.load_requested_kw,
+            load_served_kw=rec.load_served_kw,
+            crit_requested_kw=rec.crit_requested_kw,
+            crit_served_kw=rec.crit_served_kw,
+            curtailed_solar_kw=rec.curtailed_solar_kw,
+            decision=rec.decision,
+            guidance=rec.guidance,
+            kpis=rec.kpis_running,
+            step_index=rec.step_index,
+        )
+
+    def flush(self, prefix: Optional[str] = None) -> dict:
+        """Write CSV state log and JSONL guidance log. Returns file paths.
+
+        In streaming mode the rows are already on disk; this closes the files, and
+        ``prefix`` (fixed when the files were opened) must be omitted or match.
+        """
+        if self.streaming:
+            if prefix is not None and prefix != self.prefix:
+                raise ValueError(
+                    f"streaming RunLogger writes {self.prefix!r} files; cannot flush as {prefix!r}"
+                )
+            self._state_f.close()
+            self._guidance_f.close()
+            if not self._n:
+                return {}
+            return {"state_csv": str(self._state_path), "guidance_jsonl": str(self._guidance_path)}
+
+        n = self._n
+        if not n:
             return {}
 
+        prefix = prefix or self.prefix
         state_path = self.out_dir / f"{prefix}_state.csv"
         guidance_path = self.out_dir / f"{prefix}_guidance.jsonl"
 
-        rows = []
-        with guidance_path.open("w", encoding="utf-8") as f:
-            for r in self._records:
-                rows.append(
-                    {
-                        "timestamp": r.timestamp.isoformat(),
-                        "step_index": r.step_index,
-                        "pv_now_kw": r.pv_now_kw,
-                        "soc_now": r.soc_now,
-                        "load_requested_kw": r.load_requested_kw,
-                        "load_served_kw": r.load_served_kw,
-                        "crit_requested_kw": r.crit_requested_kw,
-                        "crit_served_kw": r.crit_served_kw,
-                        "curtailed_solar_kw": r.curtailed_solar_kw,
-                        "charge_kw": r.decision.charge_kw,
-                        "discharge_kw": r.decision.discharge_kw,
-                        "served_task_ids": ";".join(r.decision.served_task_ids),
-                        "deferred_task_ids": ";".join(r.decision.deferred_task_ids),
-                        "risk_level": r.guidance.risk_level,
-                        "headline": r.guidance.headline,
-                        "explanation": r.guidance.explanation,
-                        "reason_codes": ";".join(r.guidance.reason_codes),
-                        **{f"kpi_{k}": v for k, v in r.kpis_running.items()},
-                    }
-                )
-                line = {"timestamp": r.timestamp.isoformat(), **r.guidance.model_dump()}
-                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+        ts_iso = [t.isoformat() for t in self._timestamps[:n]]
+        # Serialise every line first, then hand the file one write
+        payload = b"\n".join(_guidance_line(ts, g) for ts, g in zip(ts_iso, self._guidance[:n]))
+        guidance_path.write_bytes(payload + b"\n")
+
+        columns: Dict[str, Any] = {"timestamp": ts_iso, "step_index": self._step_index[:n]}
+        columns.update({k: v[:n] for k, v in self._float_cols.items()})
+        columns.update({k: v[:n] for k, v in self._text_cols.items()})
+        columns.update({f"kpi_{k}": v[:n] for k, v in self._kpi_cols.items()})
+        df = pd.DataFrame(columns)
+        df.to_csv(state_path, index=False)
+        out = {"state_csv": str(state_path), "guidance_jsonl": str(guidance_path)}
+        if pyarrow is not None:
+            parquet_path = state_path.with_suffix(".parquet")
+            df.to_parquet(parquet_path, index=False, compression="snappy")
+            out["state_parquet"] = str(parquet_path)
+        return out
+
+
+def read_state_log(state_csv_path: str | Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Load a state log, preferring its Parquet sibling when one at least as new exists.
+
+    The CSV stays the canonical artifact; the Parquet copy is only used when pyarrow is
+    installed and the file was not left behind by an older run. With ``columns``, only
+    those columns are read (in that order; names absent from the log are skipped). Either
+    source yields the same frame: floats round-trip exactly, timestamps stay ISO strings
+    and empty text cells read as "".
+    """
+    csv_path = Path(state_csv_path)
+    parquet_path = csv_path.with_suffix(".parquet")
+    if pyarrow is not None:
+        try:
+            if parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+                if columns is None:
+                    return pd.read_parquet(parquet_path)
+                import pyarrow.parquet as pq
 
-        pd.DataFrame(rows).to_csv(state_path, index=False)
-        return {"state_csv": str(state_path), "guidance_jsonl": str(guidance_path)}
+                names = set(pq.read_schema(parquet_path).names)
+                return pd.read_parquet(parquet_path, columns=[c for c in columns if c in names])
+        except OSError:
+            pass
+    if columns is None:
+        df = pd.read_csv(csv_path, float_precision="round_trip")
+    else:
+        header = set(pd.read_csv(csv_path, nrows=0).columns)
+        usecols = [c for c in columns if c in header]
+        df = pd.read_csv(csv_path, usecols=usecols, float_precision="round_trip")[usecols]
+    # Empty text cells come back as NaN from CSV but as "" from Parquet; match Parquet
+    for c in _TEXT_COLUMNS:
+        if c in df.columns:
+            df[c] = df[c].fillna("").astype(str)
+    return df
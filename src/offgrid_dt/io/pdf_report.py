@@ -9,16 +9,32 @@ It is to create a credible, reproducible "today's plan" artifact suitable for:
   - field pilot style guidance
 """
 
+from functools import lru_cache
 from io import BytesIO
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 from reportlab.lib.pagesizes import A4
 
+from offgrid_dt.io.logger import read_state_log
 from offgrid_dt.matching import format_day_ahead_statements
 from reportlab.lib.units import cm
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
 
+# Page geometry (points), shared by the PDF builders
+_PAGE_W, _PAGE_H = A4
+_X0 = 2.0 * cm  # left margin
+_TOP_Y = _PAGE_H - 2.0 * cm  # first baseline on a page
+_TEXT_W = _PAGE_W - 2 * _X0  # paragraph width between the margins
+_BOTTOM = 2.2 * cm  # break to a new page below this
+_COL2_OFF = 5.5 * cm  # schedule table: appliance column
+_COL3_OFF = 13.0 * cm  # schedule table: advisory column
+_LINE = 0.45 * cm  # key/value and table row spacing
+_HEADER_GAP = 0.55 * cm  # below a section heading
+_RULE_GAP = 0.35 * cm  # above/below the table header rule
+
 
 def build_plan_pdf(
     *,
@@ -42,49 +58,22 @@ def build_plan_pdf(
 
     buf = BytesIO()
     c = canvas.Canvas(buf, pagesize=A4)
-    w, h = A4
-
-    x0 = 2.0 * cm
-    y = h - 2.0 * cm
-
-    # Title
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(x0, y, title)
-    y -= 0.8 * cm
-
-    # System summary
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(x0, y, "System")
-    y -= 0.55 * cm
-    c.setFont("Helvetica", 10)
-    for k, v in system_summary.items():
-        c.drawString(x0, y, f"{k}: {v}")
-        y -= 0.45 * cm
-
-    y -= 0.25 * cm
-
-    # KPI summary
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(x0, y, "Key outcomes")
-    y -= 0.55 * cm
-    c.setFont("Helvetica", 10)
-    for k, v in kpis.items():
-        c.drawString(x0, y, f"{k}: {v}")
-        y -= 0.45 * cm
+    x0 = _X0
+    y = _draw_header(c, title, system_summary, kpis)
 
     y -= 0.25 * cm
 
     # Recommendations
     c.setFont("Helvetica-Bold", 12)
     c.drawString(x0, y, "Top recommendation")
-    y -= 0.55 * cm
+    y -= _HEADER_GAP
     c.setFont("Helvetica-Bold", 11)
     c.drawString(x0, y, recommendations.get("headline", ""))
-    y -= 0.55 * cm
+    y -= _HEADER_GAP
 
     c.setFont("Helvetica", 10)
     explanation = recommendations.get("explanation", "")
-    y = _draw_paragraph(c, x0, y, explanation, max_width=w - 2 * x0, leading=12)
+    y = _draw_paragraph(c, x0, y, explanation, max_width=_TEXT_W, leading=12)
     y -= 0.2 * cm
     c.setFont("Helvetica", 9)
     c.drawString(x0, y, f"Day-ahead risk: {recommendations.get('risk', '')}")
@@ -96,22 +85,22 @@ def build_plan_pdf(
     y -= 0.6 * cm
 
     col1 = x0
-    col2 = x0 + 5.5 * cm
-    col3 = x0 + 13.0 * cm
+    col2 = x0 + _COL2_OFF
+    col3 = x0 + _COL3_OFF
 
     c.setFont("Helvetica-Bold", 10)
     c.drawString(col1, y, "Time window")
     c.drawString(col2, y, "Appliance")
     c.drawString(col3, y, "Advisory")
-    y -= 0.35 * cm
-    c.line(x0, y, w - x0, y)
-    y -= 0.35 * cm
+    y -= _RULE_GAP
+    c.line(x0, y, _PAGE_W - x0, y)
+    y -= _RULE_GAP
 
     c.setFont("Helvetica", 10)
     for r in schedule_rows[:18]:  # keep to one page; this is a handout
-        if y < 2.2 * cm:
+        if y < _BOTTOM:
             c.showPage()
-            y = h - 2.0 * cm
+            y = _TOP_Y
             c.setFont("Helvetica-Bold", 12)
             c.drawString(x0, y, "Today’s suggested schedule (cont.)")
             y -= 0.8 * cm
@@ -128,12 +117,12 @@ def build_plan_pdf(
         if not adv_str or adv_str.lower() in ("nan", "none"):
             adv_str = "Don't run"
         c.drawString(col3, y, adv_str[:18])
-        y -= 0.45 * cm
+        y -= _LINE
 
     if notes:
         y -= 0.25 * cm
         c.setFont("Helvetica-Oblique", 9)
-        y = _draw_paragraph(c, x0, y, notes, max_width=w - 2 * x0, leading=11)
+        y = _draw_paragraph(c, x0, y, notes, max_width=_TEXT_W, leading=11)
 
     c.showPage()
     c.save()
@@ -163,50 +152,23 @@ def build_two_day_plan_pdf(
 
     buf = BytesIO()
     c = canvas.Canvas(buf, pagesize=A4)
-    w, h = A4
-
-    x0 = 2.0 * cm
-    y = h - 2.0 * cm
-
-    # Title
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(x0, y, title)
-    y -= 0.8 * cm
-
-    # System summary
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(x0, y, "System")
-    y -= 0.55 * cm
-    c.setFont("Helvetica", 10)
-    for k, v in system_summary.items():
-        c.drawString(x0, y, f"{k}: {v}")
-        y -= 0.45 * cm
-
-    y -= 0.25 * cm
-
-    # KPI summary
-    c.setFont("Helvetica-Bold", 12)
-    c.drawString(x0, y, "Key outcomes")
-    y -= 0.55 * cm
-    c.setFont("Helvetica", 10)
-    for k, v in kpis.items():
-        c.drawString(x0, y, f"{k}: {v}")
-        y -= 0.45 * cm
+    x0 = _X0
+    y = _draw_header(c, title, system_summary, kpis)
 
-    y -= 0.35 * cm
+    y -= _RULE_GAP
 
     # Day-ahead outlook (matching: demand vs solar)
     if day_ahead_outlook_text or day_ahead_risk:
         c.setFont("Helvetica-Bold", 12)
         c.drawString(x0, y, "Day-ahead outlook (00:00-24:00)")
-        y -= 0.55 * cm
+        y -= _HEADER_GAP
         c.setFont("Helvetica", 10)
         if day_ahead_outlook_text:
-            y = _draw_paragraph(c, x0, y, str(day_ahead_outlook_text), max_width=w - 2 * x0, leading=12)
+            y = _draw_paragraph(c, x0, y, str(day_ahead_outlook_text), max_width=_TEXT_W, leading=12)
             y -= 0.2 * cm
         if day_ahead_risk:
             c.drawString(x0, y, "Risk: " + str(day_ahead_risk))
-            y -= 0.45 * cm
+            y -= _LINE
         y -= 0.2 * cm
     if day_ahead_statements:
         c.setFont("Helvetica-Bold", 12)
@@ -214,26 +176,26 @@ def build_two_day_plan_pdf(
         y -= 0.5 * cm
         c.setFont("Helvetica", 10)
         for stmt in day_ahead_statements[:16]:
-            if y < 2.2 * cm:
+            if y < _BOTTOM:
                 c.showPage()
-                y = h - 2.0 * cm
+                y = _TOP_Y
                 c.setFont("Helvetica-Bold", 12)
                 c.drawString(x0, y, "Appliance advice (day-ahead, cont.)")
                 y -= 0.5 * cm
                 c.setFont("Helvetica", 10)
-            y = _draw_paragraph(c, x0 + 0.3 * cm, y, "• " + str(stmt)[:90], max_width=w - 2 * x0 - 0.3 * cm, leading=11)
+            y = _draw_paragraph(c, x0 + 0.3 * cm, y, "• " + str(stmt)[:90], max_width=_TEXT_W - 0.3 * cm, leading=11)
             y -= 0.15 * cm
         y -= 0.25 * cm
 
     # Today recommendation
     c.setFont("Helvetica-Bold", 12)
     c.drawString(x0, y, "Today — top recommendation")
-    y -= 0.55 * cm
+    y -= _HEADER_GAP
     c.setFont("Helvetica-Bold", 11)
     c.drawString(x0, y, recommendations_today.get("headline", ""))
-    y -= 0.55 * cm
+    y -= _HEADER_GAP
     c.setFont("Helvetica", 10)
-    y = _draw_paragraph(c, x0, y, recommendations_today.get("explanation", ""), max_width=w - 2 * x0, leading=12)
+    y = _draw_paragraph(c, x0, y, recommendations_today.get("explanation", ""), max_width=_TEXT_W, leading=12)
     y -= 0.2 * cm
     c.setFont("Helvetica", 9)
     c.drawString(x0, y, f"Day-ahead risk: {recommendations_today.get('risk','')}")
@@ -244,8 +206,6 @@ def build_two_day_plan_pdf(
         c,
         x0,
         y,
-        w,
-        h,
         heading="Today’s suggested schedule",
         rows=schedule_rows_today or [{"time_window": "-", "appliance": "No schedulable tasks", "advisory": "-"}],
     )
@@ -253,35 +213,29 @@ def build_two_day_plan_pdf(
     # Tomorrow section (new page for clarity)
     if recommendations_tomorrow is not None or schedule_rows_tomorrow is not None:
         c.showPage()
-        y = h - 2.0 * cm
+        y = _TOP_Y
         c.setFont("Helvetica-Bold", 14)
         c.drawString(x0, y, "Tomorrow — day-ahead plan (NASA POWER solar forecast)")
         y -= 0.7 * cm
 
         if tomorrow_outlook:
-            c.setFont("Helvetica-Bold", 12)
-            c.drawString(x0, y, "Tomorrow outlook")
-            y -= 0.55 * cm
-            c.setFont("Helvetica", 10)
-            for k, v in tomorrow_outlook.items():
-                c.drawString(x0, y, f"{k}: {v}")
-                y -= 0.45 * cm
+            y = _draw_kv_block(c, x0, y, "Tomorrow outlook", tomorrow_outlook)
             y -= 0.2 * cm
 
         if recommendations_tomorrow:
             c.setFont("Helvetica-Bold", 12)
             c.drawString(x0, y, "Top recommendation")
-            y -= 0.55 * cm
+            y -= _HEADER_GAP
             c.setFont("Helvetica-Bold", 11)
             c.drawString(x0, y, recommendations_tomorrow.get("headline", ""))
-            y -= 0.55 * cm
+            y -= _HEADER_GAP
             c.setFont("Helvetica", 10)
             y = _draw_paragraph(
                 c,
                 x0,
                 y,
                 recommendations_tomorrow.get("explanation", ""),
-                max_width=w - 2 * x0,
+                max_width=_TEXT_W,
                 leading=12,
             )
             y -= 0.2 * cm
@@ -293,8 +247,6 @@ def build_two_day_plan_pdf(
             c,
             x0,
             y,
-            w,
-            h,
             heading="Tomorrow’s suggested schedule",
             rows=schedule_rows_tomorrow or [{"time_window": "-", "appliance": "No schedulable tasks", "advisory": "-"}],
         )
@@ -302,22 +254,56 @@ def build_two_day_plan_pdf(
     if notes:
         if y < 3.0 * cm:
             c.showPage()
-            y = h - 2.0 * cm
+            y = _TOP_Y
         y -= 0.25 * cm
         c.setFont("Helvetica-Oblique", 9)
-        _draw_paragraph(c, x0, y, notes, max_width=w - 2 * x0, leading=11)
+        _draw_paragraph(c, x0, y, notes, max_width=_TEXT_W, leading=11)
 
     c.showPage()
     c.save()
     return buf.getvalue()
 
 
+def _draw_header(c: canvas.Canvas, title: str, system_summary: Dict[str, str], kpis: Dict[str, str]) -> float:
+    """Draw the title, "System" and "Key outcomes" blocks shared by both handouts; return y."""
+    y = _TOP_Y
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(_X0, y, title)
+    y -= 0.8 * cm
+    y = _draw_kv_block(c, _X0, y, "System", system_summary)
+    y -= 0.25 * cm
+    return _draw_kv_block(c, _X0, y, "Key outcomes", kpis)
+
+
+def _draw_kv_block(
+    c: canvas.Canvas,
+    x0: float,
+    y: float,
+    heading: str,
+    items: Dict[str, str],
+    *,
+    heading_font: Tuple[str, int] = ("Helvetica-Bold", 12),
+    body_font: Tuple[str, int] = ("Helvetica", 10),
+    line_h: float = _LINE,
+) -> float:
+    """Draw a heading and its "key: value" lines (one text object) and return the updated y."""
+    c.setFont(*heading_font)
+    c.drawString(x0, y, heading)
+    y -= _HEADER_GAP
+    c.setFont(*body_font)
+    t = c.beginText(x0, y)
+    t.setFont(body_font[0], body_font[1], line_h)
+    for k, v in items.items():
+        t.textLine(f"{k}: {v}")
+        y -= line_h
+    c.drawText(t)
+    return y
+
+
 def _draw_schedule_table(
     c: canvas.Canvas,
     x0: float,
     y: float,
-    w: float,
-    h: float,
     *,
     heading: str,
     rows: List[Dict[str, str]],
@@ -328,22 +314,22 @@ def _draw_schedule_table(
     y -= 0.6 * cm
 
     col1 = x0
-    col2 = x0 + 5.5 * cm
-    col3 = x0 + 13.0 * cm
+    col2 = x0 + _COL2_OFF
+    col3 = x0 + _COL3_OFF
 
     c.setFont("Helvetica-Bold", 10)
     c.drawString(col1, y, "Time window")
     c.drawString(col2, y, "Appliance")
     c.drawString(col3, y, "Advisory")
-    y -= 0.35 * cm
-    c.line(x0, y, w - x0, y)
-    y -= 0.35 * cm
+    y -= _RULE_GAP
+    c.line(x0, y, _PAGE_W - x0, y)
+    y -= _RULE_GAP
 
     c.setFont("Helvetica", 10)
     for r in (rows or [])[:28]:
-        if y < 2.2 * cm:
+        if y < _BOTTOM:
             c.showPage()
-            y = h - 2.0 * cm
+            y = _TOP_Y
             c.setFont("Helvetica-Bold", 12)
             c.drawString(x0, y, f"{heading} (cont.)")
             y -= 0.8 * cm
@@ -359,28 +345,40 @@ def _draw_schedule_table(
         if not adv_str or adv_str.lower() in ("nan", "none"):
             adv_str = "Don't run"
         c.drawString(col3, y, adv_str[:18])
-        y -= 0.45 * cm
+        y -= _LINE
 
     return y
 
 
+@lru_cache(maxsize=4096)
+def _word_units(word: str) -> int:
+    """Width of ``word`` in Helvetica at 1000 pt, i.e. the integer sum of its AFM glyph widths."""
+    return round(pdfmetrics.stringWidth(word, "Helvetica", 1000))
+
+
 def _draw_paragraph(c: canvas.Canvas, x: float, y: float, text: str, *, max_width: float, leading: int = 12) -> float:
     """Draw wrapped text and return the updated y."""
     if not text:
         return y
-    words = text.split()
-    line = ""
-    for w in words:
-        test = (line + " " + w).strip()
-        if c.stringWidth(test, "Helvetica", 10) <= max_width:
-            line = test
+    # Line widths are running sums of cached per-word widths (integer font units, so the
+    # sum is exact) instead of re-measuring the whole candidate line for every word.
+    space_units = _word_units(" ")
+    line: List[str] = []
+    line_units = 0
+    for w in text.split():
+        w_units = _word_units(w)
+        test_units = line_units + space_units + w_units if line else w_units
+        if test_units * 0.001 * 10 <= max_width:
+            line.append(w)
+            line_units = test_units
         else:
-            c.drawString(x, y, line)
-            y -= leading * 0.035 * cm * (leading / 12)  # normalize a bit
-            line = w
+            c.drawString(x, y, " ".join(line))
+            y -= leading
+            line = [w]
+            line_units = w_units
     if line:
-        c.drawString(x, y, line)
-        y -= leading * 0.035 * cm * (leading / 12)
+        c.drawString(x, y, " ".join(line))
+        y -= leading
     return y
 
 
@@ -400,51 +398,54 @@ def schedule_from_state_csv(
     if df.empty:
         return []
 
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-    df = df.sort_values("timestamp")
-    df["day"] = df["timestamp"].dt.floor("D")
-    days = sorted(df["day"].unique())
+    # Work on the caller's frame without copying it; timestamps are parsed only if the
+    # caller has not already done so, and sorted only if out of order.
+    ts = df["timestamp"]
+    if not isinstance(ts.dtype, pd.DatetimeTZDtype):
+        ts = pd.to_datetime(ts, utc=True)
+    if not ts.is_monotonic_increasing:
+        ts = ts.sort_values()
+        df = df.loc[ts.index]
+    day = ts.dt.floor("D")
+    days = sorted(day.unique())
     if not days:
         return []
     day_index = max(0, min(day_index, len(days) - 1))
     d0 = days[day_index]
-    day_df = df[df["day"] == d0].reset_index(drop=True)
+    day_df = df[(day == d0).to_numpy()].reset_index(drop=True)
     if day_df.empty:
         return []
 
-    def _parse_ids(s: str) -> List[str]:
-        if not isinstance(s, str) or not s.strip():
-            return []
-        return [x for x in s.split(";") if x]
-
-    # Map served tasks per step to appliance ids
-    served_appl_per_step: List[List[str]] = []
-    for s in day_df.get("served_task_ids", "").astype(str).tolist():
-        ids = _parse_ids(s)
-        appl_ids = []
-        for tid in ids:
-            appl_id = tid.split("_")[0]
-            if appl_id:
-                appl_ids.append(appl_id)
-        served_appl_per_step.append(appl_ids)
-
-    # For each appliance, merge consecutive served steps
-    schedule_rows: List[Dict[str, str]] = []
-    unique_appliances = sorted({a for step_ids in served_appl_per_step for a in step_ids})
-    for appl in unique_appliances:
-        idxs = [i for i, ids in enumerate(served_appl_per_step) if appl in ids]
-        if not idxs:
-            continue
-        # merge consecutive
-        start = prev = idxs[0]
-        for i in idxs[1:]:
-            if i == prev + 1:
-                prev = i
-                continue
-            schedule_rows.append(_window_row(d0, start, prev, timestep_minutes, appliance_id_to_name.get(appl, appl), timezone_offset_seconds))
-            start = prev = i
-        schedule_rows.append(_window_row(d0, start, prev, timestep_minutes, appliance_id_to_name.get(appl, appl), timezone_offset_seconds))
+    if "served_task_ids" not in day_df.columns:
+        return []
+
+    # Long form (step, appliance id) in one vectorised pass: split "a_0;b_1" lists, keep
+    # the appliance prefix of each task id, then mark an appliances x steps matrix
+    served = day_df["served_task_ids"].fillna("").astype(str)
+    served = served.where(served.str.strip() != "", "")
+    tids = served.str.split(";").explode()
+    tids = tids[tids != ""]
+    appl = tids.str.split("_", n=1).str[0]
+    appl = appl[appl != ""]
+    n = len(served)
+    codes, appl_ids = pd.factorize(appl)
+    mat = np.zeros((len(appl_ids), n + 2), dtype=np.int8)
+    mat[codes, appl.index.to_numpy() + 1] = 1
+
+    # A run opens where an appliance appears and closes on the first step without it
+    edges = np.diff(mat, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    runs: List[Tuple[str, int, int]] = [
+        (appl_ids[r], int(a), int(b) - 1) for r, a, b in zip(rows.tolist(), starts.tolist(), ends.tolist())
+    ]
+
+    # Appliance then start order, so windows with equal times keep their usual order below
+    runs.sort()
+    schedule_rows = [
+        _window_row(d0, start, end, timestep_minutes, appliance_id_to_name.get(appl, appl), timezone_offset_seconds)
+        for appl, start, end in runs
+    ]
 
     # Sort by time
     schedule_rows.sort(key=lambda r: r.get("time_window", ""))
@@ -493,7 +494,7 @@ def build_two_day_plan_pdf_from_logs(
         "robust to uncertainty. No automatic control of equipment; use guidance with household discretion. "
         "Logs remain the source of truth for reproducibility."
     )
-    df = pd.read_csv(state_csv_path)
+    df = read_state_log(state_csv_path)
     if df.empty:
         return build_two_day_plan_pdf(
             title=title,
@@ -504,9 +505,14 @@ def build_two_day_plan_pdf_from_logs(
             notes=ADVISORY_DISCLAIMER,
         )
 
+    # Parse timestamps once; the logger writes rows in time order, so sorting is a fallback
     df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-    df = df.sort_values("timestamp").reset_index(drop=True)
+    if not df["timestamp"].is_monotonic_increasing:
+        df = df.sort_values("timestamp").reset_index(drop=True)
     timestep_minutes = 15  # standard DT step; not stored in CSV
+    # Per-row UTC day key, computed once for the day count and the tomorrow outlook
+    day_key = df["timestamp"].to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    unique_days = np.unique(day_key)
 
     gdf = pd.read_json(guidance_jsonl_path, lines=True)
     if not gdf.empty and "timestamp" in gdf.columns:
@@ -552,13 +558,9 @@ def build_two_day_plan_pdf_from_logs(
 
     # Appliance id -> name mapping inferred from served_task_ids (best-effort)
     def _infer_ids(series: pd.Series) -> Dict[str, str]:
-        ids = set()
-        for s in series.astype(str).tolist():
-            if not s or s == "nan":
-                continue
-            for tid in str(s).split(";"):
-                if tid:
-                    ids.add(tid.split("_")[0])
+        s = series.dropna().astype(str)
+        tids = s[(s != "") & (s != "nan")].str.split(";").explode()
+        ids = set(tids[tids != ""].str.split("_", n=1).str[0])
         return {i: i.replace("-", " ").title() for i in sorted(ids)}
 
     appliance_id_to_name = _infer_ids(df.get("served_task_ids", pd.Series(dtype=str)))
@@ -570,13 +572,14 @@ def build_two_day_plan_pdf_from_logs(
 
     if not gdf.empty:
         if "timestamp" in gdf.columns:
-            gdf["day"] = pd.to_datetime(gdf["timestamp"], utc=True).dt.floor("D")
+            gdf["day"] = gdf["timestamp"].dt.floor("D")
             days = sorted(gdf["day"].unique())
         else:
             # Align by index: same number of rows as state; derive day from state CSV
-            days = sorted(df["timestamp"].dt.floor("D").unique())
+            state_day = df["timestamp"].dt.floor("D")
+            days = sorted(state_day.unique())
             if len(days) >= 1 and len(gdf) >= 1:
-                gdf["day"] = df["timestamp"].dt.floor("D").iloc[: len(gdf)].values
+                gdf["day"] = state_day.iloc[: len(gdf)].values
                 days = sorted(pd.Series(gdf["day"]).unique())
     if days:
         g0 = gdf[gdf["day"] == days[0]].iloc[0]
@@ -598,25 +601,20 @@ def build_two_day_plan_pdf_from_logs(
     schedule_rows_tomorrow = None
     tomorrow_outlook = None
 
-    if df["timestamp"].dt.floor("D").nunique() > 1:
+    if len(unique_days) > 1:
         schedule_rows_tomorrow = schedule_from_state_csv(df, appliance_id_to_name=appliance_id_to_name, day_index=1, timestep_minutes=timestep_minutes, timezone_offset_seconds=timezone_offset_seconds)
-        df2 = df.copy()
-        df2["day"] = df2["timestamp"].dt.floor("D")
-        days_list = sorted(df2["day"].unique())
-        if len(days_list) > 1:
-            d1 = days_list[1]
-            day_df = df2[df2["day"] == d1]
-            dt_hours = timestep_minutes / 60.0
-            pv_kwh = float(day_df["pv_now_kw"].astype(float).sum() * dt_hours)
-            # Use planned daily energy from matching (config-based), not sum(load_requested_kw)*dt
-            if matching_result is not None:
-                load_kwh = float(matching_result.get("total_demand_kwh", 0) if isinstance(matching_result, dict) else getattr(matching_result, "total_demand_kwh", 0) or 0)
-            else:
-                load_kwh = float(day_df["load_requested_kw"].astype(float).sum() * dt_hours)
-            tomorrow_outlook = {
-                "Expected solar energy": f"{pv_kwh:.1f} kWh",
-                "Planned demand (nominal)": f"{load_kwh:.1f} kWh",
-            }
+        tomorrow = day_key == unique_days[1]
+        dt_hours = timestep_minutes / 60.0
+        pv_kwh = float(np.nansum(df["pv_now_kw"].to_numpy(dtype=np.float64)[tomorrow]) * dt_hours)
+        # Use planned daily energy from matching (config-based), not sum(load_requested_kw)*dt
+        if matching_result is not None:
+            load_kwh = float(matching_result.get("total_demand_kwh", 0) if isinstance(matching_result, dict) else getattr(matching_result, "total_demand_kwh", 0) or 0)
+        else:
+            load_kwh = float(np.nansum(df["load_requested_kw"].to_numpy(dtype=np.float64)[tomorrow]) * dt_hours)
+        tomorrow_outlook = {
+            "Expected solar energy": f"{pv_kwh:.1f} kWh",
+            "Planned demand (nominal)": f"{load_kwh:.1f} kWh",
+        }
 
     # Day-ahead matching: outlook and statement list (no per-appliance table)
     day_ahead_outlook_text = None
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Literal, Optional
+from typing import Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 LoadCategory = Literal["critical", "flexible", "deferrable"]
 LoadSource = Literal["tasks", "ukdale"]
@@ -94,6 +95,9 @@ class SystemConfig(BaseModel):
 
 
 class Appliance(BaseModel):
+    # Frozen: catalog instances are shared read-only across reruns (st.cache_resource in the app)
+    model_config = ConfigDict(frozen=True)
+
     id: str
     name: str
     category: LoadCategory
@@ -105,6 +109,17 @@ class Appliance(BaseModel):
 
     daily_quota_steps: int = Field(default=0, ge=0)
 
+    @property
+    def power_kw(self) -> float:
+        """Rated power in kW (derived from power_w; not part of the dumped model)."""
+        return self.power_w / 1000.0
+
+
+# Module-level validators: built once at import instead of per call. Use
+# APPLIANCES_ADAPTER.validate_python(rows) / .validate_json(raw) for appliance lists.
+APPLIANCES_ADAPTER: TypeAdapter[List[Appliance]] = TypeAdapter(List[Appliance])
+SYSTEMCONFIG_ADAPTER: TypeAdapter[SystemConfig] = TypeAdapter(SystemConfig)
+
 
 class TaskInstance(BaseModel):
     task_id: str
@@ -157,3 +172,31 @@ class StepRecord(BaseModel):
     guidance: Guidance
 
     kpis_running: Dict[str, float] = Field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class StepRecordInternal:
+    """Unvalidated StepRecord for in-process use (simulator -> logger).
+
+    Same fields as StepRecord, without per-construction pydantic validation; StepRecord
+    stays the validated model for records read from or written to external I/O.
+    """
+
+    timestamp: datetime
+    step_index: int
+    pv_now_kw: float
+    soc_now: float
+    soc_min: float
+    soc_max: float
+    load_requested_kw: float
+    load_served_kw: float
+    crit_requested_kw: float
+    crit_served_kw: float
+    curtailed_solar_kw: float
+    decision: ControlDecision
+    guidance: Guidance
+    pv_forecast_kw: List[float] = field(default_factory=list)
+    kpis_running: Dict[str, float] = field(default_factory=dict)
+
+
+AnyStepRecord = Union[StepRecord, StepRecordInternal]
@@ -0,0 +1,91 @@
+"""Fused numeric core of day-ahead matching (power adequacy over one planning day).
+
+One pass over the per-step PV/load/critical series yields the surplus and deficit runs,
+the minimum power margin and the shortfall steps; timestamps, windows and advisories
+stay in Python (see day_ahead.compute_day_ahead_matching). Research sweeps call this
+once per scenario, so the interpreter overhead of the separate NumPy passes matters.
+
+Numba is optional: without it the same kernel runs as plain Python (slow but identical).
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from offgrid_dt._numba import njit
+
+
+@njit(cache=True)
+def matching_kernel(pv_kw, load_kw, crit_kw):
+    """Power adequacy of one day in a single pass.
+
+    Surplus steps have pv >= load, deficit steps load > pv; a critical shortfall is a
+    step with crit > 0 and pv < crit. Run ends are inclusive step indices.
+
+    Returns (surplus_starts, surplus_ends, deficit_starts, deficit_ends,
+    critical_shortfall_steps, deficit_steps, min_power_margin_kw).
+    """
+    n = pv_kw.shape[0]
+    sur_starts = np.empty(n, dtype=np.int64)
+    sur_ends = np.empty(n, dtype=np.int64)
+    def_starts = np.empty(n, dtype=np.int64)
+    def_ends = np.empty(n, dtype=np.int64)
+    crit_short = np.empty(n, dtype=np.int64)
+    def_steps = np.empty(n, dtype=np.int64)
+    n_sur = 0
+    n_def = 0
+    n_short = 0
+    n_def_steps = 0
+    in_sur = False
+    in_def = False
+    min_margin = np.inf
+
+    for i in range(n):
+        pv = pv_kw[i]
+        load = load_kw[i]
+        crit = crit_kw[i]
+
+        margin = pv - load
+        if margin < min_margin or margin != margin:
+            if min_margin == min_margin:  # NaN sticks, as with ndarray.min()
+                min_margin = margin
+
+        surplus = pv >= load
+        if surplus and not in_sur:
+            sur_starts[n_sur] = i
+        elif not surplus and in_sur:
+            sur_ends[n_sur] = i - 1
+            n_sur += 1
+        in_sur = surplus
+
+        deficit = load > pv
+        if deficit:
+            def_steps[n_def_steps] = i
+            n_def_steps += 1
+        if deficit and not in_def:
+            def_starts[n_def] = i
+        elif not deficit and in_def:
+            def_ends[n_def] = i - 1
+            n_def += 1
+        in_def = deficit
+
+        if crit > 0 and pv < crit:
+            crit_short[n_short] = i
+            n_short += 1
+
+    if in_sur:
+        sur_ends[n_sur] = n - 1
+        n_sur += 1
+    if in_def:
+        def_ends[n_def] = n - 1
+        n_def += 1
+
+    return (
+        sur_starts[:n_sur],
+        sur_ends[:n_sur],
+        def_starts[:n_def],
+        def_ends[:n_def],
+        crit_short[:n_short],
+        def_steps[:n_def_steps],
+        min_margin,
+    )
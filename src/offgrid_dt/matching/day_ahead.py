@@ -12,12 +12,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from offgrid_dt.dt.load import compute_planned_daily_energy_kwh
 from offgrid_dt.io.schema import Appliance, SystemConfig
+from offgrid_dt.matching._kernel import matching_kernel
 from offgrid_dt.planning.nominal_plan import compute_nominal_planned_energy
 
 # Advisory status per appliance (traceable to surplus/deficit and priority)
@@ -47,6 +50,40 @@ class ApplianceAdvisory:
     reason: str = ""
 
 
+# Step bounds of a TimeWindow list, for vectorized length/coverage arithmetic
+_WINDOW_BOUNDS_DTYPE = np.dtype([("start_step", np.int64), ("end_step", np.int64)])
+
+
+@dataclass
+class _ApplianceBatch:
+    """Per-appliance numbers as parallel arrays, for the vectorized first-fit match."""
+    power_w: np.ndarray
+    duration_steps: np.ndarray
+
+    @classmethod
+    def from_models(cls, appliances: Sequence[Appliance]) -> "_ApplianceBatch":
+        n = len(appliances)
+        return cls(
+            power_w=np.fromiter((a.power_w for a in appliances), dtype=np.float64, count=n),
+            duration_steps=np.fromiter(
+                (getattr(a, "duration_steps", 1) for a in appliances), dtype=np.int64, count=n
+            ),
+        )
+
+
+def _tw_dict(tw: TimeWindow) -> Dict[str, Any]:
+    # Field dict copied in one go (field order = key order); only the datetimes need converting
+    d = dict(tw.__dict__)
+    d["start_ts"] = tw.start_ts.isoformat() if tw.start_ts else None
+    d["end_ts"] = tw.end_ts.isoformat() if tw.end_ts else None
+    return d
+
+
+def _adv_dict(adv: ApplianceAdvisory) -> Dict[str, Any]:
+    # All advisory fields are JSON-ready already
+    return dict(adv.__dict__)
+
+
 @dataclass
 class DayAheadMatchingResult:
     """Result of day-ahead demand vs solar matching (first planning day 00:00–24:00)."""
@@ -80,23 +117,6 @@ class DayAheadMatchingResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """JSON-serializable dict for UI/PDF (datetimes as isoformat)."""
-        def _tw_dict(tw: TimeWindow) -> Dict[str, Any]:
-            return {
-                "start_step": tw.start_step,
-                "end_step": tw.end_step,
-                "start_ts": tw.start_ts.isoformat() if tw.start_ts else None,
-                "end_ts": tw.end_ts.isoformat() if tw.end_ts else None,
-                "label": tw.label,
-            }
-        def _adv_dict(adv: ApplianceAdvisory) -> Dict[str, Any]:
-            return {
-                "appliance_id": adv.appliance_id,
-                "name": adv.name,
-                "category": adv.category,
-                "status": adv.status,
-                "recommended_window": adv.recommended_window,
-                "reason": adv.reason,
-            }
         return {
             "total_solar_kwh": self.total_solar_kwh,
             "total_demand_kwh": self.total_demand_kwh,
@@ -114,33 +134,48 @@ class DayAheadMatchingResult:
         }
 
 
-def _merge_adjacent_windows(step_flags: List[bool], timestamps: List[datetime]) -> List[TimeWindow]:
-    """Convert per-step boolean (True = surplus or deficit) into contiguous TimeWindow list."""
-    if not step_flags or not timestamps or len(step_flags) != len(timestamps):
-        return []
-    windows: List[TimeWindow] = []
-    in_window = False
-    start_step = 0
-    for i, flag in enumerate(step_flags):
-        if flag and not in_window:
-            in_window = True
-            start_step = i
-        elif not flag and in_window:
-            in_window = False
-            windows.append(TimeWindow(
-                start_step=start_step,
-                end_step=i - 1,
-                start_ts=timestamps[start_step],
-                end_ts=timestamps[i - 1],
-            ))
-    if in_window:
-        windows.append(TimeWindow(
-            start_step=start_step,
-            end_step=len(step_flags) - 1,
-            start_ts=timestamps[start_step],
-            end_ts=timestamps[-1],
-        ))
-    return windows
+def _windows_from_runs(
+    starts: np.ndarray,
+    ends: np.ndarray,
+    timestamps: Union[Sequence[datetime], pd.DatetimeIndex],
+    label: str = "",
+) -> List[TimeWindow]:
+    """TimeWindows for runs given as start/end step index arrays (ends inclusive)."""
+    return [
+        TimeWindow(start_step=s, end_step=e, start_ts=timestamps[s], end_ts=timestamps[e], label=label)
+        for s, e in zip(starts.tolist(), ends.tolist())
+    ]
+
+
+# Index = code returned by the classifiers below
+_ENERGY_MARGIN_LABELS: Tuple[EnergyMarginType, ...] = ("deficit", "tight", "surplus")
+_RISK_LABELS: Tuple[RiskLevel, ...] = ("high", "medium", "low")
+
+
+def _energy_margin_code(energy_margin_kwh: Any, total_demand_kwh: Any) -> np.ndarray:
+    """Branchless margin classifier: 0 deficit, 1 tight, 2 surplus (scalars or arrays).
+
+    Surplus when demand <= 0 or margin > 5% of demand; deficit when margin < -5% of demand.
+    """
+    m = np.asarray(energy_margin_kwh, dtype=float)
+    d = np.asarray(total_demand_kwh, dtype=float)
+    surplus = (d <= 0) | (m > 0.05 * d)
+    deficit = ~surplus & (m < -0.05 * d)
+    return 1 + surplus.astype(np.int8) - deficit.astype(np.int8)
+
+
+def _risk_code(energy_margin_kwh: Any, total_solar_kwh: Any) -> np.ndarray:
+    """Branchless day-ahead risk: 0 high, 1 medium, 2 low (scalars or arrays).
+
+    High when the margin is negative; low when there is no solar to compare against or
+    the margin is at least 10% of expected solar; medium otherwise.
+    """
+    m = np.asarray(energy_margin_kwh, dtype=float)
+    s = np.asarray(total_solar_kwh, dtype=float)
+    no_solar = s <= 0
+    high = (m < 0) | (no_solar & ~(m >= 0))
+    low = ~high & (no_solar | (m >= 0.1 * s))
+    return 1 + low.astype(np.int8) - high.astype(np.int8)
 
 
 def _format_window_times(tw: TimeWindow | Dict[str, Any], timestep_minutes: int) -> str:
@@ -151,6 +186,12 @@ def _format_window_times(tw: TimeWindow | Dict[str, Any], timestep_minutes: int)
     else:
         start_step = tw.start_step
         end_step = tw.end_step
+    return _fmt_window_times_cached(start_step, end_step, timestep_minutes)
+
+
+@lru_cache(maxsize=1024)
+def _fmt_window_times_cached(start_step: int, end_step: int, timestep_minutes: int) -> str:
+    # Pure in its three ints; the same few surplus windows recur across appliances and days
     start_min = start_step * timestep_minutes
     end_min = (end_step + 1) * timestep_minutes
     sh, sm = divmod(start_min, 60)
@@ -179,15 +220,22 @@ def compute_day_ahead_matching(
     dt_hours = timestep_minutes / 60.0
 
     # Use first day only
-    day_df = state_df.head(steps_per_day).copy()
+    day_df = state_df.head(steps_per_day)
     if day_df.empty:
         return _empty_result(timestep_minutes, steps_per_day, day_start_ts)
 
-    day_df["ts"] = pd.to_datetime(day_df["timestamp"], utc=True)
-    timestamps = day_df["ts"].tolist()
-    pv_kw = day_df["pv_now_kw"].fillna(0.0).to_numpy(dtype=float)
-    load_kw = day_df["load_requested_kw"].fillna(0.0).to_numpy(dtype=float)
-    crit_kw = day_df["crit_requested_kw"].fillna(0.0).to_numpy(dtype=float)
+    # Parse only when the caller passes strings (the simulator hands over UTC datetimes)
+    ts = day_df["timestamp"]
+    if not isinstance(ts.dtype, pd.DatetimeTZDtype):
+        ts = pd.to_datetime(ts, utc=True)
+    timestamps = pd.DatetimeIndex(ts).tz_convert("UTC")
+    # One (n, 3) buffer for the three power columns instead of three separate extractions
+    power = (
+        day_df[["pv_now_kw", "load_requested_kw", "crit_requested_kw"]]
+        .fillna(0.0)
+        .to_numpy(dtype=np.float64)
+    )
+    pv_kw, load_kw, crit_kw = power[:, 0], power[:, 1], power[:, 2]
 
     # 1) Daily energy feasibility: nominal planned demand (single source of truth) and simulation-based load (separate metric)
     total_solar_kwh = float(pv_kw.sum()) * dt_hours
@@ -197,14 +245,9 @@ def compute_day_ahead_matching(
     energy_margin_kwh = total_solar_kwh - total_demand_kwh
 
     # Margin type: surplus if margin > 5% of demand, deficit if < -5%, else tight
-    if total_demand_kwh <= 0:
-        energy_margin_type: EnergyMarginType = "surplus"
-    elif energy_margin_kwh > 0.05 * total_demand_kwh:
-        energy_margin_type = "surplus"
-    elif energy_margin_kwh < -0.05 * total_demand_kwh:
-        energy_margin_type = "deficit"
-    else:
-        energy_margin_type = "tight"
+    energy_margin_type: EnergyMarginType = _ENERGY_MARGIN_LABELS[
+        int(_energy_margin_code(energy_margin_kwh, total_demand_kwh))
+    ]
 
     if energy_margin_type == "surplus":
         daily_outlook_text = "Solar energy is sufficient for the day (expected surplus)."
@@ -220,36 +263,28 @@ def compute_day_ahead_matching(
         )
 
     # 2) Time-resolved power adequacy: surplus when pv >= load, deficit when load > pv
-    power_margin_kw = pv_kw - load_kw
-    min_power_margin_kw = float(power_margin_kw.min())
-    surplus_step = pv_kw >= load_kw
-    deficit_step = load_kw > pv_kw
-    surplus_windows = _merge_adjacent_windows(surplus_step.tolist(), timestamps)
-    deficit_windows = _merge_adjacent_windows(deficit_step.tolist(), timestamps)
-    for tw in surplus_windows:
-        tw.label = "surplus"
-    for tw in deficit_windows:
-        tw.label = "deficit"
+    # (one fused pass, see matching._kernel; also yields the step lists for layer 3)
+    (
+        sur_starts,
+        sur_ends,
+        def_starts,
+        def_ends,
+        crit_short,
+        def_steps,
+        min_power_margin_kw,
+    ) = matching_kernel(pv_kw, load_kw, crit_kw)
+    min_power_margin_kw = float(min_power_margin_kw)
+    surplus_windows = _windows_from_runs(sur_starts, sur_ends, timestamps, "surplus")
+    deficit_windows = _windows_from_runs(def_starts, def_ends, timestamps, "deficit")
 
     # 3) Priority-aware: critical fully protected when pv >= crit at every step where crit > 0
-    critical_fully_protected = True
-    critical_shortfall_steps: List[int] = []
-    for i in range(len(pv_kw)):
-        if crit_kw[i] > 0 and pv_kw[i] < crit_kw[i]:
-            critical_fully_protected = False
-            critical_shortfall_steps.append(i)
-    flexible_deferrable_shortfall_steps = [i for i in range(len(pv_kw)) if deficit_step[i]]
+    critical_fully_protected = not len(crit_short)
+    critical_shortfall_steps: List[int] = crit_short.tolist()
+    flexible_deferrable_shortfall_steps = def_steps.tolist()
 
     # 4) Day-ahead risk from daily energy margin relative to expected solar (overall tomorrow)
     # High: M_E < 0 (net deficit). Low: M_E >= 0.1 * E_PV (≥10% buffer). Medium: 0 <= M_E < 0.1 * E_PV.
-    if energy_margin_kwh < 0:
-        risk_level: RiskLevel = "high"
-    elif total_solar_kwh <= 0:
-        risk_level = "low" if energy_margin_kwh >= 0 else "high"
-    elif energy_margin_kwh >= 0.1 * total_solar_kwh:
-        risk_level = "low"
-    else:
-        risk_level = "medium"
+    risk_level: RiskLevel = _RISK_LABELS[int(_risk_code(energy_margin_kwh, total_solar_kwh))]
 
     # 5) Appliance-level advisories (traceable to surplus/deficit and category)
     appliance_advisories = _compute_appliance_advisories(
@@ -276,7 +311,7 @@ def compute_day_ahead_matching(
         flexible_deferrable_shortfall_steps=flexible_deferrable_shortfall_steps,
         risk_level=risk_level,
         appliance_advisories=appliance_advisories,
-        day_start_ts=day_start_ts or (timestamps[0] if timestamps else None),
+        day_start_ts=day_start_ts or (timestamps[0] if len(timestamps) else None),
         timestep_minutes=timestep_minutes,
         steps_per_day=steps_per_day,
     )
@@ -399,13 +434,23 @@ def _compute_appliance_advisories(
     windows long enough for each load.
     """
     advisories: List[ApplianceAdvisory] = []
-    surplus_coverage_ratio = _surplus_coverage_ratio(surplus_windows, timestep_minutes)
+    # Window step bounds as one structured array; lengths/coverage are vectorized from it
+    surplus_bounds = _window_bounds(surplus_windows)
+    surplus_lengths = surplus_bounds["end_step"] - surplus_bounds["start_step"] + 1
+    surplus_coverage_ratio = _surplus_coverage_ratio(surplus_lengths)
     has_surplus_windows = len(surplus_windows) > 0
     deficit_times_str = _format_windows_list(deficit_windows, timestep_minutes) if deficit_windows else ""
+    # Window lengths and the longest window are the same for every appliance
+    longest_idx = int(surplus_lengths.argmax()) if has_surplus_windows else -1
+
+    # Per-appliance numbers and every appliance's first-fitting surplus window in one go
+    batch = _ApplianceBatch.from_models(appliances)
+    durations = np.maximum(batch.duration_steps, 1)
+    first_fit = _first_fit_window_index(surplus_lengths, durations)
 
-    for a in appliances:
-        power_kw = float(a.power_w) / 1000.0
-        duration_steps = max(1, getattr(a, "duration_steps", 1))
+    for a, power_kw, duration_steps, fit_idx in zip(
+        appliances, (batch.power_w / 1000.0).tolist(), durations.tolist(), first_fit.tolist()
+    ):
 
         if a.category == "critical":
             if critical_fully_protected:
@@ -434,14 +479,13 @@ def _compute_appliance_advisories(
         # Flexible / deferrable: use surplus windows that fit this appliance's duration
         if not has_surplus_windows or energy_margin_type == "deficit":
             if deficit_windows:
-                def_times = _format_windows_list(deficit_windows, timestep_minutes)
                 advisories.append(ApplianceAdvisory(
                     appliance_id=a.id,
                     name=a.name,
                     category=a.category,
                     status="avoid_today",
                     reason=(
-                        f"Tomorrow demand exceeds solar in {def_times}. "
+                        f"Tomorrow demand exceeds solar in {deficit_times_str}. "
                         f"Avoid running {a.name} ({power_kw:.2f} kW) then; run in surplus windows if any."
                     ),
                 ))
@@ -455,13 +499,13 @@ def _compute_appliance_advisories(
                 ))
             continue
 
-        best_tw, fallback_tw = _best_surplus_window_for_duration(
-            surplus_windows, duration_steps, timestep_minutes
-        )
+        # First window long enough for this appliance; else fall back to the longest one
+        if fit_idx >= 0:
+            best_tw, fallback_tw = surplus_windows[fit_idx], None
+        else:
+            best_tw, fallback_tw = None, surplus_windows[longest_idx]
         chosen_tw = best_tw or fallback_tw
-        recommended_window_str = (
-            _format_window_times(chosen_tw, timestep_minutes) if chosen_tw else ""
-        )
+        recommended_window_str = _format_window_times(chosen_tw, timestep_minutes) if chosen_tw else ""
 
         if best_tw:
             # A surplus window is long enough for this appliance
@@ -515,14 +559,16 @@ def _compute_appliance_advisories(
     return advisories
 
 
-def _surplus_coverage_ratio(surplus_windows: List[TimeWindow], timestep_minutes: int) -> float:
-    """Fraction of 96 steps (24h @ 15min) covered by surplus windows."""
-    if not surplus_windows:
-        return 0.0
-    total_steps = 0
-    for tw in surplus_windows:
-        total_steps += tw.end_step - tw.start_step + 1
-    return total_steps / 96.0
+def _window_bounds(windows: Sequence[TimeWindow]) -> np.ndarray:
+    """(start_step, end_step) of each window as a structured array (_WINDOW_BOUNDS_DTYPE)."""
+    return np.fromiter(
+        ((tw.start_step, tw.end_step) for tw in windows), dtype=_WINDOW_BOUNDS_DTYPE, count=len(windows)
+    )
+
+
+def _surplus_coverage_ratio(surplus_lengths: np.ndarray) -> float:
+    """Fraction of 96 steps (24h @ 15min) covered by surplus windows of the given lengths."""
+    return int(surplus_lengths.sum()) / 96.0
 
 
 def _first_surplus_window_str(surplus_windows: List[TimeWindow], timestep_minutes: int) -> str:
@@ -539,23 +585,13 @@ def _format_windows_list(windows: List[TimeWindow], timestep_minutes: int) -> st
     return " and ".join(_format_window_times(tw, timestep_minutes) for tw in windows)
 
 
-def _window_length_steps(tw: TimeWindow) -> int:
-    """Number of steps in the window (inclusive)."""
-    return tw.end_step - tw.start_step + 1
-
+def _first_fit_window_index(lengths: np.ndarray, durations: np.ndarray) -> np.ndarray:
+    """Index of the first window with length >= each duration (-1 where none fits).
 
-def _best_surplus_window_for_duration(
-    surplus_windows: List[TimeWindow],
-    duration_steps: int,
-    timestep_minutes: int,
-) -> Tuple[Optional[TimeWindow], Optional[TimeWindow]]:
-    """Find first surplus window that fits duration_steps; fallback = longest surplus window."""
-    if not surplus_windows:
-        return None, None
-    # First that fits
-    for tw in surplus_windows:
-        if _window_length_steps(tw) >= duration_steps:
-            return tw, None
-    # Fallback: longest window
-    longest = max(surplus_windows, key=_window_length_steps)
-    return None, longest
+    ``lengths`` (W,) are window lengths in steps, ``durations`` (A,) appliance durations;
+    resolved for all appliances at once from the (A, W) fit matrix.
+    """
+    if not len(lengths):
+        return np.full(len(durations), -1, dtype=np.int64)
+    fits = durations[:, None] <= lengths[None, :]
+    return np.where(fits.any(axis=1), fits.argmax(axis=1), -1)
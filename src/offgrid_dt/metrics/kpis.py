@@ -1,10 +1,19 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class KPITracker:
+    """Running KPI accumulators for one run.
+
+    ``timestep_hours`` is fixed for the run, so it is given once here and ``update``
+    only takes the step's kW values.
+    """
+
+    timestep_hours: float
     crit_requested_kwh: float = 0.0
     crit_served_kwh: float = 0.0
     total_requested_kwh: float = 0.0
@@ -13,10 +22,45 @@ class KPITracker:
     solar_curtailed_kwh: float = 0.0
     blackout_minutes: int = 0
     throughput_kwh: float = 0.0
+    _blackout_step_minutes: int = field(init=False, repr=False, default=0)
+
+    def __post_init__(self) -> None:
+        self._blackout_step_minutes = int(round(self.timestep_hours * 60))
+
+    @classmethod
+    def from_arrays(
+        cls,
+        timestep_hours: float,
+        crit_req_kw: np.ndarray,
+        crit_served_kw: np.ndarray,
+        total_req_kw: np.ndarray,
+        served_kw: np.ndarray,
+        pv_now_kw: np.ndarray,
+        curtailed_kw: np.ndarray,
+        throughput_kwh: float,
+    ) -> "KPITracker":
+        """Tracker for a whole run from per-step kW series, reduced in one pass each.
+
+        Equivalent to calling ``update`` once per step (up to float summation order).
+        """
+        crit_req = np.asarray(crit_req_kw, dtype=float)
+        crit_served = np.asarray(crit_served_kw, dtype=float)
+        pv = np.asarray(pv_now_kw, dtype=float)
+        curtailed = np.asarray(curtailed_kw, dtype=float)
+        kpis = cls(timestep_hours)
+        kpis.crit_requested_kwh = float(crit_req.sum()) * timestep_hours
+        kpis.crit_served_kwh = float(crit_served.sum()) * timestep_hours
+        kpis.total_requested_kwh = float(np.sum(total_req_kw, dtype=float)) * timestep_hours
+        kpis.solar_generated_kwh = float(pv.sum()) * timestep_hours
+        kpis.solar_curtailed_kwh = float(curtailed.sum()) * timestep_hours
+        kpis.solar_used_kwh = float(np.maximum(pv - curtailed, 0.0).sum()) * timestep_hours
+        n_blackout = int(np.count_nonzero(crit_served + 1e-9 < crit_req))
+        kpis.blackout_minutes = n_blackout * kpis._blackout_step_minutes
+        kpis.throughput_kwh = float(throughput_kwh)
+        return kpis
 
     def update(
         self,
-        timestep_hours: float,
         crit_req_kw: float,
         crit_served_kw: float,
         total_req_kw: float,
@@ -25,6 +69,7 @@ class KPITracker:
         curtailed_kw: float,
         throughput_kwh: float,
     ) -> None:
+        timestep_hours = self.timestep_hours
         self.crit_requested_kwh += crit_req_kw * timestep_hours
         self.crit_served_kwh += crit_served_kw * timestep_hours
         self.total_requested_kwh += total_req_kw * timestep_hours
@@ -32,7 +77,7 @@ class KPITracker:
         self.solar_curtailed_kwh += curtailed_kw * timestep_hours
         self.solar_used_kwh += max(0.0, pv_now_kw - curtailed_kw) * timestep_hours
         if crit_served_kw + 1e-9 < crit_req_kw:
-            self.blackout_minutes += int(round(timestep_hours * 60))
+            self.blackout_minutes += self._blackout_step_minutes
         self.throughput_kwh = throughput_kwh
 
     def snapshot(self) -> dict:
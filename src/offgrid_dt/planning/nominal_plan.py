@@ -43,16 +43,15 @@ def compute_nominal_planned_energy(
         P_avg_kw: average power over 24h (kW) = E_plan_24h_kwh / 24
         E_plan_12h_kwh: optional planned energy for 12h (E_plan_24h * 12/24)
     """
-    hrs_by_cat = {
-        "critical": hours_critical,
-        "flexible": hours_flexible,
-        "deferrable": hours_deferrable,
-    }
-    E_plan_24h_kwh = 0.0
+    # Sum rated power per category first, then apply each group runtime once
+    watts_by_cat = {"critical": 0.0, "flexible": 0.0, "deferrable": 0.0}
     for a in appliances:
-        p_kw = a.power_w / 1000.0
-        hrs = hrs_by_cat.get(a.category, DEFAULT_HOURS_CRITICAL)
-        E_plan_24h_kwh += p_kw * hrs
+        watts_by_cat[a.category] += a.power_w
+    E_plan_24h_kwh = (
+        watts_by_cat["critical"] * hours_critical
+        + watts_by_cat["flexible"] * hours_flexible
+        + watts_by_cat["deferrable"] * hours_deferrable
+    ) / 1000.0
 
     P_avg_kw = E_plan_24h_kwh / 24.0 if E_plan_24h_kwh else 0.0
     E_plan_12h_kwh = (E_plan_24h_kwh * (12.0 / 24.0)) if include_12h else None
@@ -2,29 +2,75 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import AbstractSet, Any, Dict, Iterator, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
+from offgrid_dt.validation._kernels import daily_reduce
+
+try:  # optional: multithreaded CSV parser for large state logs
+    import pyarrow  # noqa: F401
+except ImportError:  # pragma: no cover - depends on environment
+    pyarrow = None
+
+# Column candidates (first match wins) for the state CSV
+_CRIT_REQ_COLS = ("crit_requested_kw",)
+_CRIT_SRV_COLS = ("crit_served_kw",)
+_LOAD_REQ_COLS = ("load_requested_kw",)
+_LOAD_SRV_COLS = ("load_served_kw",)
+_PV_COLS = ("pv_now_kw",)
+_BT_COLS = ("throughput_kwh", "battery_throughput_kwh")
+
+# Logs at least this large are reduced in row chunks instead of being loaded whole
+_STREAM_MIN_BYTES = 256 * 1024 * 1024
+_CHUNK_ROWS = 200_000
+
 
 def _infer_dt_minutes(df: pd.DataFrame) -> int:
     if "timestamp" not in df.columns or len(df) < 2:
         return 15
-    ts = pd.to_datetime(df["timestamp"], utc=True, errors="coerce").dropna()
+    ts = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601", errors="coerce").dropna()
     if len(ts) < 2:
         return 15
     delta = (ts.iloc[1] - ts.iloc[0]).total_seconds() / 60.0
     return int(round(delta)) if delta > 0 else 15
 
 
-def _get_col(df: pd.DataFrame, candidates: Tuple[str, ...]) -> Optional[str]:
-    for c in candidates:
-        if c in df.columns:
-            return c
-    return None
+def _get_col(columns: AbstractSet[str], candidates: Tuple[str, ...]) -> Optional[str]:
+    return next((c for c in candidates if c in columns), None)
+
 
+def _iter_state_frames(state_csv: Path, chunksize: Optional[int] = None) -> Iterator[pd.DataFrame]:
+    """Yield the columns the daily metrics use, numeric ones straight to float64 (Arrow or NumPy).
 
-def compute_daily_metrics_from_state_csv(state_csv: Path) -> pd.DataFrame:
+    Files below _STREAM_MIN_BYTES (or any file when chunksize is 0) come back as one
+    frame, read with pyarrow when installed; larger ones stream in chunks of `chunksize`
+    rows through the C parser so peak memory stays bounded.
+    """
+    header = set(pd.read_csv(state_csv, nrows=0).columns)
+    numeric = [
+        c
+        for cands in (_CRIT_REQ_COLS, _CRIT_SRV_COLS, _LOAD_REQ_COLS, _LOAD_SRV_COLS, _PV_COLS)
+        if (c := _get_col(header, cands)) is not None
+    ]
+    # Throughput stays inferred: a non-numeric column only disables that metric
+    usecols = [c for c in (_get_col(header, ("timestamp",)), _get_col(header, _BT_COLS)) if c is not None]
+    usecols += numeric
+    kwargs: Dict[str, Any] = {"usecols": usecols, "dtype": {c: "float64" for c in numeric}}
+
+    if chunksize is None:
+        chunksize = _CHUNK_ROWS if Path(state_csv).stat().st_size >= _STREAM_MIN_BYTES else 0
+    if chunksize:
+        yield from pd.read_csv(state_csv, chunksize=chunksize, **kwargs)
+        return
+    if pyarrow is not None:
+        # Arrow-backed columns: no conversion copy out of the parser's buffers
+        kwargs.update(engine="pyarrow", dtype_backend="pyarrow", dtype={c: "double[pyarrow]" for c in numeric})
+    yield pd.read_csv(state_csv, **kwargs)
+
+
+def compute_daily_metrics_from_state_csv(state_csv: Path, chunksize: Optional[int] = None) -> pd.DataFrame:
     """
     Computes daily metrics from RunLogger state CSV:
       - CLSR
@@ -32,68 +78,97 @@ def compute_daily_metrics_from_state_csv(state_csv: Path) -> pd.DataFrame:
       - SSR
       - SU (solar utilisation, proxy)
       - battery throughput if logged (optional)
-    """
-    df = pd.read_csv(state_csv)
-    if "timestamp" not in df.columns:
-        raise ValueError(f"state_csv missing 'timestamp': {state_csv}")
-
-    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, errors="coerce")
-    df = df.dropna(subset=["timestamp"]).sort_values("timestamp")
-    df["date"] = df["timestamp"].dt.date.astype(str)
-
-    dt_min = _infer_dt_minutes(df)
-    dt_h = dt_min / 60.0
 
-    col_crit_req = _get_col(df, ("crit_requested_kw",))
-    col_crit_srv = _get_col(df, ("crit_served_kw",))
-    col_load_req = _get_col(df, ("load_requested_kw",))
-    col_load_srv = _get_col(df, ("load_served_kw",))
-    col_pv = _get_col(df, ("pv_now_kw",))
-    col_bt = _get_col(df, ("throughput_kwh", "battery_throughput_kwh"))
-
-    required = [col_crit_req, col_crit_srv, col_load_req, col_load_srv, col_pv]
-    if any(c is None for c in required):
-        raise ValueError(
-            "Missing required columns in state CSV. "
-            f"Need crit_requested_kw, crit_served_kw, load_requested_kw, load_served_kw, pv_now_kw. "
-            f"Found: {list(df.columns)}"
+    Large logs are reduced chunk by chunk (see _iter_state_frames); per-day partial sums
+    are combined at the end, so a day split across chunks (or rows out of order) is fine.
+    """
+    cols: Optional[Tuple[str, ...]] = None
+    col_bt: Optional[str] = None
+    day_parts = []  # per chunk: (day_keys, power sums (5, k) in kW·steps, cid_steps)
+    bt_parts = []  # per chunk: (day_keys, last timestamp of each day, its throughput)
+    bt_ok = True
+    first_ts = np.empty(0, dtype=np.int64)  # two earliest timestamps, for the step length
+
+    for df in _iter_state_frames(state_csv, chunksize):
+        if cols is None:
+            if "timestamp" not in df.columns:
+                raise ValueError(f"state_csv missing 'timestamp': {state_csv}")
+            colset = set(df.columns)
+            resolved = [_get_col(colset, c) for c in (_CRIT_REQ_COLS, _CRIT_SRV_COLS, _LOAD_REQ_COLS, _LOAD_SRV_COLS, _PV_COLS)]
+            if any(c is None for c in resolved):
+                raise ValueError(
+                    "Missing required columns in state CSV. "
+                    f"Need crit_requested_kw, crit_served_kw, load_requested_kw, load_served_kw, pv_now_kw. "
+                    f"Found: {list(df.columns)}"
+                )
+            cols = tuple(resolved)
+            col_bt = _get_col(colset, _BT_COLS)
+
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True, format="ISO8601", errors="coerce")
+        df = df.dropna(subset=["timestamp"]).sort_values("timestamp")
+        if df.empty:
+            continue
+        ts = df["timestamp"].to_numpy(dtype="datetime64[ns]").view("i8")
+        first_ts = np.sort(np.concatenate([first_ts, ts[:2]]))[:2]
+
+        # Day key as UTC midnight (int ns). Rows are already time-sorted, so day codes come
+        # from the key boundaries rather than a second sort (np.unique)
+        keys = df["timestamp"].dt.normalize().to_numpy(dtype="datetime64[ns]").view("i8")
+        new_day = np.r_[True, keys[1:] != keys[:-1]]
+        day_keys = keys[new_day]
+        day_id = np.cumsum(new_day) - 1
+        *sums, cid_steps = daily_reduce(
+            day_id.astype(np.int64), len(day_keys), *(df[c].to_numpy(dtype=float) for c in cols)
         )
+        day_parts.append((day_keys, np.vstack(sums), cid_steps))
 
-    rows = []
-    for d, g in df.groupby("date"):
-        crit_req_e = (g[col_crit_req].astype(float).clip(lower=0.0) * dt_h).sum()
-        crit_srv_e = (g[col_crit_srv].astype(float).clip(lower=0.0) * dt_h).sum()
-        clsr = float(crit_srv_e / crit_req_e) if crit_req_e > 1e-9 else 1.0
-
-        cid_steps = (g[col_crit_srv].astype(float) + 1e-9) < g[col_crit_req].astype(float)
-        cid_minutes = float(cid_steps.sum() * dt_min)
-
-        pv_e = (g[col_pv].astype(float).clip(lower=0.0) * dt_h).sum()
-        load_req_e = (g[col_load_req].astype(float).clip(lower=0.0) * dt_h).sum()
-        ssr = float(pv_e / load_req_e) if load_req_e > 1e-9 else 0.0
-
-        served_from_pv_e = (g[[col_pv, col_load_srv]].astype(float).min(axis=1).clip(lower=0.0) * dt_h).sum()
-        su = float(served_from_pv_e / pv_e) if pv_e > 1e-9 else 0.0
-
-        bt = None
-        if col_bt:
+        if col_bt and bt_ok:
             try:
-                bt = float(g[col_bt].astype(float).iloc[-1])
+                last = np.flatnonzero(np.r_[day_id[1:] != day_id[:-1], True])
+                bt_parts.append((day_keys, ts[last], df[col_bt].to_numpy(dtype=float)[last]))
             except Exception:
-                bt = None
-
-        rows.append(
-            {
-                "date": d,
-                "clsr": clsr,
-                "cid_minutes": cid_minutes,
-                "ssr": ssr,
-                "solar_utilisation": su,
-                "battery_throughput_kwh": bt,
-            }
-        )
+                bt_ok = False
+
+    dt_min = _infer_dt_minutes(pd.DataFrame({"timestamp": pd.to_datetime(first_ts, utc=True)}))
+    dt_h = dt_min / 60.0
 
-    return pd.DataFrame(rows).sort_values("date")
+    if day_parts:
+        keys = np.concatenate([p[0] for p in day_parts])
+        days, inv = np.unique(keys, return_inverse=True)
+        raw = np.concatenate([p[1] for p in day_parts], axis=1)
+        energies = np.vstack([np.bincount(inv, weights=r, minlength=len(days)) for r in raw]) * dt_h
+        cid_steps = np.bincount(inv, weights=np.concatenate([p[2] for p in day_parts]), minlength=len(days))
+    else:
+        days = np.empty(0, dtype=np.int64)
+        energies = np.zeros((5, 0))
+        cid_steps = np.zeros(0)
+    crit_req_e, crit_srv_e, load_req_e, pv_e, served_from_pv_e = energies
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        clsr = np.where(crit_req_e > 1e-9, crit_srv_e / crit_req_e, 1.0)
+        ssr = np.where(load_req_e > 1e-9, pv_e / load_req_e, 0.0)
+        su = np.where(pv_e > 1e-9, served_from_pv_e / pv_e, 0.0)
+
+    bt: Any = None
+    if col_bt and bt_ok:
+        # last logged value of each day: latest timestamp wins (later chunk on ties)
+        bt_keys = np.concatenate([p[0] for p in bt_parts]) if bt_parts else days
+        bt_ts = np.concatenate([p[1] for p in bt_parts]) if bt_parts else days
+        bt_val = np.concatenate([p[2] for p in bt_parts]) if bt_parts else np.zeros(0)
+        order = np.lexsort((bt_ts, bt_keys))
+        last = order[np.r_[bt_keys[order][1:] != bt_keys[order][:-1], True]] if len(order) else order
+        bt = bt_val[last]
+
+    return pd.DataFrame(
+        {
+            "date": pd.DatetimeIndex(days.view("datetime64[ns]")).strftime("%Y-%m-%d").to_numpy(dtype=object),
+            "clsr": clsr,
+            "cid_minutes": cid_steps.astype(float) * dt_min,
+            "ssr": ssr,
+            "solar_utilisation": su,
+            "battery_throughput_kwh": bt,
+        }
+    )
 
 
 def save_metrics_and_plots(metrics_df: pd.DataFrame, out_dir: Path) -> Dict[str, str]:
@@ -106,20 +181,25 @@ def save_metrics_and_plots(metrics_df: pd.DataFrame, out_dir: Path) -> Dict[str,
 
     artifacts: Dict[str, str] = {"metrics_csv": str(metrics_csv)}
 
-    for col, fname, ylabel in [
-        ("clsr", "clsr_timeseries.png", "CLSR"),
-        ("cid_minutes", "cid_timeseries.png", "CID (minutes)"),
-        ("ssr", "ssr_timeseries.png", "SSR"),
-        ("solar_utilisation", "su_timeseries.png", "Solar utilisation (proxy)"),
-    ]:
-        plt.figure()
-        plt.plot(pd.to_datetime(metrics_df["date"]), metrics_df[col])
-        plt.xlabel("Date")
-        plt.ylabel(ylabel)
-        plt.tight_layout()
-        p = out_dir / fname
-        plt.savefig(p, dpi=200)
-        plt.close()
-        artifacts[col] = str(p)
+    # One 2x2 figure instead of a figure + PNG encode per metric
+    dates = pd.to_datetime(metrics_df["date"], format="%Y-%m-%d").to_numpy()
+    fig, axes = plt.subplots(2, 2, figsize=(10, 6), sharex=True, constrained_layout=True)
+    p = out_dir / "daily_metrics.png"
+    for ax, (col, ylabel) in zip(
+        axes.flat,
+        [
+            ("clsr", "CLSR"),
+            ("cid_minutes", "CID (minutes)"),
+            ("ssr", "SSR"),
+            ("solar_utilisation", "Solar utilisation (proxy)"),
+        ],
+    ):
+        ax.plot(dates, metrics_df[col].to_numpy())
+        ax.set_ylabel(ylabel)
+    for ax in axes[-1]:
+        ax.set_xlabel("Date")
+    fig.savefig(p, dpi=150, metadata={"Software": ""})
+    plt.close(fig)
+    artifacts["daily_metrics"] = str(p)
 
     return artifacts
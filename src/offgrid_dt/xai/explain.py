@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import os
+import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
 
 from offgrid_dt.io.schema import Guidance, SystemConfig
 
@@ -14,55 +21,186 @@ class ExplanationContext:
     critical_kw: float
 
 
-def generate_guidance(cfg: SystemConfig, ctx: ExplanationContext, used_kw: float, deferred_count: int) -> Guidance:
-    reason_codes: List[str] = []
-    factors: Dict[str, float] = {"soc": ctx.soc, "pv_now_kw": ctx.pv_now_kw, "pv_avg_next2h_kw": ctx.pv_avg_next2h_kw}
-
-    risk = "low"
-    if ctx.soc <= cfg.soc_min + 0.05:
+# Reason-code bit flags; guidance conditions combine into one int
+LOW_SOC = 1 << 0
+MID_SOC = 1 << 1
+LOW_PV_FORECAST = 1 << 2
+PV_SURPLUS = 1 << 3
+DEFER_TASKS = 1 << 4
+_REASON_NAMES: Tuple[Tuple[str, int], ...] = (
+    ("LOW_SOC", LOW_SOC),
+    ("MID_SOC", MID_SOC),
+    ("LOW_PV_FORECAST", LOW_PV_FORECAST),
+    ("PV_SURPLUS", PV_SURPLUS),
+    ("DEFER_TASKS", DEFER_TASKS),
+)
+
+
+@lru_cache(maxsize=None)
+def _guidance_impl(flags: int) -> Tuple[str, str, str, Tuple[str, ...]]:
+    """Headline, explanation, risk level and reason codes for a reason-flag combination."""
+    if flags & LOW_SOC:
         risk = "high"
-        reason_codes.append("LOW_SOC")
-    elif ctx.soc <= cfg.soc_min + 0.12:
-        risk = "medium"
-        reason_codes.append("MID_SOC")
-
-    if ctx.pv_avg_next2h_kw < 0.25 * cfg.pv_capacity_kw:
-        reason_codes.append("LOW_PV_FORECAST")
-        risk = "high" if risk == "medium" else risk
-
-    if ctx.pv_now_kw > ctx.critical_kw + 0.5:
-        reason_codes.append("PV_SURPLUS")
-
-    if deferred_count > 0:
-        reason_codes.append("DEFER_TASKS")
+    elif flags & MID_SOC:
+        risk = "high" if flags & LOW_PV_FORECAST else "medium"
+    else:
+        risk = "low"
 
     # Headline policy (day-ahead aware: do not say "conditions good" when solar is limited or risk is high)
-    if "LOW_SOC" in reason_codes and "LOW_PV_FORECAST" in reason_codes:
+    if flags & (LOW_SOC | LOW_PV_FORECAST) == LOW_SOC | LOW_PV_FORECAST:
         headline = "Conserve: protect battery reserve"
         explanation = "Battery reserve is low and day-ahead solar is expected to stay limited. Delay heavy and non-essential tasks; use surplus windows when solar is available."
-    elif "PV_SURPLUS" in reason_codes:
+    elif flags & PV_SURPLUS:
         headline = "Use surplus window for heavy tasks"
         explanation = "Solar is strong in this window. Run high-power tasks during surplus periods to reduce battery discharge."
-    elif deferred_count > 0:
+    elif flags & DEFER_TASKS:
         headline = "Shift non-critical tasks"
         explanation = "Some tasks are deferred to keep essential loads reliable. Run them in surplus windows when solar improves or SOC rises."
-    elif "LOW_PV_FORECAST" in reason_codes or risk in ("high", "medium"):
+    elif flags & LOW_PV_FORECAST or risk in ("high", "medium"):
         headline = "Day-ahead solar limited"
         explanation = "Expected solar for the day is limited. Use flexible appliances only in surplus windows when solar is available; prioritise essentials."
     else:
         headline = "Day-ahead outlook adequate"
         explanation = "Day-ahead energy margin is sufficient. You can use flexible appliances within the recommended surplus windows." 
 
-    return Guidance(
+    return headline, explanation, risk, tuple(n for n, b in _REASON_NAMES if flags & b)
+
+
+def generate_guidance(cfg: SystemConfig, ctx: ExplanationContext, used_kw: float, deferred_count: int) -> Guidance:
+    factors: Dict[str, float] = {"soc": ctx.soc, "pv_now_kw": ctx.pv_now_kw, "pv_avg_next2h_kw": ctx.pv_avg_next2h_kw}
+
+    # LOW_SOC and MID_SOC are exclusive (mid only applies above the low threshold)
+    low_soc = ctx.soc <= cfg.soc_min + 0.05
+    flags = (
+        low_soc * LOW_SOC
+        | (not low_soc and ctx.soc <= cfg.soc_min + 0.12) * MID_SOC
+        | (ctx.pv_avg_next2h_kw < 0.25 * cfg.pv_capacity_kw) * LOW_PV_FORECAST
+        | (ctx.pv_now_kw > ctx.critical_kw + 0.5) * PV_SURPLUS
+        | (deferred_count > 0) * DEFER_TASKS
+    )
+    headline, explanation, risk, reason_codes = _guidance_impl(flags)
+
+    # Trusted per-step values (literals and plain floats): skip pydantic validation
+    return Guidance.model_construct(
         headline=headline,
         explanation=explanation,
         risk_level=risk,
         confidence=0.75,
-        reason_codes=reason_codes,
+        reason_codes=list(reason_codes),
         dominant_factors=factors,
     )
 
 
+# Decoding tables for generate_guidance_batch, derived from the scalar policy
+GUIDANCE_HEADLINES: Tuple[str, ...] = tuple(dict.fromkeys(_guidance_impl(f)[0] for f in range(32)))
+RISK_LEVELS: Tuple[str, ...] = ("low", "medium", "high")
+_HEADLINE_IDX_BY_FLAGS = np.array([GUIDANCE_HEADLINES.index(_guidance_impl(f)[0]) for f in range(32)], dtype=np.int8)
+_RISK_IDX_BY_FLAGS = np.array([RISK_LEVELS.index(_guidance_impl(f)[2]) for f in range(32)], dtype=np.int8)
+
+
+def generate_guidance_batch(
+    cfg: SystemConfig,
+    soc: np.ndarray,
+    pv_now_kw: np.ndarray,
+    pv_avg_next2h_kw: np.ndarray,
+    critical_kw: np.ndarray,
+    deferred_count: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Label a whole horizon with the generate_guidance policy in one vectorised pass.
+
+    Inputs are equal-length 1-D arrays (scalars broadcast). Returns (headline_idx, risk_idx,
+    flags): indices into GUIDANCE_HEADLINES / RISK_LEVELS and the reason-code bitmask.
+    """
+    soc = np.asarray(soc, dtype=float)
+    low_soc = soc <= cfg.soc_min + 0.05
+    flags = (
+        np.where(low_soc, LOW_SOC, 0)
+        | np.where(~low_soc & (soc <= cfg.soc_min + 0.12), MID_SOC, 0)
+        | np.where(np.asarray(pv_avg_next2h_kw, dtype=float) < 0.25 * cfg.pv_capacity_kw, LOW_PV_FORECAST, 0)
+        | np.where(np.asarray(pv_now_kw, dtype=float) > np.asarray(critical_kw, dtype=float) + 0.5, PV_SURPLUS, 0)
+        | np.where(np.asarray(deferred_count) > 0, DEFER_TASKS, 0)
+    ).astype(np.int8)
+    return _HEADLINE_IDX_BY_FLAGS[flags], _RISK_IDX_BY_FLAGS[flags], flags
+
+
+@lru_cache(maxsize=1)
+def _openai_client(api_key: str):
+    """One client (and its connection pool) per key instead of a new TLS session per call."""
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
+
+
+# Disk cache bounds: entries expire after _REWRITE_CACHE_MAX_AGE_DAYS, and beyond
+# _REWRITE_CACHE_MAX_FILES the least recently used files (oldest mtime) are removed.
+_REWRITE_CACHE_MAX_AGE_DAYS = 30
+_REWRITE_CACHE_MAX_FILES = 1024
+
+
+def _rewrite_cache_path(model: str, prompt: str) -> Optional[Path]:
+    """On-disk cache file for a rewrite; OFFGRID_DT_CACHE_DIR="" disables it (as for NASA POWER)."""
+    root = os.environ.get("OFFGRID_DT_CACHE_DIR", str(Path.home() / ".cache" / "offgrid_dt"))
+    if not root:
+        return None
+    key = hashlib.blake2b(f"{model}\n{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+    return Path(root) / "openai" / f"{key}.txt"
+
+
+def _read_rewrite_cache(path: Optional[Path]) -> Optional[str]:
+    """Cached rewrite if present and not expired; a hit refreshes its mtime (LRU order)."""
+    if path is None:
+        return None
+    try:
+        if time.time() - path.stat().st_mtime >= _REWRITE_CACHE_MAX_AGE_DAYS * 86400:
+            return None
+        text = path.read_text(encoding="utf-8")
+        os.utime(path)
+        return text
+    except OSError:
+        return None
+
+
+def _write_rewrite_cache(path: Optional[Path], text: str) -> None:
+    """Store a rewrite, then evict the least recently used files beyond the size cap."""
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(path)
+        files = list(path.parent.glob("*.txt"))
+        if len(files) > _REWRITE_CACHE_MAX_FILES:
+            files.sort(key=lambda f: f.stat().st_mtime)
+            for f in files[: len(files) - _REWRITE_CACHE_MAX_FILES]:
+                f.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+@lru_cache(maxsize=512)
+def _rewrite_explanation(api_key: str, model: str, prompt: str) -> str:
+    """Rewritten text for a prompt; identical prompts are answered from memory or disk.
+
+    Keyed on the full prompt and model, so any change to the guidance or context misses
+    the cache. Errors propagate and are never cached.
+    """
+    path = _rewrite_cache_path(model, prompt)
+    cached = _read_rewrite_cache(path)
+    if cached is not None:
+        return cached
+
+    resp = _openai_client(api_key).chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.3,
+    )
+    text = resp.choices[0].message.content.strip()
+    if text:
+        _write_rewrite_cache(path, text)
+    return text
+
+
 def enhance_explanation_with_openai(
     api_key: Optional[str],
     model: str,
@@ -79,9 +217,6 @@ def enhance_explanation_with_openai(
         return guidance
 
     try:
-        from openai import OpenAI
-
-        client = OpenAI(api_key=api_key)
         prompt = (
             "Rewrite the following household energy guidance into a short, plain-language explanation. "
             "Keep it under 2 sentences. Keep it actionable. Do not mention 'AI'.\n\n"
@@ -90,12 +225,7 @@ def enhance_explanation_with_openai(
             f"Context: {household_context}\n"
             f"Draft: {guidance.explanation}"
         )
-        resp = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-        )
-        text = resp.choices[0].message.content.strip()
+        text = _rewrite_explanation(api_key, model, prompt)
         if text:
             return Guidance(
                 headline=guidance.headline,
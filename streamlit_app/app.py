@@ -1,4 +1,6 @@
 
+import hashlib
+import os
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
@@ -20,7 +22,8 @@ from streamlit_autorefresh import st_autorefresh
 from offgrid_dt.control.controllers import get_controllers
 from offgrid_dt.dt.simulator import simulate
 from offgrid_dt.forecast.openweather import OpenWeatherSolarClient
-from offgrid_dt.io.schema import Appliance, SystemConfig
+from offgrid_dt.io.schema import APPLIANCES_ADAPTER, Appliance, SystemConfig
+from offgrid_dt.io.logger import read_state_log
 from offgrid_dt.io.pdf_report import build_two_day_plan_pdf_from_logs
 from offgrid_dt.matching import compute_day_ahead_matching, format_day_ahead_statements
 from offgrid_dt.planning.nominal_plan import compute_nominal_planned_energy
@@ -125,9 +128,12 @@ def _risk_pill(risk: str) -> str:
 
 # ---------------------------- Appliance catalog ----------------------------
 
-def appliance_catalog() -> list[Appliance]:
+# Streamlit re-executes this script on every interaction, so a plain lru_cache would be
+# rebuilt each rerun; cache_resource keeps one shared instance (Appliance is frozen).
+@st.cache_resource(show_spinner=False)
+def appliance_catalog() -> tuple[Appliance, ...]:
     # Typical appliances + EV + others; watt ratings shown on load board; user toggles and quantity.
-    return [
+    return (
         # Critical (always-on / essentials)
         Appliance(id="light", name="Lighting", category="critical", power_w=60, duration_steps=1),
         Appliance(id="fan", name="Ceiling Fan", category="critical", power_w=70, duration_steps=1),
@@ -147,7 +153,12 @@ def appliance_catalog() -> list[Appliance]:
         Appliance(id="ev", name="Electric Vehicle (AC charge)", category="deferrable", power_w=3500, duration_steps=16, earliest_start_step=24, latest_end_step=84, daily_quota_steps=16),
         # Others (catch-all flexible)
         Appliance(id="others", name="Others (misc loads)", category="flexible", power_w=500, duration_steps=4, earliest_start_step=20, latest_end_step=92),
-    ]
+    )
+
+@st.cache_resource(show_spinner=False)
+def _catalog_by_name() -> dict[str, Appliance]:
+    """Catalog lookup by display name (read-only; shared across reruns)."""
+    return {a.name: a for a in appliance_catalog()}
 
 def category_badge(cat: str) -> str:
     c = (cat or "").lower()
@@ -182,7 +193,9 @@ def _utc_to_local_display(ts: pd.Series | pd.DatetimeIndex, offset_seconds: int)
 
 def plot_power_and_energy(ts: pd.DatetimeIndex, pv_kw: np.ndarray, dt_minutes: int, xaxis_label: str = "Time (Local)") -> go.Figure:
     dt_hours = dt_minutes / 60.0
-    cum_kwh = np.cumsum(pv_kw) * dt_hours
+    # Cumulative energy in one buffer: cumsum into it, then scale in place
+    cum_kwh = np.cumsum(pv_kw, dtype=float)
+    cum_kwh *= dt_hours
 
     fig = make_subplots(specs=[[{"secondary_y": True}]])
     fig.add_trace(
@@ -371,13 +384,13 @@ st.session_state["selected_appliances"] = selected_names
 st.session_state["qty_map"] = qty_map
 
 def _build_appliances(selected_names: list, qty_map: dict) -> list:
-    name_to_obj = {a.name: a for a in catalog}
-    out = []
+    name_to_obj = _catalog_by_name()
+    rows = []
     for n in selected_names:
         base = name_to_obj[n]
         q = int(qty_map.get(base.id, 1))
-        out.append(Appliance(**{**base.model_dump(), "power_w": float(base.power_w) * q}))
-    return out
+        rows.append({**base.model_dump(), "power_w": float(base.power_w) * q})
+    return APPLIANCES_ADAPTER.validate_python(rows)
 
 # Nominal planned energy: single source of truth (Critical 24h, Flexible 4h, Deferrable 2h per day)
 st.markdown("#### Estimated consumption (next day)")
@@ -407,6 +420,39 @@ if st.session_state.get("auto_enabled", False) and not run_btn:
         run_btn = True
 
 # ---------------------------- Build config + run simulation ----------------------------
+# Identical inputs within one 15-minute planning slot reuse the previous run instead of
+# repeating the PV fetch and controller rollout; the slot is part of the key, so the
+# auto-run tick always plans from a fresh start time. Each input set (keys hashed, never
+# embedded) logs to one directory that later slots overwrite, so autorefresh does not
+# leave a new run directory behind every 15 minutes.
+@st.cache_data(ttl=AUTO_REFRESH_MS / 1000, show_spinner=False)
+def _run_simulation(
+    cfg_json: str,
+    appliances_json: str,
+    controller_name: str,
+    days: int,
+    api_key: str,
+    openai_key: str,
+    openai_model: str,
+    plan_slot: str,
+) -> dict:
+    cfg = SystemConfig.model_validate_json(cfg_json)
+    appliances = APPLIANCES_ADAPTER.validate_json(appliances_json)
+    controller = {c.name: c for c in get_controllers()}[controller_name]
+    run_inputs = (cfg_json, appliances_json, controller_name, str(days), api_key, openai_key, openai_model)
+    run_key = hashlib.blake2b("\0".join(run_inputs).encode("utf-8"), digest_size=8).hexdigest()
+    return simulate(
+        cfg=cfg,
+        appliances=appliances,
+        controller=controller,
+        days=days,
+        openweather_api_key=api_key,
+        openai_api_key=openai_key,
+        openai_model=openai_model,
+        out_dir=Path("logs") / f"run_{controller_name}" / run_key,
+        reference_utc=datetime.fromisoformat(plan_slot),
+    )
+
 if run_btn:
     cfg = SystemConfig(
         location_name=st.session_state.get("location_name", ""),
@@ -425,24 +471,55 @@ if run_btn:
     openai_key = st.secrets.get("openai_api_key", "")
     openai_model = st.secrets.get("openai_model", "gpt-4o-mini")
 
-    _name_to_controller = {c.name: c for c in get_controllers()}
-    controller = _name_to_controller[st.session_state.get("controller_name", "forecast_heuristic")]
+    # Planning start floored to the current 15-minute slot (the autorefresh interval)
+    now_utc = datetime.now(timezone.utc)
+    plan_slot = now_utc.replace(minute=now_utc.minute - now_utc.minute % 15, second=0, microsecond=0)
 
     with st.spinner("Building your plan…"):
-        result = simulate(
-            cfg=cfg,
-            appliances=appliances,
-            controller=controller,
-            days=int(st.session_state.get("sim_days", 2)),
-            openweather_api_key=api_key,
-            openai_api_key=openai_key,
-            openai_model=openai_model,
+        result = _run_simulation(
+            cfg.model_dump_json(),
+            APPLIANCES_ADAPTER.dump_json(appliances).decode("utf-8"),
+            st.session_state.get("controller_name", "forecast_heuristic"),
+            int(st.session_state.get("sim_days", 2)),
+            api_key,
+            openai_key,
+            openai_model,
+            plan_slot.isoformat(),
         )
 
     st.session_state["last_run"] = result
     st.session_state["last_run_time"] = datetime.now(timezone.utc)
 
 # ---------------------------- Load result ----------------------------
+# State-log columns read by the results panels (replay, KPIs, forecast, schedule, matching)
+STATE_COLS = (
+    "timestamp",
+    "pv_now_kw",
+    "soc_now",
+    "load_requested_kw",
+    "load_served_kw",
+    "crit_requested_kw",
+    "crit_served_kw",
+    "kpi_CLSR",
+    "kpi_Blackout_minutes",
+    "kpi_Battery_throughput_kwh",
+)
+
+# Logs only change when a new run writes them, so parsed frames are cached on (path, mtime);
+# reruns (replay slider, toggles, autorefresh) then skip re-reading the files.
+@st.cache_data(show_spinner=False)
+def _load_state(path: str, mtime: float) -> pd.DataFrame:
+    df = read_state_log(path, columns=STATE_COLS)
+    df["ts"] = pd.to_datetime(df["timestamp"])
+    return df
+
+@st.cache_data(show_spinner=False)
+def _load_guidance(path: str, mtime: float) -> pd.DataFrame:
+    gdf = pd.read_json(path, lines=True)
+    if "timestamp" in gdf.columns:
+        gdf["ts"] = pd.to_datetime(gdf["timestamp"], utc=True)
+    return gdf
+
 res = st.session_state.get("last_run")
 if not res:
     st.info("Run your plan to see results. Use **Try a quick demo (2 days)** in the sidebar for a one-click preview.")
@@ -450,8 +527,7 @@ if not res:
 
 state_csv = res["state_csv"]
 guidance_jsonl = res["guidance_jsonl"]
-df = pd.read_csv(state_csv)
-df["ts"] = pd.to_datetime(df["timestamp"])
+df = _load_state(state_csv, os.path.getmtime(state_csv))
 t0 = pd.to_datetime(res.get("start_time", df["timestamp"].iloc[0] if len(df) else None))
 
 # Replay control (hidden slider for step selection)
@@ -623,9 +699,7 @@ with rec_kpi_cols[2]:
                 f'<div class="kpi">{float(row.get("kpi_Battery_throughput_kwh", 0)):.2f} kWh</div>'
                 '<div class="muted">Charge/discharge so far (wear proxy)</div></div>', unsafe_allow_html=True)
 
-gdf = pd.read_json(guidance_jsonl, lines=True)
-if "timestamp" in gdf.columns:
-    gdf["ts"] = pd.to_datetime(gdf["timestamp"], utc=True)
+gdf = _load_guidance(guidance_jsonl, os.path.getmtime(guidance_jsonl))
 grow = gdf.iloc[min(step, len(gdf) - 1)]
 
 headline = str(grow.get("headline", ""))
@@ -672,7 +746,7 @@ st.plotly_chart(fig2, width="stretch")
 st.markdown("### Appliance advice for tomorrow")
 st.caption("Day-ahead outlook: load vs solar. This is advice only; you stay in control.")
 selected_appliances = st.session_state.get("selected_appliances", [])
-catalog = {a.name: a for a in appliance_catalog()}
+catalog = _catalog_by_name()
 has_flexible_or_deferrable = any(
     catalog.get(n) and catalog[n].category in ("flexible", "deferrable")
     for n in selected_appliances
@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from offgrid_dt.matching._kernel import matching_kernel
+from offgrid_dt.io.schema import Appliance
+from offgrid_dt.matching.day_ahead import _ApplianceBatch, _first_fit_window_index, _windows_from_runs
+
+
+def _runs(flags):
+    """Reference (start, end) step runs of a boolean array, ends inclusive."""
+    edges = np.diff(np.concatenate(([0], np.asarray(flags, dtype=np.int8), [0])))
+    return list(zip(np.flatnonzero(edges == 1).tolist(), (np.flatnonzero(edges == -1) - 1).tolist()))
+
+
+def test_windows_from_runs():
+    t0 = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    ts = [t0 + timedelta(minutes=15 * i) for i in range(8)]
+
+    windows = _windows_from_runs(np.array([0, 4, 6]), np.array([1, 4, 7]), ts, "surplus")
+    assert [(w.start_step, w.end_step) for w in windows] == [(0, 1), (4, 4), (6, 7)]
+    assert windows[0].start_ts == ts[0] and windows[-1].end_ts == ts[-1]
+    assert all(type(w.start_step) is int and w.label == "surplus" for w in windows)
+    assert _windows_from_runs(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), ts) == []
+
+
+def test_matching_kernel_matches_numpy_masks():
+    rng = np.random.default_rng(11)
+    pv = rng.uniform(0.0, 2.0, 96) * (rng.random(96) < 0.7)
+    load = rng.uniform(0.0, 1.5, 96)
+    crit = rng.uniform(0.0, 0.4, 96) * (rng.random(96) < 0.5)
+
+    sur_s, sur_e, def_s, def_e, crit_short, def_steps, min_margin = matching_kernel(pv, load, crit)
+    assert list(zip(sur_s.tolist(), sur_e.tolist())) == _runs(pv >= load)
+    assert list(zip(def_s.tolist(), def_e.tolist())) == _runs(load > pv)
+    assert crit_short.tolist() == np.flatnonzero((crit > 0) & (pv < crit)).tolist()
+    assert def_steps.tolist() == np.flatnonzero(load > pv).tolist()
+    assert min_margin == (pv - load).min()
+
+
+def test_appliance_batch_first_fit():
+    apps = [
+        Appliance(id="fridge", name="Fridge", category="critical", power_w=150),
+        Appliance(id="wash", name="Washing", category="flexible", power_w=600, duration_steps=4),
+        Appliance(id="ev", name="EV", category="deferrable", power_w=3500, duration_steps=16),
+    ]
+    batch = _ApplianceBatch.from_models(apps)
+    assert batch.power_w.tolist() == [150.0, 600.0, 3500.0]
+
+    lengths = np.array([2, 6, 4])
+    assert _first_fit_window_index(lengths, batch.duration_steps).tolist() == [0, 1, -1]
+    assert _first_fit_window_index(np.zeros(0, dtype=np.int64), batch.duration_steps).tolist() == [-1, -1, -1]
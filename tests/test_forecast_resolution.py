@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from offgrid_dt.forecast.openweather import synthetic_irradiance_forecast
+from offgrid_dt.forecast.openweather import synthetic_irradiance_array, synthetic_irradiance_forecast
 
 
 def test_synthetic_irradiance_matches_step_resolution():
@@ -8,4 +8,12 @@ def test_synthetic_irradiance_matches_step_resolution():
     pts = synthetic_irradiance_forecast(start=start, hours=48, step_minutes=15)
     assert len(pts) == 48 * 4
     # monotonic timestamps
-    assert pts[1].ts > pts[0].ts
\ No newline at end of file
+    assert pts[1].ts > pts[0].ts
+
+
+def test_synthetic_irradiance_array_matches_point_list():
+    start = datetime(2026, 2, 1, 5, 30, tzinfo=timezone.utc)
+    pts = synthetic_irradiance_forecast(start=start, hours=24, step_minutes=15)
+    series = synthetic_irradiance_array(start=start, hours=24, step_minutes=15)
+    assert series.ghi_wm2.tolist() == [p.ghi_wm2 for p in pts]
+    assert [p.ts for p in series.to_points()] == [p.ts for p in pts]
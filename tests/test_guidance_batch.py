@@ -0,0 +1,54 @@
+import numpy as np
+
+from offgrid_dt.io.schema import SystemConfig
+from offgrid_dt.xai.explain import (
+    GUIDANCE_HEADLINES,
+    RISK_LEVELS,
+    ExplanationContext,
+    generate_guidance,
+    generate_guidance_batch,
+)
+
+
+def test_guidance_batch_matches_scalar_policy():
+    cfg = SystemConfig(pv_capacity_kw=4.0, battery_capacity_kwh=7.5, inverter_max_kw=3.0, soc_min=0.2)
+    rng = np.random.default_rng(3)
+    n = 400
+    soc = rng.uniform(0.15, 0.6, n)
+    soc[:3] = [0.25, 0.32, 0.2]  # exactly on the thresholds
+    pv_now = rng.uniform(0.0, 3.0, n)
+    pv_avg = rng.uniform(0.0, 2.0, n)
+    crit = rng.uniform(0.0, 1.0, n)
+    deferred = rng.integers(0, 3, n)
+
+    headline_idx, risk_idx, flags = generate_guidance_batch(cfg, soc, pv_now, pv_avg, crit, deferred)
+    for i in range(n):
+        g = generate_guidance(
+            cfg, ExplanationContext(soc[i], pv_now[i], pv_avg[i], crit[i]), used_kw=0.0, deferred_count=int(deferred[i])
+        )
+        assert GUIDANCE_HEADLINES[headline_idx[i]] == g.headline
+        assert RISK_LEVELS[risk_idx[i]] == g.risk_level
+        assert bin(int(flags[i])).count("1") == len(g.reason_codes)
+
+
+def test_rewrite_disk_cache_expires_and_is_bounded(monkeypatch, tmp_path):
+    import os
+    import time
+
+    from offgrid_dt.xai import explain
+
+    monkeypatch.setenv("OFFGRID_DT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(explain, "_REWRITE_CACHE_MAX_FILES", 3)
+    paths = [explain._rewrite_cache_path("m", f"prompt {i}") for i in range(5)]
+    for i, p in enumerate(paths[:3]):
+        explain._write_rewrite_cache(p, f"text {i}")
+        os.utime(p, (time.time() - 100 + i, time.time() - 100 + i))
+
+    assert explain._read_rewrite_cache(paths[0]) == "text 0"  # hit makes it most recent
+    explain._write_rewrite_cache(paths[3], "text 3")
+    assert not paths[1].exists()
+    assert [p.exists() for p in (paths[0], paths[2], paths[3])] == [True, True, True]
+
+    old = time.time() - (explain._REWRITE_CACHE_MAX_AGE_DAYS + 1) * 86400
+    os.utime(paths[2], (old, old))
+    assert explain._read_rewrite_cache(paths[2]) is None
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from offgrid_dt.metrics.kpis import KPITracker
+
+
+def test_from_arrays_matches_per_step_updates():
+    rng = np.random.default_rng(3)
+    n = 96 * 3
+    crit_req = rng.uniform(0.0, 0.5, n)
+    crit_served = np.where(rng.random(n) < 0.2, crit_req * 0.5, crit_req)
+    total_req = crit_req + rng.uniform(0.0, 2.0, n)
+    served = crit_served + rng.uniform(0.0, 1.0, n)
+    pv = rng.uniform(0.0, 4.0, n)
+    curtailed = pv * rng.uniform(0.0, 0.3, n)
+
+    kpis = KPITracker(0.25)
+    for i in range(n):
+        kpis.update(
+            crit_req_kw=crit_req[i],
+            crit_served_kw=crit_served[i],
+            total_req_kw=total_req[i],
+            served_kw=served[i],
+            pv_now_kw=pv[i],
+            curtailed_kw=curtailed[i],
+            throughput_kwh=12.5,
+        )
+    batch = KPITracker.from_arrays(0.25, crit_req, crit_served, total_req, served, pv, curtailed, 12.5)
+
+    assert batch.blackout_minutes == kpis.blackout_minutes > 0
+    assert batch.snapshot() == pytest.approx(kpis.snapshot(), rel=1e-12)
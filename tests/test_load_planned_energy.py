@@ -41,3 +41,9 @@ def test_compute_planned_daily_energy_kwh_deferrable_quota():
     E = compute_planned_daily_energy_kwh(appliances, day_steps, dt_h)
     # 3 kW * 16 steps * 0.25 h = 12 kWh
     assert abs(E - 12.0) < 0.01
+
+
+def test_appliance_power_kw_follows_model_copy():
+    wash = Appliance(id="wash", name="Washing", category="flexible", power_w=600)
+    assert wash.power_kw == 0.6
+    assert wash.model_copy(update={"power_w": 1000}).power_kw == 1.0
@@ -0,0 +1,139 @@
+import json
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from offgrid_dt.io.logger import RunLogger, read_state_log
+from offgrid_dt.io.schema import ControlDecision, Guidance, StepRecord, StepRecordInternal
+
+
+def _record(i: int) -> StepRecord:
+    return StepRecord(
+        timestamp=datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=15 * i),
+        step_index=i,
+        pv_now_kw=0.5 * i,
+        soc_now=0.6,
+        soc_min=0.25,
+        soc_max=0.95,
+        load_requested_kw=1.0,
+        load_served_kw=0.9,
+        crit_requested_kw=0.3,
+        crit_served_kw=0.3,
+        curtailed_solar_kw=0.0,
+        decision=ControlDecision(charge_kw=0.1, served_task_ids=["a", "b"]),
+        guidance=Guidance(headline="h", explanation="e", risk_level="low", reason_codes=["R1"]),
+        kpis_running={"CLSR": 1.0, "Blackout_minutes": 0.0},
+    )
+
+
+def test_logger_grows_past_capacity_and_keeps_columns():
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = RunLogger(out_dir=Path(tmp), n_rows=2)
+        for i in range(5):
+            logger.append(_record(i))
+        out = logger.flush(prefix="t")
+
+        df = pd.read_csv(out["state_csv"], keep_default_na=False)
+        assert list(df.columns[:3]) == ["timestamp", "step_index", "pv_now_kw"]
+        assert list(df["step_index"]) == [0, 1, 2, 3, 4]
+        assert df["pv_now_kw"].iloc[4] == 2.0
+        assert df["served_task_ids"].iloc[0] == "a;b"
+        assert df["deferred_task_ids"].iloc[0] == ""
+        assert df["kpi_CLSR"].iloc[-1] == 1.0
+
+        lines = Path(out["guidance_jsonl"]).read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[0])["timestamp"] == "2024-01-01T00:00:00+00:00"
+
+
+def test_state_log_parquet_sibling_matches_csv():
+    pytest.importorskip("pyarrow")
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = RunLogger(out_dir=Path(tmp), n_rows=3)
+        for i in range(3):
+            logger.append(_record(i))
+        out = logger.flush(prefix="t")
+
+        assert Path(out["state_parquet"]).exists()
+        pq_df = read_state_log(out["state_csv"])
+        cols = ["timestamp", "pv_now_kw", "deferred_task_ids"]
+        pq_cols = read_state_log(out["state_csv"], columns=cols)
+        Path(out["state_parquet"]).unlink()
+        csv_df = read_state_log(out["state_csv"])
+        pd.testing.assert_frame_equal(pq_df, csv_df)
+        pd.testing.assert_frame_equal(pq_cols, read_state_log(out["state_csv"], columns=cols))
+        assert list(csv_df["deferred_task_ids"]) == ["", "", ""]
+
+
+def test_internal_record_logs_like_pydantic_record():
+    with tempfile.TemporaryDirectory() as tmp:
+        a = RunLogger(out_dir=Path(tmp) / "a", n_rows=3)
+        b = RunLogger(out_dir=Path(tmp) / "b", n_rows=3)
+        for i in range(3):
+            rec = _record(i)
+            a.append(rec)
+            b.append(StepRecordInternal(**{k: getattr(rec, k) for k in StepRecord.model_fields}))
+        out_a, out_b = a.flush(prefix="t"), b.flush(prefix="t")
+        assert Path(out_a["state_csv"]).read_bytes() == Path(out_b["state_csv"]).read_bytes()
+        assert Path(out_a["guidance_jsonl"]).read_bytes() == Path(out_b["guidance_jsonl"]).read_bytes()
+
+
+def test_streaming_logger_writes_same_files_as_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        batch = RunLogger(out_dir=Path(tmp) / "batch", n_rows=2)
+        stream = RunLogger(out_dir=Path(tmp) / "stream", prefix="t", streaming=True, flush_every=2)
+        for i in range(5):
+            batch.append(_record(i))
+            stream.append(_record(i))
+        assert len(stream) == 5
+        out_b, out_s = batch.flush(prefix="t"), stream.flush()
+        assert Path(out_b["state_csv"]).read_bytes() == Path(out_s["state_csv"]).read_bytes()
+        assert Path(out_b["guidance_jsonl"]).read_bytes() == Path(out_s["guidance_jsonl"]).read_bytes()
+
+
+def test_streaming_logger_rejects_other_prefix_and_closes_on_error():
+    with tempfile.TemporaryDirectory() as tmp:
+        stream = RunLogger(out_dir=Path(tmp), prefix="t", streaming=True)
+        stream.append(_record(0))
+        with pytest.raises(ValueError):
+            stream.flush(prefix="other")
+        assert stream.flush(prefix="t")["state_csv"].endswith("t_state.csv")
+
+        with pytest.raises(RuntimeError):
+            with RunLogger(out_dir=Path(tmp), prefix="u", streaming=True) as failing:
+                failing.append(_record(0))
+                raise RuntimeError("run failed")
+        assert failing._state_f.closed and failing._guidance_f.closed
+
+
+def test_read_state_log_selected_columns():
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = RunLogger(out_dir=Path(tmp), n_rows=3)
+        for i in range(3):
+            logger.append(_record(i))
+        out = logger.flush(prefix="t")
+        full = pd.read_csv(out["state_csv"])
+        cols = ("timestamp", "pv_now_kw", "kpi_CLSR", "kpi_missing")
+
+        # Parquet sibling (when written), then the CSV itself
+        for _ in range(2):
+            df = read_state_log(out["state_csv"], columns=cols)
+            assert list(df.columns) == ["timestamp", "pv_now_kw", "kpi_CLSR"]
+            assert list(df["pv_now_kw"]) == list(full["pv_now_kw"])
+            assert pd.to_datetime(df["timestamp"]).tolist() == pd.to_datetime(full["timestamp"]).tolist()
+            Path(out["state_csv"]).with_suffix(".parquet").unlink(missing_ok=True)
+
+
+def test_guidance_line_same_bytes_without_orjson(monkeypatch):
+    from offgrid_dt.io import logger
+
+    g = Guidance(
+        headline="Run the washer ☀", explanation="e", risk_level="low",
+        reason_codes=["R1", "R2"], dominant_factors={"pv": 0.1, "soc": 2.0},
+    )
+    fast = logger._guidance_line("2024-01-01T00:00:00+00:00", g)
+    monkeypatch.setattr(logger, "orjson", None)
+    assert logger._guidance_line("2024-01-01T00:00:00+00:00", g) == fast
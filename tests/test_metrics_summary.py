@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from offgrid_dt.validation._kernels import daily_reduce
+from offgrid_dt.validation.metrics_summary import compute_daily_metrics_from_state_csv
+
+
+def test_daily_metrics_from_state_csv(tmp_path):
+    ts = pd.date_range("2026-02-01 23:30", periods=4, freq="15min", tz="UTC")
+    df = pd.DataFrame(
+        {
+            "timestamp": [t.isoformat() for t in ts],
+            "pv_now_kw": [0.0, 2.0, 1.0, 0.0],
+            "load_requested_kw": [1.0, 1.0, 2.0, 2.0],
+            "load_served_kw": [1.0, 1.0, 1.0, 0.5],
+            "crit_requested_kw": [0.4, 0.4, 0.4, 0.4],
+            "crit_served_kw": [0.4, 0.2, 0.4, 0.4],
+        }
+    )
+    path = tmp_path / "run_state.csv"
+    df.to_csv(path, index=False)
+
+    out = compute_daily_metrics_from_state_csv(path)
+    assert out["date"].tolist() == ["2026-02-01", "2026-02-02"]
+    # Day 1: one step of 0.2 kW critical shortfall, PV 2 kW of which 1 kW serves load
+    assert out["clsr"].tolist() == pytest.approx([0.75, 1.0])
+    assert out["cid_minutes"].tolist() == [15.0, 0.0]
+    assert out["ssr"].tolist() == pytest.approx([1.0, 0.25])
+    assert out["solar_utilisation"].tolist() == pytest.approx([0.5, 1.0])
+    assert out["battery_throughput_kwh"].isna().all()
+
+
+def test_daily_reduce_matches_grouped_sums():
+    rng = np.random.default_rng(5)
+    n = 500
+    day_id = np.sort(rng.integers(0, 4, n))
+    cols = [rng.normal(0.5, 1.0, n) for _ in range(5)]
+    cols[3][::9] = np.nan  # pv
+    cols[4][::13] = np.nan  # load served
+    crit_req, crit_srv, load_req, load_srv, pv = cols
+
+    out = daily_reduce(day_id, 4, crit_req, crit_srv, load_req, load_srv, pv)
+    g = pd.Series(day_id)
+    expected = [
+        pd.Series(np.clip(x, 0.0, None)).groupby(g).sum().to_numpy()
+        for x in (crit_req, crit_srv, load_req, pv, np.fmin(pv, load_srv))
+    ]
+    for got, exp in zip(out[:5], expected):
+        assert got == pytest.approx(exp, rel=1e-12)
+    assert out[5].tolist() == pd.Series((crit_srv + 1e-9) < crit_req).groupby(g).sum().tolist()
+
+
+def test_daily_metrics_chunked_matches_single_read(tmp_path):
+    rng = np.random.default_rng(9)
+    n = 1000
+    ts = pd.date_range("2026-03-01 07:00", periods=n, freq="15min", tz="UTC")
+    df = pd.DataFrame(
+        {
+            "timestamp": [t.isoformat() for t in ts],
+            "pv_now_kw": rng.uniform(0.0, 3.0, n),
+            "load_requested_kw": rng.uniform(0.0, 2.0, n),
+            "load_served_kw": rng.uniform(0.0, 2.0, n),
+            "crit_requested_kw": np.full(n, 0.4),
+            "crit_served_kw": rng.choice([0.4, 0.2], n),
+            "throughput_kwh": np.cumsum(rng.uniform(0.0, 0.1, n)),
+        }
+    )
+    path = tmp_path / "run_state.csv"
+    # Rows out of order, so days straddle chunk boundaries
+    df.sample(frac=1.0, random_state=1).to_csv(path, index=False)
+
+    whole = compute_daily_metrics_from_state_csv(path, chunksize=0)
+    chunked = compute_daily_metrics_from_state_csv(path, chunksize=97)
+    pd.testing.assert_frame_equal(whole, chunked, rtol=1e-12)
+    assert chunked["battery_throughput_kwh"].tolist() == df.groupby(ts.normalize())["throughput_kwh"].last().tolist()
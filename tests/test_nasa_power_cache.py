@@ -0,0 +1,64 @@
+"""NASA POWER responses for past windows are served from the disk cache (no network)."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from offgrid_dt.forecast import nasa_power
+
+BODY = b"-BEGIN HEADER-\n-END HEADER-\nYEAR,MO,DY,HR,ALLSKY_SFC_SW_DWN\n2020,6,1,12,700.0\n"
+
+
+class _Resp:
+    content = BODY
+    headers = {"Content-Length": str(len(BODY))}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def _clear_memo():
+    nasa_power._SERIES_MEMO.clear()
+    yield
+    nasa_power._SERIES_MEMO.clear()
+
+
+def test_past_window_is_fetched_once(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_get(url, params=None, timeout=None, **kwargs):
+        calls.append(params)
+        return _Resp()
+
+    monkeypatch.setenv("OFFGRID_DT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(nasa_power.SESSION, "get", fake_get)
+
+    day = datetime(2020, 6, 1, tzinfo=timezone.utc)
+    for _ in range(2):
+        pts = nasa_power.fetch_ghi_hourly(51.5, -0.1, day)
+        assert [p.ghi_wm2 for p in pts] == [700.0]
+        nasa_power._SERIES_MEMO.clear()  # second fetch must come from disk, not the memo
+    assert len(calls) == 1
+    assert len(list((tmp_path / "nasa_power").glob("*.csv"))) == 1
+
+
+def test_recent_window_is_not_cached(monkeypatch, tmp_path):
+    monkeypatch.setenv("OFFGRID_DT_CACHE_DIR", str(tmp_path))
+    today = datetime.now(tz=timezone.utc).strftime("%Y%m%d")
+    assert nasa_power._cache_path({"start": today, "end": today}) is None
+
+
+def test_recent_window_is_refetched(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_get(url, params=None, timeout=None, **kwargs):
+        calls.append(params)
+        return _Resp()
+
+    monkeypatch.setenv("OFFGRID_DT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(nasa_power.SESSION, "get", fake_get)
+
+    yesterday = datetime.now(tz=timezone.utc) - timedelta(days=1)
+    for _ in range(2):
+        nasa_power.fetch_ghi_hourly(51.5, -0.1, yesterday)
+    assert len(calls) == 2
@@ -17,3 +17,45 @@ def test_parse_nasa_power_ghi():
     assert pts[1].ghi_wm2 == 186.1
     assert pts[0].ts.year == 2025 and pts[0].ts.month == 2 and pts[0].ts.day == 2 and pts[0].ts.hour == 8
     assert pts[1].ts.hour == 9
+
+
+def test_parse_nasa_power_ghi_fill_values():
+    data = {"properties": {"parameter": {"ALLSKY_SFC_SW_DWN": {"2025020209": 186.1, "2025020208": -999.0}}}}
+    clamped = _parse_nasa_power_ghi(data)
+    assert [(p.ts.hour, p.ghi_wm2) for p in clamped] == [(8, 0.0), (9, 186.1)]
+    dropped = _parse_nasa_power_ghi(data, drop_negative=True)
+    assert [(p.ts.hour, p.ghi_wm2) for p in dropped] == [(9, 186.1)]
+
+
+def test_parse_nasa_power_csv():
+    from offgrid_dt.forecast.nasa_power import _parse_csv_series
+
+    body = (
+        b"-BEGIN HEADER-\n"
+        b"NASA/POWER Hourly Data\n"
+        b"-END HEADER-\n"
+        b"YEAR,MO,DY,HR,ALLSKY_SFC_SW_DWN\n"
+        b"2025,2,2,8,65.78\n"
+        b"2025,2,2,9,186.1\n"
+        b"2025,2,2,10,-999.0\n"
+    )
+    series = _parse_csv_series(body)
+    pts = series.to_points()
+    assert [(p.ts.hour, p.ghi_wm2) for p in pts] == [(8, 65.78), (9, 186.1), (10, -999.0)]
+    assert pts[0].ts.day == 2
+
+
+def test_hourly_profiles_bucket_by_hour():
+    from datetime import datetime, timezone
+
+    from offgrid_dt.forecast.nasa_power import build_hourly_ghi_profile, build_hourly_profile_mean
+    from offgrid_dt.forecast.openweather import IrradiancePoint
+
+    pts = [
+        IrradiancePoint(ts=datetime(2025, 2, d, 12, tzinfo=timezone.utc), ghi_wm2=v)
+        for d, v in ((1, 100.0), (2, 300.0), (3, 200.0))
+    ]
+    mean_24, min_24, max_24 = build_hourly_ghi_profile(pts)
+    assert mean_24[12] == 200.0 and min_24[12] == 100.0 and max_24[12] == 300.0
+    assert mean_24[11] == min_24[11] == max_24[11] == 0.0
+    assert build_hourly_profile_mean(pts) == mean_24
@@ -0,0 +1,90 @@
+"""OpenWeather irradiance endpoint probing (no network)."""
+import asyncio
+import json
+
+import pytest
+
+from offgrid_dt.forecast import openweather
+from offgrid_dt.forecast.openweather import AsyncOpenWeatherSolarClient, OpenWeatherSolarClient
+
+
+@pytest.fixture(autouse=True)
+def _clear_ttl_cache():
+    openweather._TTL_CACHE.clear()
+    yield
+    openweather._TTL_CACHE.clear()
+
+
+class _Resp:
+    def __init__(self, status_code, data=None):
+        self.status_code = status_code
+        self.content = json.dumps(data).encode()
+
+
+class _Session:
+    def __init__(self, by_suffix):
+        self.by_suffix = by_suffix
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        for suffix, resp in self.by_suffix.items():
+            if url.endswith(suffix):
+                if isinstance(resp, Exception):
+                    raise resp
+                return resp
+        return _Resp(404)
+
+
+def test_probe_prefers_first_endpoint_with_data():
+    session = _Session(
+        {
+            "/data/2.5/solar/forecast": _Resp(404),
+            "/data/2.5/solar": _Resp(200, {"list": [{"dt": 1700000000, "ghi": 300}]}),
+            "/energy/1.0/solar/forecast": _Resp(200, {"list": [{"dt": 1700000000, "ghi": 999}]}),
+        }
+    )
+    pts = OpenWeatherSolarClient("k", session=session).fetch_irradiance_forecast(0.0, 0.0)
+    assert [p.ghi_wm2 for p in pts] == [300.0]
+
+
+def test_probe_raises_when_no_endpoint_has_data():
+    session = _Session({"/data/2.5/solar": ValueError("boom")})
+    with pytest.raises(RuntimeError):
+        OpenWeatherSolarClient("k", session=session).fetch_irradiance_forecast(0.0, 0.0)
+
+
+def test_irradiance_forecast_is_ttl_cached_for_nearby_coordinates():
+    session = _Session({"/data/2.5/solar/forecast": _Resp(200, {"list": [{"dt": 1700000000, "ghi": 300}]})})
+    client = OpenWeatherSolarClient("k", session=session)
+    first = client.fetch_irradiance_forecast(51.5, -0.12)
+    calls = session.calls
+    second = client.fetch_irradiance_forecast(51.50001, -0.12)
+    assert session.calls == calls
+    assert second == first and second is not first
+
+
+class _AsyncSession(_Session):
+    async def get(self, url, params=None, timeout=None):
+        return _Session.get(self, url, params=params, timeout=timeout)
+
+    async def aclose(self):
+        pass
+
+
+def test_async_probe_prefers_first_endpoint_with_data():
+    session = _AsyncSession(
+        {
+            "/data/2.5/solar/forecast": RuntimeError("down"),
+            "/data/2.5/solar": _Resp(200, {"list": [{"dt": 1700000000, "ghi": 300}]}),
+            "/energy/1.0/solar/forecast": _Resp(200, {"list": [{"dt": 1700000000, "ghi": 999}]}),
+        }
+    )
+
+    async def run():
+        async with AsyncOpenWeatherSolarClient("k", client=session) as client:
+            return await client.fetch_irradiance_forecast(0.0, 0.0)
+
+    pts = asyncio.run(run())
+    assert [p.ghi_wm2 for p in pts] == [300.0]
+    assert session.calls == 3
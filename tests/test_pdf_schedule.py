@@ -0,0 +1,16 @@
+import pandas as pd
+
+from offgrid_dt.io.pdf_report import schedule_from_state_csv
+
+
+def test_schedule_merges_consecutive_served_steps_per_appliance():
+    ts = pd.date_range("2024-01-01", periods=6, freq="15min", tz="UTC")
+    served = ["pump_0", "pump_0;tv_1", "tv_1", "", "pump_2", "pump_2"]
+    df = pd.DataFrame({"timestamp": ts.astype(str), "served_task_ids": served})
+
+    rows = schedule_from_state_csv(df, appliance_id_to_name={"tv": "TV"})
+    assert rows == [
+        {"time_window": "00:00–00:30", "appliance": "pump", "advisory": "Run"},
+        {"time_window": "00:15–00:45", "appliance": "TV", "advisory": "Run"},
+        {"time_window": "01:00–01:30", "appliance": "pump", "advisory": "Run"},
+    ]